@@ -5,6 +5,8 @@ This provides a more traditional web interface that can be hosted as a regular w
 import os
 import sys
 import subprocess
+import json
+import time
 import traceback
 from datetime import datetime, timedelta
 import pandas as pd
@@ -65,7 +67,7 @@ def install_requirements():
 # Run the installation function
 install_requirements()
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, g, Response, stream_with_context
 
 # Import from the new structure
 from core.adapters.notion_adapter import NotionAdapter
@@ -79,12 +81,16 @@ from core import (
     fetch_notion_tasks, 
     identify_stale_tasks, 
     list_all_categories, 
-    fetch_peer_feedback
+    fetch_peer_feedback,
+    get_task_changes
 )
 
 # These will be imported from new modules eventually
 from core.task_extractor import extract_tasks_from_update
 from core.task_processor import insert_or_update_task
+from core.pipeline import process_update as run_update_pipeline, stream_update
+from core.tracing import begin_trace, end_trace, current_trace
+from core.metrics import render_metrics, HTTP_REQUEST_SECONDS, HTTP_REQUESTS_TOTAL, HTTP_REQUESTS_IN_FLIGHT
 
 # We'll use these for AI insights
 from core.openai_client import (
@@ -103,6 +109,43 @@ app = Flask(__name__,
             static_folder="static",
             template_folder="templates")
 
+@app.before_request
+def start_request_trace():
+    """Trace every request so the time spent in each stage can be reported."""
+    g.request_start = time.perf_counter()
+    HTTP_REQUESTS_IN_FLIGHT.inc()
+    g.trace_token = begin_trace(f"{request.method} {request.path}")
+
+@app.after_request
+def add_request_timings(response):
+    """Finish the request trace, attach its timings as headers and record request metrics."""
+    token = g.pop('trace_token', None)
+    if token is not None:
+        trace = end_trace(token)
+        response.headers['Server-Timing'] = trace.server_timing()
+        response.headers['X-Trace-Id'] = trace.id
+    
+    # Label by route pattern, not path, so IDs in URLs don't create new series
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    if 'request_start' in g:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.request_start, method=request.method, route=route)
+    HTTP_REQUESTS_TOTAL.inc(method=request.method, route=route, status=response.status_code)
+    return response
+
+@app.teardown_request
+def finish_request_trace(error=None):
+    """Finish the trace of a request that failed before after_request ran."""
+    token = g.pop('trace_token', None)
+    if token is not None:
+        end_trace(token)
+    if g.pop('request_start', None) is not None:
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+
+@app.route('/metrics')
+def metrics():
+    """Serve process metrics in the Prometheus text format."""
+    return Response(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/')
 def index():
     """Render main page."""
@@ -145,7 +188,7 @@ def api_dashboard_data():
         completion_rate = round((completed_tasks / total_tasks * 100), 1) if total_tasks > 0 else 0
         
         # Calculate tasks by category
-        category_counts = filtered_df['category'].value_counts().to_dict()
+        category_counts = filtered_df['category'].value_counts().loc[lambda counts: counts > 0].to_dict()
         
         # Calculate task trend (completed tasks over time)
         # Make sure to handle date conversion properly
@@ -264,10 +307,12 @@ def process_update():
     """Process task update from form submission."""
     try:
         # Try to get data from different possible sources
+        stream = request.args.get('stream') == '1'
         if request.is_json:
             # If the request has JSON data
             data = request.get_json()
             update_text = data.get('update_text', '')
+            stream = stream or bool(data.get('stream'))
         elif request.form:
             # If the request has form data
             update_text = request.form.get('update_text', '')
@@ -283,92 +328,19 @@ def process_update():
                 'message': 'No update text provided'
             })
         
+        if stream:
+            return Response(stream_with_context(stream_update_events(update_text)),
+                            content_type='application/x-ndjson')
+        
         # Log output for tracking progress
         log_output = []
-        log_output.append("⏳ Processing your update...")
-        
-        # Extract tasks from update text
-        tasks = extract_tasks_from_update(update_text)
-        
-        if not tasks:
-            return jsonify({
-                'success': False,
-                'message': 'No tasks could be extracted from your update. Please check your input and try again.'
-            })
-            
-        log_output.append(f"✅ Extracted {len(tasks)} tasks from your update")
-        
-        # Get existing tasks from Notion
-        log_output.append("⏳ Fetching existing tasks from Notion...")
-        existing_tasks = fetch_notion_tasks()
-        log_output.append(f"✅ Fetched {len(existing_tasks)} existing tasks")
-        
-        # Process tasks
-        log_output.append("⏳ Processing tasks...")
-        
-        # DEBUG: Check tasks before processing
-        print("Tasks before processing:")
-        for i, task in enumerate(tasks):
-            print(f"Task {i+1}: {task.get('task', 'Unknown')} - Category: {task.get('category', 'None')}")
-        
-        for task in tasks:
-            # DEBUG: Check if security plugin is working during processing
-            security_plugin = plugin_manager.get_plugin('ProjectProtectionPlugin')
-            if security_plugin and security_plugin.enabled:
-                protected_task = security_plugin.protect_task(task.copy())
-                print(f"Original category: {task.get('category', 'None')}")
-                print(f"Protected category: {protected_task.get('category', 'None')}")
-            
-            insert_or_update_task(task, existing_tasks, log_output)
-            
-        # Get coaching insights
-        person_name = ""
-        if tasks and isinstance(tasks[0], dict) and "employee" in tasks[0]:
-            person_name = tasks[0].get("employee", "")
-            
-        peer_feedback = []
-        if person_name:
-            try:
-                peer_feedback = fetch_peer_feedback(person_name)
-                log_output.append(f"✅ Fetched {len(peer_feedback)} peer feedback entries")
-            except Exception as e:
-                log_output.append(f"⚠️ Error fetching peer feedback: {e}")
-                
-        # Get recent tasks
-        recent_tasks = pd.DataFrame()
-        try:
-            recent_tasks = existing_tasks[existing_tasks['date'] >= datetime.now() - timedelta(days=14)]
-            log_output.append(f"✅ Retrieved {len(recent_tasks)} recent tasks for analysis")
-        except Exception as e:
-            log_output.append(f"⚠️ Error retrieving recent tasks: {e}")
-            
-        # Generate coaching insights
-        log_output.append("⏳ Generating coaching insights...")
-        try:
-            reflection = get_coaching_insight(person_name, tasks, recent_tasks, peer_feedback)
-            log_output.append("✅ Generated coaching insights")
-        except Exception as e:
-            log_output.append(f"⚠️ Error generating coaching insights: {e}")
-            reflection = "Unable to generate coaching insights at this time."
-            
-        # Format tasks for display
-        tasks_formatted = []
-        for task in tasks:
-            if isinstance(task, dict) and "task" in task and "status" in task:
-                tasks_formatted.append({
-                    'task': task['task'],
-                    'status': task['status'],
-                    'employee': task.get('employee', ''),
-                    'category': task.get('category', '')
-                })
-                
-        # Return JSON response
-        return jsonify({
-            'success': True,
-            'tasks': tasks_formatted,
-            'coaching': reflection,
-            'logs': log_output if DEBUG_MODE else None
-        })
+        result = run_update_pipeline(update_text, log_output)
+        if result['success']:
+            result['logs'] = log_output if DEBUG_MODE else None
+            trace = current_trace()
+            if DEBUG_MODE and trace is not None:
+                result['timings'] = trace.totals()
+        return jsonify(result)
         
     except Exception as e:
         print(f"Error in process_update: {traceback.format_exc()}")
@@ -377,12 +349,37 @@ def process_update():
             'message': f"Error processing your update: {e}"
         })
 
+def stream_update_events(update_text):
+    """
+    Run the update pipeline as a stream of newline-delimited JSON events.
+    
+    Each task is sent as {"event": "task", "task": ...} as soon as it is
+    stored, followed by {"event": "result", ...} with the same fields as the
+    non-streaming response, or {"event": "error", "message": ...}.
+    """
+    # The request trace ends when the headers go out, so the body gets its own
+    token = begin_trace("stream /api/process_update")
+    log_output = []
+    try:
+        for event in stream_update(update_text, log_output):
+            if event['event'] == 'result' and event['success']:
+                event['logs'] = log_output if DEBUG_MODE else None
+                if DEBUG_MODE:
+                    event['timings'] = current_trace().totals()
+            yield json.dumps(event, default=str) + "\n"
+    except Exception as e:
+        print(f"Error in process_update stream: {traceback.format_exc()}")
+        yield json.dumps({'event': 'error', 'success': False,
+                          'message': f"Error processing your update: {e}"}) + "\n"
+    finally:
+        end_trace(token)
+
 @app.route('/api/stale_tasks')
 def api_stale_tasks():
     """API endpoint to get stale tasks."""
     try:
-        df = fetch_notion_tasks()
-        stale = identify_stale_tasks(df)
+        # Notion filters the stale candidates instead of sending every task
+        stale = identify_stale_tasks()
         
         if stale.empty:
             return jsonify({
@@ -455,7 +452,7 @@ def api_tasks_by_category():
             })
             
         # Get status summary
-        status_summary = filtered["status"].value_counts().to_dict()
+        status_summary = filtered["status"].value_counts().loc[lambda counts: counts > 0].to_dict()
         
         # Get AI insight
         try:
@@ -494,6 +491,27 @@ def api_categories():
             'message': f"Error fetching categories: {e}"
         })
 
+@app.route('/api/changes')
+def api_changes():
+    """API endpoint to get tasks created, updated or archived since a cursor."""
+    try:
+        since = request.args.get('since', 0, type=int)
+        limit = max(1, min(request.args.get('limit', 1000, type=int), 5000))
+        
+        feed = get_task_changes(since=since, limit=limit)
+        return jsonify({
+            'success': True,
+            'changes': feed['changes'],
+            'cursor': feed['cursor'],
+            'has_more': feed['has_more']
+        })
+    except Exception as e:
+        print(f"Error in api_changes: {traceback.format_exc()}")
+        return jsonify({
+            'success': False,
+            'message': f"Error fetching task changes: {e}"
+        })
+
 if __name__ == '__main__':
     # Check if Notion connection is valid before starting the app
     from core.adapters.notion_adapter import NotionAdapter
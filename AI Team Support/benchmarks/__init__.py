@@ -0,0 +1,3 @@
+"""
+Benchmarks package for Task Manager.
+"""
@@ -0,0 +1,112 @@
+"""
+Benchmark for trimming email bodies before task extraction.
+Reports the prompt tokens saved on synthetic reply threads and checks the new update text is kept.
+
+Run from the project directory:
+    python -m benchmarks.bench_email_preprocessor --emails 2000
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from benchmarks.model_outputs import make_tasks, EMPLOYEES
+from core.email_preprocessor import preprocess_email
+
+SIGNATURE = "{name}\nSenior Consultant | Acme Advisory\nM: +1 555 {phone}\nwww.acme-advisory.com"
+FOOTER = ("CONFIDENTIALITY NOTICE: This e-mail and any attachments are confidential and intended solely for "
+          "the use of the individual or entity to whom they are addressed. If you are not the intended "
+          "recipient, please notify the sender and delete this message.")
+
+
+def _update(rng, name):
+    """The new part of a status email: a few task sentences."""
+    lines = [f"{task['task']} - {task['status'].lower()}." for task in make_tasks(rng.randint(2, 6), rng)]
+    return lines, "Hi team,\n\n" + "\n".join(lines)
+
+
+def _signed(rng, text, name):
+    sign_off = rng.choice(["Thanks,", "Best regards,", "Cheers,", "Kind regards,"])
+    return f"{text}\n\n{sign_off}\n{SIGNATURE.format(name=name, phone=rng.randrange(1000, 9999))}"
+
+
+def _gmail_quote(rng, text):
+    header = f"On Mon, Jun {rng.randint(1, 28)}, 2024 at 9:{rng.randint(10, 59)} AM {rng.choice(EMPLOYEES)} <team@acme.com> wrote:"
+    quoted = "\n".join("> " + line if line else ">" for line in text.split("\n"))
+    return f"{header}\n{quoted}"
+
+
+def _outlook_quote(rng, text):
+    return ("________________________________\n"
+            f"From: {rng.choice(EMPLOYEES)} <team@acme.com>\n"
+            f"Sent: Monday, June {rng.randint(1, 28)}, 2024 9:12 AM\n"
+            "To: Project Team <team@acme.com>\n"
+            "Subject: RE: Weekly status\n\n" + text)
+
+
+def make_email(rng):
+    """
+    Build a status email the way mail clients write replies.
+
+    Returns:
+        Tuple[str, str, List[str]]: (shape, body, lines of the new update that must be kept).
+    """
+    name = rng.choice(EMPLOYEES)
+    lines, update = _update(rng, name)
+    shape = rng.choice(["plain", "gmail_reply", "outlook_reply", "forward", "see_below"])
+
+    history = ""
+    for _ in range(rng.randint(1, 4)):
+        _, older = _update(rng, rng.choice(EMPLOYEES))
+        history = _signed(rng, older, rng.choice(EMPLOYEES)) + ("\n\n" + history if history else "")
+        history += "\n\n" + FOOTER
+
+    if shape == "plain":
+        body = _signed(rng, update, name)
+    elif shape == "gmail_reply":
+        body = _signed(rng, update, name) + "\n\n" + _gmail_quote(rng, history)
+    elif shape == "outlook_reply":
+        body = _signed(rng, update, name) + "\n\n" + _outlook_quote(rng, history)
+    elif shape == "forward":
+        body = ("FYI\n\n---------- Forwarded message ---------\n"
+                f"From: {name} <team@acme.com>\nDate: Mon, Jun 3, 2024\nSubject: Weekly status\n\n"
+                + _signed(rng, update, name))
+    else:
+        # The update is in the quoted message, so it must survive, even below the reply's own signature
+        signature = rng.choice(["", f"-- \n{name}\n"])
+        body = f"See below\n{signature}\n" + _gmail_quote(rng, _signed(rng, update, name))
+    return shape, body + "\n\n" + FOOTER + "\n\nSent from my iPhone", lines
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--emails", type=int, default=2000)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    emails = [make_email(rng) for _ in range(args.emails)]
+
+    before, after, lost = Counter(), Counter(), Counter()
+    start = time.perf_counter()
+    results = [preprocess_email(body) for _, body, _ in emails]
+    elapsed = time.perf_counter() - start
+
+    for (shape, _, lines), (text, report) in zip(emails, results):
+        before[shape] += report["tokens_before"]
+        after[shape] += report["tokens_after"]
+        lost[shape] += sum(line not in text for line in lines)
+
+    print(f"Emails trimmed:      {len(emails):,} in {elapsed * 1000:.1f} ms "
+          f"({elapsed / len(emails) * 1e6:.0f} us per email)")
+    print(f"{'shape':<15} {'tokens before':>14} {'after':>10} {'saved':>7} {'update lines lost':>18}")
+    for shape in sorted(before):
+        saved = 1 - after[shape] / before[shape]
+        print(f"{shape:<15} {before[shape]:>14,} {after[shape]:>10,} {saved:>7.0%} {lost[shape]:>18}")
+    total_before, total_after = sum(before.values()), sum(after.values())
+    print(f"{'total':<15} {total_before:>14,} {total_after:>10,} {1 - total_after / total_before:>7.0%} "
+          f"{sum(lost.values()):>18}")
+
+
+if __name__ == "__main__":
+    main()
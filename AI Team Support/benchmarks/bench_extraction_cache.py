@@ -0,0 +1,84 @@
+"""
+Benchmark for the task extraction cache.
+Extracts each synthetic update twice, as a resubmitted update is, and checks the second pass never calls the model.
+
+Updates name projects the token map hasn't seen yet, which is when the
+protected text of an update changes between the first and second pass.
+
+Run from the project directory:
+    python -m benchmarks.bench_extraction_cache --updates 200
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.standins import OpenAIStandIn
+from benchmarks.synthetic import make_update
+
+# Must be installed before any module creates its OpenAI client
+from core.adapters.openai_transport import set_openai_transport
+
+EXTRACTORS = ("core.task_extractor", "core.ai.extractors")
+
+
+def _extract_twice(extract, updates, standin):
+    """Extract every update twice; returns (chat calls per pass, seconds per pass, mismatched results)."""
+    calls, seconds, results = [], [], []
+    for _ in range(2):
+        standin.reset_counts()
+        start = time.perf_counter()
+        results.append([extract(text) for text in updates])
+        seconds.append(time.perf_counter() - start)
+        calls.append(sum(count for endpoint, count in standin.reset_counts().items() if "chat" in endpoint))
+    mismatched = sum(first != second for first, second in zip(*results))
+    return calls, seconds, mismatched
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--updates", type=int, default=200)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    standin = OpenAIStandIn(dim=64)
+    set_openai_transport(standin)
+
+    import core
+    import core.task_extractor as task_extractor
+    import core.ai.extractors as ai_extractors
+    from plugins import plugin_manager
+
+    rng = random.Random(args.seed)
+    updates = [make_update([], rng, tasks=4, new_share=1.0) for _ in range(args.updates)]
+    # The rules would read these updates without a model call, leaving nothing to cache
+    task_extractor.FAST_PATH_ENABLED = False
+
+    with tempfile.TemporaryDirectory(prefix="bench_extraction_cache_") as workdir:
+        # Plugins were discovered relative to the project directory on import;
+        # the token map and the cache are written to the scratch directory
+        os.chdir(workdir)
+        plugin_manager.register_plugin_by_name('ProjectProtectionPlugin', {
+            'token_file_path': os.path.join(workdir, 'security_tokens.json'),
+            'enabled': True,
+        })
+
+        print(f"{'extractor':<22} {'model calls':>12} {'resubmitted':>12} {'first pass':>11} "
+              f"{'resubmitted':>12} {'changed':>8}")
+        for name, module in zip(EXTRACTORS, (task_extractor, ai_extractors)):
+            calls, seconds, mismatched = _extract_twice(module.extract_tasks_from_update, updates, standin)
+            print(f"{name:<22} {calls[0]:>12,} {calls[1]:>12,} {seconds[0] * 1000:>9.0f}ms "
+                  f"{seconds[1] * 1000:>10.0f}ms {mismatched:>8}")
+
+        conn = sqlite3.connect("extraction_cache.db")
+        stored = " ".join(str(value) for row in conn.execute("SELECT * FROM extractions") for value in row)
+        conn.close()
+        leaked = sum(f"Project {i}" in stored for i in range(200))
+        print(f"Project names stored in the cache: {leaked}")
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+if __name__ == "__main__":
+    main()
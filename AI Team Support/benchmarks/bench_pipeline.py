@@ -0,0 +1,311 @@
+"""
+End-to-end benchmark for the update pipeline.
+Drives core.pipeline.process_update against local OpenAI and Notion stand-ins
+on synthetic task corpora and reports per-stage latency and throughput.
+
+Run from the project directory:
+    python -m benchmarks.bench_pipeline --sizes 1000 10000 100000 --updates 20
+
+With --stream, updates go through core.pipeline.stream_update instead, and
+"first_task" is the time until the first task is stored rather than the
+time until all of them are.
+
+Every update is traced; --trace writes the spans of each corpus as a Chrome
+trace (chrome://tracing or Perfetto).
+
+Each corpus size runs in its own process, with Notion served from a fixture
+store (NOTION_REPLAY_STORE) and every local store (embedding cache, registry,
+change feed, ...) created in a temporary directory, so runs never touch real
+data and one size's caches don't warm the next. Results are written as JSON
+to benchmarks/results/ for comparison over time.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Any
+
+import numpy as np
+
+from benchmarks.standins import OpenAIStandIn
+from benchmarks.synthetic import make_task_pages, make_feedback_pages, make_update
+
+# Must be installed before any module creates its OpenAI client
+from core.adapters.openai_transport import set_openai_transport
+from config import NOTION_DATABASE_ID, NOTION_FEEDBACK_DB_ID
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_DIR, "benchmarks", "results")
+
+# Stages reported; "process" is split into matching and Notion writes, and
+# "first_task" is when the user sees the first stored task
+REPORTED_STAGES = ("extract", "fetch", "match", "write", "feedback", "coaching", "first_task", "total")
+WRITE_SPANS = ("notion.insert_task", "notion.update_task")
+
+# Databases the fixtures are served under
+TASK_DB_ID = NOTION_DATABASE_ID or "00000000-0000-4000-8000-0000000000aa"
+FEEDBACK_DB_ID = NOTION_FEEDBACK_DB_ID or "00000000-0000-4000-8000-0000000000bb"
+
+
+def percentile_summary(values: List[float]) -> Dict[str, float]:
+    """Summarize stage times in milliseconds."""
+    if not values:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+    ms = np.asarray(values) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def write_seconds(totals: Dict[str, Dict[str, float]]) -> float:
+    """Total time spent in Notion page writes according to a trace's span totals."""
+    return sum(totals.get(name, {}).get("total_ms", 0.0) for name in WRITE_SPANS) / 1000
+
+
+def git_revision() -> str:
+    """Current commit of the project, or "" outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_corpus(args) -> Dict[str, Any]:
+    """
+    Run the pipeline over one synthetic corpus in this process.
+
+    Expects NOTION_REPLAY_STORE to point at the corpus fixtures and the
+    working directory to be the corpus's scratch directory.
+
+    Args:
+        args: Parsed command line arguments, with a single size.
+
+    Returns:
+        Dict[str, Any]: Results for this corpus.
+    """
+    size = args.sizes[0]
+    openai_standin = OpenAIStandIn(dim=args.embedding_dim, latency=args.openai_latency,
+                                   embedding_latency=args.embedding_latency, chunk_latency=args.chunk_latency)
+    set_openai_transport(openai_standin)
+
+    import core
+    from core.adapters.notion_replay import replay_notion_client
+    from core.adapters.notion_transport import EndpointStats
+    from core.pipeline import process_update, stream_update
+    from core.tracing import trace
+    from plugins import initialize_all_plugins
+
+    initialize_all_plugins()
+
+    stats = EndpointStats()
+    adapter = core.notion_adapter
+    adapter.client = replay_notion_client(os.environ["NOTION_REPLAY_STORE"], latency=args.notion_latency,
+                                          stats=stats)
+    adapter.task_db_id = TASK_DB_ID
+    adapter.feedback_db_id = FEEDBACK_DB_ID
+
+    pages = make_task_pages(size, seed=args.seed)
+    rng = random.Random(args.seed)
+    updates = [make_update(pages, rng, tasks=args.tasks_per_update)
+               for _ in range(args.warmup + args.updates)]
+    del pages
+
+    samples = {stage: [] for stage in REPORTED_STAGES}
+    warmup = []
+    writes_before = dict(adapter.write_stats)
+    openai_standin.reset_counts()
+    cpu_start, wall_start = time.process_time(), None
+    tasks_processed = 0
+
+    for i, update_text in enumerate(updates):
+        if i == args.warmup:
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        with trace("process_update") as update_trace:
+            if args.stream:
+                for event in stream_update(update_text, timings=timings):
+                    if "first_task" not in timings:
+                        timings["first_task"] = time.perf_counter() - start
+                result = event
+            else:
+                result = process_update(update_text, timings=timings)
+        timings["total"] = time.perf_counter() - start
+        timings.setdefault("first_task", timings["total"])
+        timings["write"] = write_seconds(update_trace.totals())
+        timings["match"] = max(0.0, timings.get("process", 0.0) - timings["write"])
+
+        if not result.get("success"):
+            raise RuntimeError(f"Update {i} failed: {result.get('message')}")
+        if i < args.warmup:
+            warmup.append({stage: round(timings.get(stage, 0.0) * 1000, 3) for stage in REPORTED_STAGES})
+            continue
+
+        tasks_processed += len(result["tasks"])
+        for stage in REPORTED_STAGES:
+            samples[stage].append(timings.get(stage, 0.0))
+
+    wall = time.perf_counter() - wall_start if wall_start is not None else 0.0
+    cpu = time.process_time() - cpu_start
+    measured = len(samples["total"])
+
+    return {
+        "corpus_tasks": size,
+        "updates": measured,
+        "tasks_processed": tasks_processed,
+        "warmup_ms": warmup,
+        "stages": {stage: percentile_summary(samples[stage]) for stage in REPORTED_STAGES},
+        "throughput": {
+            "wall_seconds": round(wall, 3),
+            "cpu_seconds": round(cpu, 3),
+            "updates_per_second": round(measured / wall, 3) if wall else 0.0,
+            "updates_per_cpu_second": round(measured / cpu, 3) if cpu else 0.0,
+            "tasks_per_cpu_second": round(tasks_processed / cpu, 3) if cpu else 0.0,
+        },
+        "notion_requests": {endpoint: int(values["count"]) for endpoint, values in stats.snapshot().items()},
+        "openai_requests": openai_standin.reset_counts(),
+        "notion_writes": {key: adapter.write_stats[key] - writes_before.get(key, 0)
+                          for key in adapter.write_stats},
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def build_fixtures(path: str, size: int, args) -> None:
+    """Write the Notion fixtures for one corpus to a SQLite file."""
+    from core.adapters.notion_replay import NotionFixtureStore
+
+    store = NotionFixtureStore(path)
+    store.add_pages(TASK_DB_ID, make_task_pages(size, seed=args.seed))
+    store.add_pages(FEEDBACK_DB_ID, make_feedback_pages(args.feedback, seed=args.seed))
+
+
+def run_worker(size: int, workdir: str, args) -> Dict[str, Any]:
+    """
+    Run one corpus size in a fresh process and return its results.
+
+    Args:
+        size: Number of tasks in the corpus.
+        workdir: Scratch directory for the corpus.
+        args: Parsed command line arguments.
+
+    Returns:
+        Dict[str, Any]: Results for this corpus, or its size and an "error" if the run failed.
+    """
+    fixtures = os.path.join(workdir, "notion_fixtures.db")
+    output = os.path.join(workdir, "result.json")
+    build_fixtures(fixtures, size, args)
+
+    command = [sys.executable, "-m", "benchmarks.bench_pipeline", "--worker", workdir, "--output", output,
+               "--sizes", str(size)]
+    for option in ("updates", "warmup", "tasks_per_update", "feedback", "embedding_dim",
+                   "openai_latency", "embedding_latency", "chunk_latency", "notion_latency", "seed"):
+        command += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+    if args.stream:
+        command.append("--stream")
+
+    env = dict(os.environ, NOTION_REPLAY_STORE=fixtures)
+    if args.trace:
+        base, ext = os.path.splitext(os.path.abspath(args.trace))
+        env.update(TRACE_EXPORT_PATH=f"{base}-{size}{ext or '.json'}", TRACE_EXPORT_FORMAT="chrome")
+    completed = subprocess.run(command, cwd=PROJECT_DIR, env=env,
+                               stdout=None if args.verbose else subprocess.DEVNULL)
+    if completed.returncode < 0:
+        # Usually SIGKILL from the out-of-memory killer
+        return {"corpus_tasks": size, "error": f"worker killed by signal {-completed.returncode}"}
+    if completed.returncode != 0:
+        return {"corpus_tasks": size, "error": f"worker exited with code {completed.returncode}"}
+    with open(output, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    """Print one corpus's results as a table."""
+    if "error" in result:
+        print(f"\nCorpus: {result['corpus_tasks']:,} tasks: {result['error']}")
+        return
+    print(f"\nCorpus: {result['corpus_tasks']:,} tasks, {result['updates']} updates, "
+          f"peak RSS {result['peak_rss_mb']:,.0f} MB")
+    print(f"  {'stage':<10}{'p50 ms':>12}{'p95 ms':>12}{'mean ms':>12}")
+    for stage, summary in result["stages"].items():
+        print(f"  {stage:<10}{summary['p50_ms']:>12.1f}{summary['p95_ms']:>12.1f}{summary['mean_ms']:>12.1f}")
+    throughput = result["throughput"]
+    print(f"  throughput: {throughput['updates_per_second']:.2f} updates/s, "
+          f"{throughput['updates_per_cpu_second']:.2f} updates per CPU second, "
+          f"{throughput['tasks_per_cpu_second']:.2f} tasks per CPU second")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    arg_parser.add_argument("--updates", type=int, default=20, help="Measured updates per corpus")
+    arg_parser.add_argument("--warmup", type=int, default=1, help="Unmeasured updates run first")
+    arg_parser.add_argument("--tasks-per-update", type=int, default=5)
+    arg_parser.add_argument("--feedback", type=int, default=500, help="Peer feedback entries")
+    arg_parser.add_argument("--embedding-dim", type=int, default=1536)
+    arg_parser.add_argument("--openai-latency", type=float, default=0.0, help="Seconds per chat completion")
+    arg_parser.add_argument("--chunk-latency", type=float, default=0.0,
+                            help="Seconds between streamed chunks of a chat completion (16 characters each)")
+    arg_parser.add_argument("--stream", action="store_true", help="Process updates with stream_update")
+    arg_parser.add_argument("--embedding-latency", type=float, default=0.0, help="Seconds per embeddings call")
+    arg_parser.add_argument("--notion-latency", type=float, default=0.0, help="Seconds per Notion request")
+    arg_parser.add_argument("--seed", type=int, default=7)
+    arg_parser.add_argument("--output", help="JSON result file (default: benchmarks/results/pipeline-<time>.json)")
+    arg_parser.add_argument("--trace", help="Chrome trace file; each corpus size gets its own, suffixed with the size")
+    arg_parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    arg_parser.add_argument("--worker", metavar="DIR", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.worker:
+        # Plugins were discovered relative to the project directory on import;
+        # everything the pipeline stores from here on lands in the scratch directory
+        os.chdir(args.worker)
+        result = run_corpus(args)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    started = datetime.now()
+    output = os.path.abspath(args.output or os.path.join(
+        RESULTS_DIR, f"pipeline-{started.strftime('%Y%m%d-%H%M%S')}.json"))
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as workdir:
+        for size in args.sizes:
+            corpus_dir = os.path.join(workdir, str(size))
+            os.makedirs(corpus_dir)
+            result = run_worker(size, corpus_dir, args)
+            print_report(result)
+            results.append(result)
+
+    settings = vars(args)
+    settings.pop("worker")
+    report = {
+        "benchmark": "pipeline",
+        "started_at": started.isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": settings,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark for requesting only the task properties fetch_tasks reads.
+Compares payload size and decode + parse time of full and projected query pages.
+
+Run from the project directory:
+    python -m benchmarks.bench_property_projection --pages 20000
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.synthetic import make_task_page, add_workspace_properties
+from core.adapters.notion_adapter import NotionAdapter
+from core.adapters.notion_parser import TaskColumns
+
+
+def make_responses(pages, page_size=100):
+    """Serialize pages into databases.query response bodies."""
+    responses = []
+    for i in range(0, len(pages), page_size):
+        responses.append(json.dumps({
+            "object": "list",
+            "results": pages[i:i + page_size],
+            "next_cursor": None,
+            "has_more": i + page_size < len(pages),
+        }).encode())
+    return responses
+
+
+def project(page):
+    """What Notion returns for a page when filter_properties is used."""
+    projected = dict(page)
+    projected["properties"] = {name: page["properties"][name] for name in NotionAdapter.TASK_PROPERTIES}
+    return projected
+
+
+def decode_and_parse(responses):
+    """Decode response bodies and parse them into a task DataFrame."""
+    columns = TaskColumns()
+    for body in responses:
+        columns.add_pages(json.loads(body)["results"])
+    return columns.to_frame()
+
+
+def best_of(func, arg, repeat):
+    """Return the fastest wall time of func(arg)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--pages", type=int, default=20000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(7)
+    pages = [add_workspace_properties(make_task_page(i, rng), rng) for i in range(args.pages)]
+
+    full = make_responses(pages)
+    projected = make_responses([project(page) for page in pages])
+
+    full_bytes = sum(len(body) for body in full)
+    projected_bytes = sum(len(body) for body in projected)
+    full_time = best_of(decode_and_parse, full, args.repeat)
+    projected_time = best_of(decode_and_parse, projected, args.repeat)
+
+    print(f"Pages:            {args.pages:,} ({len(pages[0]['properties'])} properties each)")
+    print(f"Full payload:     {full_bytes / 1e6:.1f} MB, decode + parse {full_time:.3f}s")
+    print(f"Projected:        {projected_bytes / 1e6:.1f} MB, decode + parse {projected_time:.3f}s")
+    print(f"Reduction:        {full_bytes / projected_bytes:.1f}x bytes, {full_time / projected_time:.1f}x time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark for the rule-based extraction fast path.
+Reports how many synthetic updates skip the model and how accurate the rule-extracted tasks are.
+
+Run from the project directory:
+    python -m benchmarks.bench_rule_extractor --updates 2000
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from benchmarks.model_outputs import make_tasks, EMPLOYEES
+from core.rule_extractor import RuleBasedExtractor
+
+SECTION_TITLES = {"Completed": "Done", "In Progress": "In progress", "Pending": "Next steps", "Blocked": "Blockers"}
+# Title-case first lines that look like names but aren't; the rules must leave these to the model
+TITLES = ["Client Onboarding Recap", "Acme Renewal Notes", "Quarterly Planning Review", "Data Migration Recap"]
+STATUS_PHRASES = {"Completed": "finished", "In Progress": "still working on it", "Pending": "planned for next week",
+                  "Blocked": "waiting on the client"}
+
+
+def make_update(rng):
+    """
+    Build a status update in one of the shapes people send.
+
+    Returns:
+        Tuple[str, str, List[Dict]]: (shape, update text, tasks it contains).
+    """
+    name = rng.choice(EMPLOYEES)
+    tasks = make_tasks(rng.randint(2, 6), rng)
+    header = f"{name}\nJune {rng.randint(1, 28)}, 2024\n"
+    shape = rng.choice(["status_sections", "project_bullets", "checkboxes", "prose", "titled"])
+    if shape == "titled":
+        header = f"{rng.choice(TITLES)}\nJune {rng.randint(1, 28)}, 2024\n"
+
+    if shape == "status_sections":
+        lines = []
+        for status, title in SECTION_TITLES.items():
+            items = [task for task in tasks if task["status"] == status]
+            if items:
+                lines += ["", f"{title}:"] + [f"- {task['task']}" for task in items]
+        body = "\n".join(lines)
+    elif shape in ("project_bullets", "titled"):
+        lines = []
+        for category in sorted({task["category"] for task in tasks}):
+            lines += ["", f"{category}:"]
+            lines += [f"- {task['task']}, {STATUS_PHRASES[task['status']]}"
+                      for task in tasks if task["category"] == category]
+        body = "\n".join(lines)
+    elif shape == "checkboxes":
+        body = "\n" + "\n".join(f"- [{'x' if task['status'] == 'Completed' else ' '}] {task['task']}"
+                                for task in tasks)
+        for task in tasks:
+            if task["status"] != "Completed":
+                task["status"] = "Pending"
+    else:
+        body = "\nHi all, quick one today. " + " Then ".join(
+            f"I {task['task'][0].lower()}{task['task'][1:]} which is {STATUS_PHRASES[task['status']]}."
+            for task in tasks)
+    return shape, header + body + "\n\nThanks,\n" + name, tasks
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--updates", type=int, default=2000)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    updates = [make_update(rng) for _ in range(args.updates)]
+    extractor = RuleBasedExtractor(known_employees=lambda: EMPLOYEES)
+
+    start = time.perf_counter()
+    results = [extractor.parse(text) for _, text, _ in updates]
+    elapsed = time.perf_counter() - start
+
+    seen, hits, tasks_out, correct = Counter(), Counter(), Counter(), Counter()
+    reasons = Counter()
+    for (shape, _, expected), (tasks, confidence, reason) in zip(updates, results):
+        seen[shape] += 1
+        if tasks and confidence >= extractor.min_confidence:
+            hits[shape] += 1
+            tasks_out[shape] += len(expected)
+            # Rule-extracted task text keeps any status phrase after the task
+            correct[shape] += sum(any(found["task"].startswith(task["task"]) and found["status"] == task["status"]
+                                      for found in tasks) for task in expected)
+        else:
+            reasons[reason] += 1
+
+    print(f"Updates parsed:      {len(updates):,} in {elapsed * 1000:.1f} ms "
+          f"({elapsed / len(updates) * 1e6:.0f} us per update)")
+    print(f"{'shape':<17} {'updates':>8} {'fast path':>10} {'tasks right':>12}")
+    for shape in sorted(seen):
+        accuracy = f"{correct[shape] / tasks_out[shape]:.1%}" if tasks_out[shape] else "-"
+        print(f"{shape:<17} {seen[shape]:>8,} {hits[shape] / seen[shape]:>10.0%} {accuracy:>12}")
+    print(f"Fell back to model:  {dict(reasons)}")
+    print(f"Titled updates taken without the model (must be 0): {hits['titled']}")
+
+
+if __name__ == "__main__":
+    main()
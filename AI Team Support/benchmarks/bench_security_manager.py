@@ -0,0 +1,138 @@
+"""
+Benchmark for protecting and restoring project names in text.
+Compares the old per-project replace loop with the single-pass regexes in SecurityManager,
+and per-row dict round trips with column operations on task DataFrames.
+
+Run from the project directory:
+    python -m benchmarks.bench_security_manager --projects 10000 --texts 2000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+from core.security.security_manager import SecurityManager
+
+WORDS = ["Apollo", "Beacon", "Cedar", "Delta", "Ember", "Falcon", "Granite", "Harbor", "Iris", "Juniper",
+         "Keystone", "Lumen", "Meridian", "Nova", "Orion", "Pioneer", "Quartz", "Ridge", "Summit", "Tide"]
+FILLER = ("Met with the client to review requirements and agreed next steps. The team will follow up "
+          "on open questions before the next sprint planning session.")
+
+
+def make_project_names(count, rng):
+    """Distinct project names, many sharing a prefix like real portfolios do."""
+    names = set()
+    while len(names) < count:
+        names.add(f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.randrange(10000)}")
+    return sorted(names)
+
+
+def make_texts(names, count, mentions, rng, filler_repeat):
+    """Texts mentioning a few project names each, surrounded by filler."""
+    texts = []
+    for _ in range(count):
+        parts = []
+        for name in rng.sample(names, mentions):
+            parts.append(" ".join([FILLER] * filler_repeat))
+            parts.append(f"Worked on {name}.")
+        texts.append(" ".join(parts))
+    return texts
+
+
+def make_task_frame(names, rows, rng):
+    """A task DataFrame like fetch_tasks returns, with project names in categories and task text."""
+    return pd.DataFrame({
+        "task": [f"Reviewed the {rng.choice(names)} budget" for _ in range(rows)],
+        "category": [rng.choice(names) for _ in range(rows)],
+        "status": [rng.choice(["Completed", "In Progress", "Pending"]) for _ in range(rows)],
+    })
+
+
+def legacy_protect(manager, text):
+    """The replace loop protect_text used before the single-pass regex."""
+    for project_name, token in manager.token_map.items():
+        if project_name in text:
+            text = text.replace(project_name, token)
+    return text
+
+
+def legacy_unprotect(manager, text):
+    """The replace loop unprotect_text used before the single-pass regex."""
+    for token, project_name in manager.reverse_map.items():
+        if token in text:
+            text = text.replace(token, project_name)
+    return text
+
+
+def run(func, texts):
+    """Apply func to every text and return the wall time and results."""
+    start = time.perf_counter()
+    results = [func(text) for text in texts]
+    return time.perf_counter() - start, results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--projects", type=int, default=10000)
+    arg_parser.add_argument("--texts", type=int, default=2000, help="Task texts and emails each")
+    arg_parser.add_argument("--rows", type=int, default=100000, help="Rows in the task DataFrame")
+    arg_parser.add_argument("--mentions", type=int, default=3, help="Project names mentioned per text")
+    args = arg_parser.parse_args()
+
+    rng = random.Random(7)
+    names = make_project_names(args.projects, rng)
+
+    # Load the mappings from a token file rather than tokenizing each name, which saves the file every time
+    with tempfile.TemporaryDirectory() as scratch:
+        token_path = os.path.join(scratch, "security_tokens.json")
+        generator = SecurityManager(os.path.join(scratch, "unused.json"))
+        with open(token_path, "w") as f:
+            json.dump({"token_map": {name: generator._generate_token(name) for name in names}}, f)
+        manager = SecurityManager(token_path)
+
+    start = time.perf_counter()
+    manager._get_project_regex()
+    compile_time = time.perf_counter() - start
+
+    corpora = {
+        "task texts": make_texts(names, args.texts, args.mentions, rng, filler_repeat=1),
+        "emails": make_texts(names, args.texts, args.mentions, rng, filler_repeat=12),
+    }
+
+    print(f"Projects:         {len(manager.token_map):,} (regex built in {compile_time * 1000:.0f}ms)")
+    for label, texts in corpora.items():
+        old_time, old_protected = run(lambda text: legacy_protect(manager, text), texts)
+        new_time, new_protected = run(manager.protect_text, texts)
+        old_restore, old_restored = run(lambda text: legacy_unprotect(manager, text), old_protected)
+        new_restore, new_restored = run(manager.unprotect_text, new_protected)
+        assert new_restored == texts == old_restored
+        # The loop replaces names inside longer ones, e.g. "Nova 12" within "Nova 123",
+        # leaving part of the longer name ("PROJ_...3") in the protected text
+        leaky = sum(old != new for old, new in zip(old_protected, new_protected))
+
+        chars = sum(len(text) for text in texts)
+        print(f"{label.capitalize()}: {len(texts):,} texts, {chars / len(texts):,.0f} chars on average, "
+              f"{leaky} left partly unprotected by the loop")
+        print(f"  protect:   loop {old_time * 1e3 / len(texts):8.3f}ms/text, "
+              f"single pass {new_time * 1e3 / len(texts):.3f}ms/text ({old_time / new_time:.0f}x)")
+        print(f"  unprotect: loop {old_restore * 1e3 / len(texts):8.3f}ms/text, "
+              f"single pass {new_restore * 1e3 / len(texts):.3f}ms/text ({old_restore / new_restore:.0f}x)")
+
+    # Task DataFrames: round trip through dicts against column operations
+    frame = make_task_frame(names, args.rows, rng)
+    old_time, _ = run(lambda df: pd.DataFrame(manager.protect_task_list(df.to_dict("records"))), [frame])
+    new_time, (protected,) = run(lambda df: manager.protect_task_frame(df.copy()), [frame])
+    old_restore, _ = run(lambda df: pd.DataFrame(manager.unprotect_task_list(df.to_dict("records"))), [protected])
+    new_restore, (restored,) = run(lambda df: manager.unprotect_task_frame(df.copy()), [protected])
+    assert restored.equals(frame)
+    print(f"Task DataFrame: {args.rows:,} rows")
+    print(f"  protect:   dicts {old_time:.3f}s, columns {new_time:.3f}s ({old_time / new_time:.1f}x)")
+    print(f"  unprotect: dicts {old_restore:.3f}s, columns {new_restore:.3f}s ({old_restore / new_restore:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
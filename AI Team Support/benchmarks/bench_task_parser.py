@@ -0,0 +1,159 @@
+"""
+Benchmark for parsing task lists out of model responses.
+Compares the old four-step parse chain with the single-pass tolerant parser, and fuzzes the new one.
+
+Run from the project directory:
+    python -m benchmarks.bench_task_parser --responses 2000 --fuzz 20000
+"""
+import argparse
+import ast
+import json
+import random
+import re
+import time
+from collections import Counter, defaultdict
+
+from benchmarks.model_outputs import STYLES, make_model_outputs, make_tasks
+from core.task_parser import parse_task_list, TaskParseError
+
+# Characters the fuzzer inserts: the ones that matter to the parser
+FUZZ_CHARS = "'\"{}[],:\\\n `#"
+
+
+def parse_chain(content):
+    """The parse chain task_extractor used before the tolerant parser, without its logging."""
+    if "```" in content:
+        content = re.sub(r'```(?:python|json)?\n(.*?)```', r'\1', content, flags=re.DOTALL)
+    content = content.strip()
+    try:
+        return json.loads(content.replace("'", '"'))
+    except json.JSONDecodeError:
+        try:
+            match = re.search(r'\[\s*{.*}\s*\]', content, re.DOTALL)
+            if match:
+                return json.loads(match.group(0).replace("'", '"'))
+            return None
+        except Exception:
+            try:
+                return ast.literal_eval(content)
+            except Exception:
+                try:
+                    # The original called eval(content); builtins are removed here as the fuzzer feeds it
+                    return eval(content, {"__builtins__": {}})
+                except Exception:
+                    raise ValueError("Could not parse AI response as valid task data")
+
+
+def parse_tolerant(content):
+    return parse_task_list(content)
+
+
+def run(func, outputs):
+    """Parse every response; return wall time and per-style (exact, partial, failed) counts."""
+    results = defaultdict(Counter)
+    start = time.perf_counter()
+    parsed = []
+    for _, content, _ in outputs:
+        try:
+            parsed.append(func(content))
+        except Exception:
+            parsed.append(None)
+    elapsed = time.perf_counter() - start
+
+    for (style, _, tasks), result in zip(outputs, parsed):
+        if result == tasks:
+            results[style]["exact"] += 1
+        elif isinstance(result, list) and result and all(task in tasks for task in result):
+            results[style]["partial"] += 1
+        else:
+            results[style]["failed"] += 1
+    return elapsed, results
+
+
+def mutate(content, rng):
+    """Apply one random edit of the kind a model or a transport cuts/garbles."""
+    i = rng.randrange(len(content) + 1)
+    kind = rng.randrange(5)
+    if kind == 0:
+        return content[:i] + rng.choice(FUZZ_CHARS) + content[i:]
+    if kind == 1:
+        return content[:i] + content[i + 1:]
+    if kind == 2:
+        return content[:i]
+    if kind == 3:
+        j = rng.randrange(len(content) + 1)
+        return content[:i] + content[min(i, j):max(i, j)] + content[i:]
+    return content[i:]
+
+
+def fuzz(outputs, count, seed):
+    """Feed mutated responses to the parser; it may only return a list or raise TaskParseError."""
+    rng = random.Random(seed)
+    outcomes = Counter()
+    slowest = 0.0
+    for n in range(count):
+        content = outputs[n % len(outputs)][1]
+        for _ in range(rng.randint(1, 4)):
+            content = mutate(content, rng)
+        start = time.perf_counter()
+        try:
+            result = parse_task_list(content)
+            assert isinstance(result, list), f"returned {type(result)}"
+            outcomes["parsed"] += 1
+        except TaskParseError as e:
+            assert 1 <= e.line and 1 <= e.column and 0 <= e.position <= len(content), str(e)
+            outcomes["error"] += 1
+        except Exception as e:
+            outcomes["crash"] += 1
+            print(f"Crash on {content!r}: {e!r}")
+        slowest = max(slowest, time.perf_counter() - start)
+    return outcomes, slowest
+
+
+def round_trip(count, seed):
+    """Random task lists written as JSON and as Python literals must parse back unchanged."""
+    rng = random.Random(seed)
+    failures = 0
+    for _ in range(count):
+        tasks = make_tasks(rng.randint(0, 5), rng)
+        for task in tasks:
+            task["hours"] = rng.choice([None, True, 1.5, -2, 3e2])
+            task["tags"] = [rng.choice(["a\\b", "tab\there", "üñí", "new\nline"]) for _ in range(rng.randint(0, 2))]
+        for content in (json.dumps(tasks), json.dumps(tasks, ensure_ascii=False), repr(tasks)):
+            if parse_task_list(content) != tasks:
+                failures += 1
+                print(f"Round trip failed for {content!r}")
+    return failures
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--responses", type=int, default=2000)
+    arg_parser.add_argument("--fuzz", type=int, default=20000)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    outputs = make_model_outputs(args.responses, seed=args.seed)
+    chain_time, chain_results = run(parse_chain, outputs)
+    tolerant_time, tolerant_results = run(parse_tolerant, outputs)
+
+    print(f"Responses parsed:    {len(outputs):,}")
+    print(f"{'style':<18} {'old chain (exact/partial/failed)':>34} {'tolerant':>20}")
+    for style in STYLES:
+        old, new = chain_results[style], tolerant_results[style]
+        print(f"{style:<18} {old['exact']:>20}/{old['partial']}/{old['failed']:<10} "
+              f"{new['exact']:>10}/{new['partial']}/{new['failed']}")
+    print(f"Old parse chain:     {chain_time * 1000:.1f} ms")
+    print(f"Tolerant parser:     {tolerant_time * 1000:.1f} ms")
+    print(f"Speedup:             {chain_time / tolerant_time:.1f}x")
+
+    if args.fuzz:
+        outcomes, slowest = fuzz(outputs, args.fuzz, args.seed)
+        print(f"Fuzzed responses:    {args.fuzz:,} ({outcomes['parsed']:,} parsed, "
+              f"{outcomes['error']:,} TaskParseError, {outcomes['crash']} crashes)")
+        print(f"Slowest fuzzed:      {slowest * 1000:.2f} ms")
+        print(f"Round-trip failures: {round_trip(args.fuzz // 10, args.seed)}")
+
+
+if __name__ == "__main__":
+    main()
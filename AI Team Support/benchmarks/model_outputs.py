@@ -0,0 +1,103 @@
+"""
+Synthetic model responses for Task Manager benchmarks.
+Generates task extraction responses in the shapes the chat model actually returns.
+"""
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.synthetic import STATUSES, VERBS, OBJECTS
+
+EMPLOYEES = ["Alice Chen", "Bob O'Neil", "Carla Diaz", "Dev Patel", "Erin Walsh"]
+CATEGORIES = ["PROJ_1a2b3c4d", "PROJ_5e6f7a8b", "Internal", "Training"]
+# Phrasing with apostrophes and quotes, which broke the old quote-replacing parser
+DETAILS = ["", " for the client's review", " per Sarah's notes", ' marked "final"', " (v2)",
+           " ahead of Friday's call", " and shared it with the team"]
+
+PROSE_BEFORE = ["Here are the extracted tasks:\n\n", "Sure! Based on the update, these are the tasks:\n",
+                "I found the following tasks in the email thread.\n\n"]
+PROSE_AFTER = ["\n\nLet me know if you need anything else.", "\n\nNote: dates were inferred from the email headers.",
+               ""]
+
+
+def make_tasks(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Build task dictionaries like the ones the extraction prompt asks for."""
+    today = datetime(2024, 6, 1)
+    return [{
+        "task": f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}{rng.choice(DETAILS)}",
+        "status": rng.choice(STATUSES),
+        "employee": rng.choice(EMPLOYEES),
+        "date": (today - timedelta(days=rng.randrange(30))).strftime("%Y-%m-%d"),
+        "category": rng.choice(CATEGORIES),
+    } for _ in range(count)]
+
+
+def _python_literal(tasks: List[Dict[str, Any]]) -> str:
+    """Python repr, one task per line, as the model writes when it imitates the prompt."""
+    lines = ",\n".join("    " + repr(task) for task in tasks)
+    return f"[\n{lines}\n]"
+
+
+def _single_quoted(tasks: List[Dict[str, Any]]) -> str:
+    """Single quotes everywhere, apostrophes left unescaped."""
+    rows = []
+    for task in tasks:
+        fields = ", ".join(f"'{key}': '{value}'" for key, value in task.items())
+        rows.append("    {" + fields + "}")
+    return "[\n" + ",\n".join(rows) + "\n]"
+
+
+def _trailing_commas(tasks: List[Dict[str, Any]]) -> str:
+    rows = []
+    for task in tasks:
+        fields = "".join(f'        "{key}": {json.dumps(value)},\n' for key, value in task.items())
+        rows.append("    {\n" + fields + "    },\n")
+    return "[\n" + "".join(rows) + "]"
+
+
+def _unescaped_quotes(tasks: List[Dict[str, Any]]) -> str:
+    """Double quotes inside values written without escapes."""
+    rows = []
+    for task in tasks:
+        fields = ", ".join(f'"{key}": "{value}"' for key, value in task.items())
+        rows.append("  {" + fields + "}")
+    return "[\n" + ",\n".join(rows) + "\n]"
+
+
+# Response shapes: name -> function rendering a task list as the model would
+STYLES: Dict[str, Callable[[List[Dict[str, Any]], random.Random], str]] = {
+    "json": lambda tasks, rng: json.dumps(tasks, indent=2),
+    "json_fenced": lambda tasks, rng: "```json\n" + json.dumps(tasks, indent=2) + "\n```",
+    "python_fenced": lambda tasks, rng: "```python\n" + _python_literal(tasks) + "\n```",
+    "python": lambda tasks, rng: _python_literal(tasks),
+    "single_quoted": lambda tasks, rng: _single_quoted(tasks),
+    "prose_fenced": lambda tasks, rng: (rng.choice(PROSE_BEFORE) + "```json\n" + json.dumps(tasks, indent=2)
+                                        + "\n```" + rng.choice(PROSE_AFTER)),
+    "trailing_commas": lambda tasks, rng: _trailing_commas(tasks),
+    "unescaped_quotes": lambda tasks, rng: _unescaped_quotes(tasks),
+    "truncated": lambda tasks, rng: json.dumps(tasks, indent=2)[:-rng.randrange(20, 60)],
+}
+
+
+def make_model_outputs(count: int, seed: int = 0, max_tasks: int = 12
+                       ) -> List[Tuple[str, str, List[Dict[str, Any]]]]:
+    """
+    Build model responses in every style.
+
+    Args:
+        count: Number of responses to build.
+        seed: Random seed, so runs are comparable.
+        max_tasks: Most tasks in one response.
+
+    Returns:
+        List[Tuple[str, str, List[Dict[str, Any]]]]: (style, response, tasks written) triples.
+    """
+    rng = random.Random(seed)
+    names = list(STYLES)
+    outputs = []
+    for i in range(count):
+        style = names[i % len(names)]
+        tasks = make_tasks(rng.randint(1, max_tasks), rng)
+        outputs.append((style, STYLES[style](tasks, rng), tasks))
+    return outputs
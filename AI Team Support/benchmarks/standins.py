@@ -0,0 +1,169 @@
+"""
+Local stand-ins for external services in Task Manager benchmarks.
+Serves OpenAI embeddings and chat completions without network access.
+"""
+import base64
+import json
+import re
+import threading
+import time
+import zlib
+from typing import Dict, List, Any, Iterator
+
+import httpx
+import numpy as np
+
+# "- [Category] Task text (Status)" lines written by synthetic.make_update
+TASK_LINE = re.compile(r"^- \[(?P<category>[^\]]+)\] (?P<task>.+) \((?P<status>[^()]+)\)$", re.MULTILINE)
+FROM_LINE = re.compile(r"^From: (?P<name>.+)$", re.MULTILINE)
+DATE_LINE = re.compile(r"^Date: (?P<date>\d{4}-\d{2}-\d{2})$", re.MULTILINE)
+
+COACHING_REPLY = (
+    "Nice work this week! You closed out several tasks and kept your projects moving. "
+    "Consider sharing progress on longer-running items a little earlier so reviewers can plan. "
+    "Your peers appreciate how clearly you communicate, so keep that up."
+)
+
+
+class _ByteStream(httpx.SyncByteStream):
+    """Response body produced piece by piece, like a streamed completion."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._chunks
+
+
+class OpenAIStandIn(httpx.BaseTransport):
+    """
+    Transport that answers OpenAI embedding and chat requests locally.
+
+    Embeddings are feature-hashed bags of words, so texts sharing words are
+    similar and identical texts match exactly. Chat requests for task
+    extraction return the tasks written in the update by synthetic.make_update;
+    any other chat request gets a fixed coaching reply. Streamed chat
+    requests get the same reply as server-sent events.
+    """
+
+    def __init__(self, dim: int = 1536, latency: float = 0.0, embedding_latency: float = 0.0,
+                 chunk_latency: float = 0.0):
+        """
+        Initialize the stand-in.
+
+        Args:
+            dim: Embedding dimension (1536 for text-embedding-ada-002).
+            latency: Seconds added to every chat completion; for streamed
+                     completions, the time before the first chunk.
+            embedding_latency: Seconds added to every embeddings request.
+            chunk_latency: Seconds between chunks of a streamed completion,
+                           i.e. the model's writing speed.
+        """
+        self.dim = dim
+        self.latency = latency
+        self.embedding_latency = embedding_latency
+        self.chunk_latency = chunk_latency
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed one text as a unit-length hashed bag of words."""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in text.lower().split():
+            h = zlib.crc32(word.encode())
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _embeddings(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer POST /v1/embeddings."""
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        as_base64 = body.get("encoding_format") == "base64"
+        data = []
+        for i, text in enumerate(texts):
+            vector = self.embed(text)
+            embedding = base64.b64encode(vector.tobytes()).decode() if as_base64 else vector.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+        tokens = sum(len(text.split()) for text in texts)
+        if self.embedding_latency:
+            time.sleep(self.embedding_latency)
+        return {"object": "list", "data": data, "model": body.get("model", ""),
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens}}
+
+    def _chat(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer POST /v1/chat/completions."""
+        prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+        if "TaskExtractor" in prompt:
+            author = FROM_LINE.search(prompt)
+            date = DATE_LINE.search(prompt)
+            content = json.dumps([
+                {
+                    "task": match["task"],
+                    "status": match["status"],
+                    "employee": author["name"] if author else "Unknown",
+                    "date": date["date"] if date else "",
+                    "category": match["category"],
+                }
+                for match in TASK_LINE.finditer(prompt)
+            ])
+        else:
+            content = COACHING_REPLY
+        if self.latency:
+            time.sleep(self.latency)
+        prompt_tokens = len(prompt.split())
+        completion_tokens = len(content.split())
+        return {
+            "id": "chatcmpl-standin",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", ""),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def _stream(self, payload: Dict[str, Any], chunk_chars: int = 16) -> Iterator[bytes]:
+        """Server-sent events streaming a chat completion in pieces of chunk_chars."""
+        content = payload["choices"][0]["message"]["content"]
+        base = {"id": payload["id"], "object": "chat.completion.chunk", "created": payload["created"],
+                "model": payload["model"]}
+        for i in range(0, len(content), chunk_chars):
+            if i and self.chunk_latency:
+                time.sleep(self.chunk_latency)
+            chunk = dict(base, choices=[{"index": 0, "finish_reason": None,
+                                         "delta": {"content": content[i:i + chunk_chars]}}])
+            yield f"data: {json.dumps(chunk)}\n\n".encode()
+        done = dict(base, choices=[{"index": 0, "finish_reason": "stop", "delta": {}}])
+        yield f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Answer one OpenAI API request."""
+        request.read()
+        path = request.url.path
+        with self._lock:
+            self.counts[path] = self.counts.get(path, 0) + 1
+
+        body = json.loads(request.content or b"{}")
+        if path.endswith("/embeddings"):
+            payload = self._embeddings(body)
+        elif path.endswith("/chat/completions"):
+            payload = self._chat(body)
+            if body.get("stream"):
+                return httpx.Response(200, headers={"content-type": "text/event-stream"},
+                                      stream=_ByteStream(self._stream(payload)), request=request)
+            if self.chunk_latency:
+                # A complete reply takes as long to write as a streamed one
+                content = payload["choices"][0]["message"]["content"]
+                time.sleep(self.chunk_latency * max(0, (len(content) - 1) // 16))
+        else:
+            return httpx.Response(404, json={"error": {"message": f"No stand-in for {path}",
+                                                       "type": "invalid_request_error"}},
+                                  request=request)
+        return httpx.Response(200, json=payload, request=request)
+
+    def reset_counts(self) -> Dict[str, int]:
+        """Return the request counts so far and start counting again."""
+        with self._lock:
+            counts, self.counts = self.counts, {}
+        return counts
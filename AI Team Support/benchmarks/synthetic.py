@@ -0,0 +1,215 @@
+"""
+Synthetic Notion data for Task Manager benchmarks.
+Generates task pages shaped like real Notion database query results.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+STATUSES = ["Completed", "In Progress", "Pending", "Blocked"]
+VERBS = ["Reviewed", "Drafted", "Updated", "Fixed", "Prepared", "Analyzed", "Migrated", "Tested"]
+OBJECTS = ["the onboarding deck", "client requirements", "the data pipeline", "budget forecast",
+           "API integration", "weekly report", "test plan", "dashboard filters"]
+
+
+def _rich_text(content: str) -> List[Dict[str, Any]]:
+    """Build a Notion rich text array with a single fragment."""
+    return [{
+        "type": "text",
+        "text": {"content": content, "link": None},
+        "annotations": {"bold": False, "italic": False, "strikethrough": False,
+                        "underline": False, "code": False, "color": "default"},
+        "plain_text": content,
+        "href": None,
+    }]
+
+
+def make_task_page(index: int, rng: random.Random, employees: int = 50, projects: int = 200) -> Dict[str, Any]:
+    """
+    Build one Notion task page.
+
+    Args:
+        index: Sequence number of the page, used for its ID.
+        rng: Random generator so corpora are reproducible.
+        employees: Number of distinct employees.
+        projects: Number of distinct project categories.
+
+    Returns:
+        Dict[str, Any]: A page object as returned by ``databases.query``.
+    """
+    date = datetime(2025, 1, 1) + timedelta(days=rng.randrange(365))
+    if rng.random() < 0.3:
+        date_str = date.strftime("%Y-%m-%dT%H:%M:00.000+00:00")
+    else:
+        date_str = date.strftime("%Y-%m-%d")
+    task = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} #{index}"
+    return {
+        "object": "page",
+        "id": f"{index:08x}-0000-4000-8000-{index:012x}",
+        "created_time": "2025-01-01T00:00:00.000Z",
+        "last_edited_time": "2025-01-01T00:00:00.000Z",
+        "archived": False,
+        "parent": {"type": "database_id", "database_id": "00000000-0000-0000-0000-000000000000"},
+        "properties": {
+            "Task": {"id": "title", "type": "title", "title": _rich_text(task)},
+            "Status": {"id": "%3AStu", "type": "select",
+                       "select": {"id": "s1", "name": rng.choice(STATUSES), "color": "default"}},
+            "Employee": {"id": "Emp1", "type": "rich_text",
+                         "rich_text": _rich_text(f"Employee {rng.randrange(employees)}")},
+            "Date": {"id": "Dat1", "type": "date",
+                     "date": {"start": date_str, "end": None, "time_zone": None}},
+            "Reminder Sent": {"id": "Rem1", "type": "checkbox", "checkbox": rng.random() < 0.2},
+            "Category": {"id": "Cat1", "type": "rich_text",
+                         "rich_text": _rich_text(f"Project {rng.randrange(projects)}")},
+        },
+        "url": f"https://www.notion.so/{index:032x}",
+    }
+
+
+def make_task_pages(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """
+    Build a reproducible list of Notion task pages.
+
+    Args:
+        count: Number of pages to generate.
+        seed: Random seed.
+
+    Returns:
+        List[Dict[str, Any]]: Generated page objects.
+    """
+    rng = random.Random(seed)
+    return [make_task_page(i, rng) for i in range(count)]
+
+
+def _user(rng: random.Random) -> Dict[str, Any]:
+    """Build a Notion user reference."""
+    return {"object": "user", "id": f"{rng.getrandbits(128):032x}"}
+
+
+def add_workspace_properties(page: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """
+    Add the extra properties a working team database tends to collect.
+
+    fetch_tasks reads none of these, but Notion returns all of them unless
+    the query asks for specific properties.
+
+    Args:
+        page: Page from make_task_page, modified in place.
+        rng: Random generator so corpora are reproducible.
+
+    Returns:
+        Dict[str, Any]: The same page.
+    """
+    notes = " ".join(rng.choice(OBJECTS) for _ in range(rng.randrange(10, 40)))
+    props = page["properties"]
+    props.update({
+        "Assignee": {"id": "Asg1", "type": "people", "people": [_user(rng)]},
+        "Reviewer": {"id": "Rev1", "type": "people", "people": [_user(rng), _user(rng)]},
+        "Tags": {"id": "Tag1", "type": "multi_select", "multi_select": [
+            {"id": f"t{i}", "name": f"tag-{rng.randrange(30)}", "color": "blue"} for i in range(3)]},
+        "Priority": {"id": "Pri1", "type": "select",
+                     "select": {"id": "p1", "name": rng.choice(["Low", "Medium", "High"]), "color": "red"}},
+        "Sprint": {"id": "Spr1", "type": "select",
+                   "select": {"id": "sp1", "name": f"Sprint {rng.randrange(26)}", "color": "gray"}},
+        "Notes": {"id": "Not1", "type": "rich_text", "rich_text": _rich_text(notes)},
+        "Estimate": {"id": "Est1", "type": "number", "number": rng.randrange(1, 40)},
+        "Due": {"id": "Due1", "type": "date", "date": {"start": "2025-06-30", "end": None, "time_zone": None}},
+        "Client": {"id": "Cli1", "type": "relation", "relation": [{"id": f"{rng.getrandbits(128):032x}"}],
+                   "has_more": False},
+        "Blocked by": {"id": "Blk1", "type": "relation", "relation": [], "has_more": False},
+        "Hours": {"id": "Hrs1", "type": "rollup", "rollup": {
+            "type": "number", "number": rng.random() * 40, "function": "sum"}},
+        "Score": {"id": "Scr1", "type": "formula", "formula": {"type": "number", "number": rng.random()}},
+        "Link": {"id": "Lnk1", "type": "url", "url": f"https://example.com/tickets/{rng.randrange(10**6)}"},
+        "Files": {"id": "Fil1", "type": "files", "files": []},
+        "Created by": {"id": "Crb1", "type": "created_by", "created_by": _user(rng)},
+        "Last edited by": {"id": "Leb1", "type": "last_edited_by", "last_edited_by": _user(rng)},
+        "Created time": {"id": "Crt1", "type": "created_time", "created_time": page["created_time"]},
+        "Last edited time": {"id": "Let1", "type": "last_edited_time",
+                             "last_edited_time": page["last_edited_time"]},
+    })
+    page.update({
+        "created_by": _user(rng),
+        "last_edited_by": _user(rng),
+        "icon": None,
+        "cover": None,
+        "public_url": None,
+    })
+    return page
+
+
+FEEDBACK_PHRASES = ["communicates clearly with the client", "could share progress earlier",
+                    "was a great help during the release", "documents decisions well",
+                    "should flag blockers sooner", "gives thoughtful code reviews"]
+NEW_VERBS = ["Scoped", "Outlined", "Benchmarked", "Documented", "Audited", "Piloted"]
+NEW_OBJECTS = ["the vendor shortlist", "quarterly hiring plan", "latency regression",
+               "partner training material", "access review findings", "offline sync prototype"]
+
+
+def make_feedback_pages(count: int, seed: int = 11, employees: int = 50) -> List[Dict[str, Any]]:
+    """
+    Build a reproducible list of Notion peer feedback pages dated in the last month.
+
+    Args:
+        count: Number of pages to generate.
+        seed: Random seed.
+        employees: Number of distinct employees the feedback is about.
+
+    Returns:
+        List[Dict[str, Any]]: Page objects as returned by ``databases.query``.
+    """
+    rng = random.Random(seed)
+    today = datetime.now()
+    pages = []
+    for i in range(count):
+        date = today - timedelta(days=rng.randrange(30))
+        pages.append({
+            "object": "page",
+            "id": f"{i:08x}-0000-4000-9000-{i:012x}",
+            "created_time": "2025-01-01T00:00:00.000Z",
+            "last_edited_time": "2025-01-01T00:00:00.000Z",
+            "archived": False,
+            "parent": {"type": "database_id", "database_id": "00000000-0000-0000-0000-000000000001"},
+            "properties": {
+                "Name": {"id": "title", "type": "title",
+                         "title": _rich_text(f"Employee {rng.randrange(employees)}")},
+                "Feedback": {"id": "Fbk1", "type": "rich_text",
+                             "rich_text": _rich_text(rng.choice(FEEDBACK_PHRASES))},
+                "Date": {"id": "Dat1", "type": "date",
+                         "date": {"start": date.strftime("%Y-%m-%d"), "end": None, "time_zone": None}},
+            },
+            "url": f"https://www.notion.so/{i:032x}",
+        })
+    return pages
+
+
+def make_update(pages: List[Dict[str, Any]], rng: random.Random, tasks: int = 5,
+                new_share: float = 0.4) -> str:
+    """
+    Write a freeform status update in the format the OpenAI stand-in understands.
+
+    Existing tasks are taken from the corpus with a changed status, so they
+    match and update a page; the rest are new tasks that get inserted.
+
+    Args:
+        pages: Task pages from make_task_pages.
+        rng: Random generator so updates are reproducible.
+        tasks: Number of tasks in the update.
+        new_share: Fraction of tasks that are new.
+
+    Returns:
+        str: The update text.
+    """
+    author = f"Employee {rng.randrange(50)}"
+    lines = [f"From: {author}", f"Date: {datetime.now().strftime('%Y-%m-%d')}", "", "Completed Activities:"]
+    for _ in range(tasks):
+        if rng.random() < new_share:
+            task = f"{rng.choice(NEW_VERBS)} {rng.choice(NEW_OBJECTS)} #{rng.randrange(10**6)}"
+            category = f"Project {rng.randrange(200)}"
+        else:
+            props = rng.choice(pages)["properties"]
+            task = props["Task"]["title"][0]["plain_text"]
+            category = props["Category"]["rich_text"][0]["plain_text"]
+        lines.append(f"- [{category}] {task} ({rng.choice(STATUSES)})")
+    lines += ["", "Thanks,", author]
+    return "\n".join(lines)
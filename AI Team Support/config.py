@@ -21,9 +21,62 @@ DEBUG_MODE = True  # Enable debug prints
 # File paths
 EMBEDDING_CACHE_PATH = "embedding_cache.db"  # Changed from .json to .db
 
+TASK_REGISTRY_PATH = "task_registry.db"  # Known categories and employees
+COLD_TASK_STORE_PATH = "cold_tasks.db"  # Archived completed tasks, searched only as a fallback
+CHANGE_FEED_PATH = "change_feed.db"  # Task changes served by /api/changes
+FEEDBACK_STORE_PATH = "peer_feedback.db"  # Local copy of the peer feedback database
+
+# Task matching settings
+HOT_TASK_DAYS = 90  # Completed tasks older than this are moved to the cold store
+
+# Task registry settings
+REGISTRY_SYNC_SECONDS = 3600  # Age after which known categories and employees are refreshed in the background
+
+# Task change feed settings
+CHANGE_FEED_SYNC_SECONDS = 30  # Minimum time between incremental syncs for /api/changes
+
+# Peer feedback mirror settings
+FEEDBACK_SYNC_SECONDS = 300  # Minimum time between incremental peer feedback syncs
+FEEDBACK_FULL_SYNC_SECONDS = 3600  # Age after which a sync rereads the whole feedback database, dropping deleted pages
+
 # Embedding cache settings
 MAX_CACHE_ENTRIES = 10000  # Maximum number of entries to keep in cache
 
+# Long updates are split into chunks extracted in parallel
+EXTRACTION_CHUNK_CHARS = 12000  # Largest chunk sent in one extraction prompt
+EXTRACTION_MAX_PARALLEL = 4  # Chunks extracted at the same time
+
+# Rule-based fast path for updates in the help text format (name, date, project headers, bullets)
+FAST_PATH_ENABLED = True  # Set to False to send every update to the model
+FAST_PATH_MIN_CONFIDENCE = 0.8  # Less confident rule-based extractions fall back to the model
+
+# Task extraction cache
+EXTRACTION_CACHE_PATH = "extraction_cache.db"  # Validated tasks per extracted update
+EXTRACTION_CACHE_TTL_DAYS = 30  # Entries older than this are extracted again
+EXTRACTION_CACHE_MAX_ENTRIES = 5000  # Least recently used entries beyond this are evicted
+
+# Email preprocessing (quoted replies, signatures and footers are trimmed before extraction)
+EMAIL_PREPROCESSING = True  # Set to False to send whole email bodies for extraction
+EMAIL_MIN_REPLY_CHARS = 40  # Shorter replies ("See below") keep their quoted history
+
+# Project name protection settings
+PROTECTION_MEMO_ENTRIES = 4096  # Protected/unprotected texts remembered per process
+PROTECTION_MEMO_MAX_CHARS = 2000  # Longer texts (e.g. whole emails) are not memoized
+
+# Notion HTTP transport settings
+NOTION_MAX_CONNECTIONS = 10  # Keep-alive connections shared by all Notion adapters
+NOTION_MAX_RETRIES = 5  # Retries for rate-limited or failed Notion requests
+NOTION_REPLAY_STORE = os.getenv("NOTION_REPLAY_STORE")  # Fixture store served instead of Notion, for load tests
+
+# HTTP record/replay cassettes for OpenAI and Notion ("record", "replay" or unset)
+CASSETTE_MODE = os.getenv("CASSETTE_MODE")
+CASSETTE_DIR = os.getenv("CASSETTE_DIR", "cassettes")
+CASSETTE_LATENCY_SCALE = float(os.getenv("CASSETTE_LATENCY_SCALE", "1.0"))  # 0 replays instantly
+
+# Request tracing export ("jsonl" or "chrome"; nothing is written unless a path is set)
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH")
+TRACE_EXPORT_FORMAT = os.getenv("TRACE_EXPORT_FORMAT", "jsonl")
+
 # OpenAI model configuration
 EMBEDDING_MODEL = "text-embedding-ada-002"
 CHAT_MODEL = "gpt-4"
@@ -14,6 +14,22 @@ identify_stale_tasks = notion_adapter.identify_stale_tasks
 mark_task_as_reminded = notion_adapter.mark_task_as_reminded
 insert_task_to_notion = notion_adapter.insert_task
 update_task_in_notion = notion_adapter.update_task
+get_notion_write_stats = notion_adapter.get_write_stats
+get_task_changes = notion_adapter.get_task_changes
 fetch_peer_feedback = notion_adapter.fetch_peer_feedback
 list_all_categories = notion_adapter.list_all_categories
+list_all_employees = notion_adapter.list_all_employees
 validate_notion_connection = notion_adapter.validate_connection
+
+# Report the default adapter's write counters on every metrics scrape
+from core.metrics import registry as metrics_registry
+
+
+def _collect_notion_writes():
+    """Yield Notion task write counters for /metrics."""
+    for outcome in ("sent", "skipped"):
+        yield ("notion_task_writes_total", "counter", "Task updates sent to Notion or skipped as no-ops.",
+               {"outcome": outcome}, notion_adapter.write_stats[outcome])
+
+
+metrics_registry.register_collector(_collect_notion_writes)
@@ -0,0 +1,251 @@
+"""
+HTTP record/replay cassettes for Task Manager.
+Captures OpenAI and Notion request/response pairs to disk and serves them back,
+so end-to-end runs can be repeated offline with the same responses.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+import httpx
+
+from config import (
+    DEBUG_MODE,
+    CASSETTE_MODE,
+    CASSETTE_DIR,
+    CASSETTE_LATENCY_SCALE
+)
+
+# Response headers kept in a cassette; the rest describe the original connection
+KEPT_HEADERS = ("content-type", "retry-after", "request-id", "x-request-id")
+
+
+def debug_print(message):
+    """Print debug messages if DEBUG_MODE is True."""
+    if DEBUG_MODE:
+        print(message)
+
+
+def request_key(request: httpx.Request) -> str:
+    """
+    Hash a request into a key that ignores incidental differences.
+
+    The key covers the method, host, path, sorted query parameters and the
+    JSON body with sorted keys. Headers, including credentials, are left out.
+
+    Args:
+        request: The outgoing request.
+
+    Returns:
+        str: A SHA-256 hex digest.
+    """
+    request.read()
+    body = request.content or b""
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        pass  # Not JSON; hash the raw bytes
+
+    query = sorted(request.url.params.multi_items())
+    canonical = "\n".join([
+        request.method.upper(),
+        request.url.host,
+        request.url.path,
+        json.dumps(query),
+    ]).encode() + b"\n" + body
+    return hashlib.sha256(canonical).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded responses keyed by request hash, stored as JSON lines.
+
+    The same request can be recorded several times (e.g. a query before and
+    after a write); replay hands the recordings out in their original order
+    and keeps serving the last one after that.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the cassette, loading any recordings already on disk.
+
+        Args:
+            path: Path to the JSON lines file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._served: Dict[str, int] = {}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["key"], []).append(entry)
+
+    def __len__(self) -> int:
+        """Number of recorded responses."""
+        return sum(len(entries) for entries in self._entries.values())
+
+    def record(self, key: str, request: httpx.Request, response: httpx.Response, elapsed: float) -> None:
+        """
+        Append a request/response pair.
+
+        Args:
+            key: Hash from request_key().
+            request: The request that was sent.
+            response: The response, already read.
+            elapsed: Seconds the request took.
+        """
+        entry = {
+            "key": key,
+            "method": request.method,
+            "url": str(request.url.copy_with(query=None)),
+            "status": response.status_code,
+            "headers": {name: value for name, value in response.headers.items() if name.lower() in KEPT_HEADERS},
+            "body": response.content.decode("utf-8", errors="replace"),
+            "elapsed": round(elapsed, 6),
+        }
+        with self._lock:
+            self._entries.setdefault(key, []).append(entry)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def next_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the next recorded response for a request.
+
+        Args:
+            key: Hash from request_key().
+
+        Returns:
+            Optional[Dict[str, Any]]: The recorded entry, or None if the request was never recorded.
+        """
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            return entries[min(index, len(entries) - 1)]
+
+    def rewind(self) -> None:
+        """Serve every recording from the start again."""
+        with self._lock:
+            self._served = {}
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """
+    Transport that records responses from another transport, or replays them.
+
+    In "record" mode every request is sent through the wrapped transport and
+    its response saved. In "replay" mode nothing is sent: the recorded
+    response is returned after its original latency multiplied by
+    ``latency_scale`` (0 replays instantly). A request that was never
+    recorded gets a 404 error response naming it.
+    """
+
+    def __init__(self, cassette: Cassette, mode: str, transport: Optional[httpx.BaseTransport] = None,
+                 latency_scale: float = 1.0):
+        """
+        Initialize the transport.
+
+        Args:
+            cassette: Where recordings are kept.
+            mode: "record" or "replay".
+            transport: Transport that sends requests when recording.
+            latency_scale: Multiplier for recorded latencies when replaying.
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode == "record" and transport is None:
+            raise ValueError("Recording needs a transport to send requests through")
+        self.cassette = cassette
+        self.mode = mode
+        self.transport = transport
+        self.latency_scale = latency_scale
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Record or replay a single request."""
+        key = request_key(request)
+
+        if self.mode == "record":
+            start = time.perf_counter()
+            response = self.transport.handle_request(request)
+            response.read()  # Decodes any content encoding
+            elapsed = time.perf_counter() - start
+            self.cassette.record(key, request, response, elapsed)
+            headers = {name: value for name, value in response.headers.items()
+                       if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+            response.close()
+            return httpx.Response(response.status_code, headers=headers, content=response.content,
+                                  request=request)
+
+        entry = self.cassette.next_response(key)
+        if entry is None:
+            message = f"No recorded response for {request.method} {request.url.path}"
+            debug_print(message)
+            return httpx.Response(404, json={
+                "object": "error", "status": 404, "code": "object_not_found", "message": message,
+                "error": {"message": message, "type": "cassette_miss"},
+            }, request=request)
+
+        if self.latency_scale > 0:
+            time.sleep(entry["elapsed"] * self.latency_scale)
+        return httpx.Response(entry["status"], headers=entry["headers"], content=entry["body"].encode(),
+                              request=request)
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        if self.transport is not None:
+            self.transport.close()
+
+
+_cassettes_lock = threading.Lock()
+_cassettes: Dict[str, Cassette] = {}
+
+
+def get_cassette(name: str, directory: str = CASSETTE_DIR) -> Cassette:
+    """
+    Get the cassette for a service, shared by every client in the process.
+
+    Args:
+        name: Service name, used as the file name (e.g. "openai").
+        directory: Directory holding the cassette files.
+
+    Returns:
+        Cassette: The cassette stored at <directory>/<name>.jsonl.
+    """
+    path = os.path.join(directory, f"{name}.jsonl")
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None:
+            cassette = _cassettes[path] = Cassette(path)
+        return cassette
+
+
+def wrap_transport(name: str, transport: Optional[httpx.BaseTransport] = None) -> Optional[httpx.BaseTransport]:
+    """
+    Wrap a service's transport in a cassette if CASSETTE_MODE asks for one.
+
+    Args:
+        name: Service name, e.g. "openai" or "notion".
+        transport: The transport that talks to the real service.
+
+    Returns:
+        Optional[httpx.BaseTransport]: The cassette transport, or the transport unchanged.
+    """
+    if not CASSETTE_MODE:
+        return transport
+    if transport is None:
+        transport = httpx.HTTPTransport()
+    debug_print(f"Using {CASSETTE_MODE} cassette for {name} in {CASSETTE_DIR}")
+    return CassetteTransport(get_cassette(name), CASSETTE_MODE, transport, CASSETTE_LATENCY_SCALE)
@@ -2,15 +2,22 @@
 Notion API integration for Task Manager.
 Handles all interactions with Notion databases.
 """
-from notion_client import Client
 from datetime import datetime, timedelta
-from dateutil import parser
 import pandas as pd
+import threading
 import traceback
-from typing import List, Dict, Optional, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+from typing import List, Dict, Optional, Any, Union, Iterator
 
 # Import from plugins to access security protection
 from plugins import plugin_manager
+from core.adapters.notion_parser import TaskColumns, parse_notion_date
+from core.adapters.notion_transport import get_notion_client
+from core.storage.task_registry import task_registry
+from core.storage.change_feed import change_feed as default_change_feed
+from core.storage.feedback_store import feedback_store as default_feedback_store
+from core.tracing import span, traced, annotate, propagate
 
 # Import configuration from the old location for now
 # This will be updated later when we migrate the config
@@ -19,13 +26,28 @@ from config import (
     NOTION_DATABASE_ID, 
     NOTION_FEEDBACK_DB_ID, 
     DEBUG_MODE, 
-    DAYS_THRESHOLD
+    DAYS_THRESHOLD,
+    REGISTRY_SYNC_SECONDS,
+    CHANGE_FEED_SYNC_SECONDS,
+    FEEDBACK_SYNC_SECONDS,
+    FEEDBACK_FULL_SYNC_SECONDS
 )
 
 class NotionAdapter:
     """Adapter for Notion API integration."""
     
-    def __init__(self, token=None, task_db_id=None, feedback_db_id=None):
+    # Properties read from each database; queries ask Notion for only these
+    TASK_PROPERTIES = ("Task", "Status", "Employee", "Date", "Reminder Sent", "Category")
+    FEEDBACK_PROPERTIES = ("Name", "Feedback", "Date")
+    
+    # Page-level fields kept when query results are projected
+    PAGE_FIELDS = ("id", "created_time", "last_edited_time", "archived", "in_trash")
+    
+    # Task fields compared before an update is sent; Notion property name for each
+    WRITABLE_FIELDS = {"status": "Status", "employee": "Employee", "category": "Category"}
+    
+    def __init__(self, token=None, task_db_id=None, feedback_db_id=None, registry=None,
+                 change_feed=None, feedback_store=None, client=None):
         """
         Initialize the Notion adapter.
         
@@ -33,13 +55,38 @@ class NotionAdapter:
             token: Notion API token. If None, uses value from config.
             task_db_id: Notion task database ID. If None, uses value from config.
             feedback_db_id: Notion feedback database ID. If None, uses value from config.
+            registry: TaskRegistry of known categories and employees. If None, uses the shared one.
+            change_feed: ChangeFeed that task changes are published to. If None, uses the shared one.
+            feedback_store: FeedbackStore mirroring the feedback database. If None, uses the shared one.
+            client: Notion client to use, e.g. an offline replay client. If None,
+                    uses the process-wide pooled client for the token.
         """
         self.token = token or NOTION_TOKEN
         self.task_db_id = task_db_id or NOTION_DATABASE_ID
         self.feedback_db_id = feedback_db_id or NOTION_FEEDBACK_DB_ID
         
-        # Initialize Notion client
-        self.client = Client(auth=self.token)
+        # Use the process-wide pooled client for this token unless one is given
+        self.client = client or get_notion_client(self.token)
+        
+        # Property name -> property ID, per database
+        self._property_ids: Dict[str, Dict[str, str]] = {}
+        
+        # Categories and employees, kept current by inserts and full fetches
+        self.registry = registry or task_registry
+        self._registry_sync_lock = threading.Lock()
+        
+        # Task changes for /api/changes, from our own writes and incremental syncs
+        self.change_feed = change_feed or default_change_feed
+        self._feed_sync_lock = threading.Lock()
+        
+        # Local copy of peer feedback, indexed by person and date
+        self.feedback_store = feedback_store or default_feedback_store
+        self._feedback_sync_lock = threading.Lock()
+        
+        # Last known writable fields of each task, keyed by page ID
+        self._known_state: Dict[str, Dict[str, str]] = {}
+        self._write_lock = threading.Lock()
+        self.write_stats = {"sent": 0, "skipped": 0, "fields_written": 0}
     
     def debug_print(self, message):
         """Print debug messages if DEBUG_MODE is True."""
@@ -93,7 +140,7 @@ class NotionAdapter:
         """Safely extract date value from Notion properties."""
         try:
             if key in props and props[key].get("date") and props[key]["date"].get("start"):
-                return parser.parse(props[key]["date"]["start"])
+                return parse_notion_date(props[key]["date"]["start"])
             return None
         except (KeyError, ValueError, TypeError):
             return None
@@ -107,97 +154,230 @@ class NotionAdapter:
         except KeyError:
             return default
 
-    def fetch_tasks(self) -> pd.DataFrame:
+    def resolve_property_ids(self, database_id, properties) -> Optional[List[str]]:
         """
-        Fetch tasks from Notion with pagination support.
+        Look up the Notion property IDs for a list of property names.
         
+        The database schema is retrieved once per database and cached.
+        
+        Args:
+            database_id: ID of the database.
+            properties: Property names to resolve.
+            
         Returns:
-            pd.DataFrame: DataFrame containing all tasks.
+            Optional[List[str]]: IDs of the properties that exist, or None
+            if the schema could not be retrieved.
         """
-        all_pages = []
-        has_more = True
-        start_cursor = None
-
-        while has_more:
-            response = self.client.databases.query(
-                database_id=self.task_db_id,
-                start_cursor=start_cursor,
-                page_size=100  # Maximum allowed by Notion API
-            )
-
-            all_pages.extend(response["results"])
-            has_more = response["has_more"]
-
-            if has_more:
-                start_cursor = response["next_cursor"]
-
-        rows = []
-        for page in all_pages:
+        ids_by_name = self._property_ids.get(database_id)
+        if ids_by_name is None:
             try:
-                props = page["properties"]
-
-                # Use safer property access
-                task = {
-                    "id": page["id"],
-                    "task": self.get_title_content(props, "Task"),
-                    "status": self.get_select_value(props, "Status", "No Status"),
-                    "employee": self.get_rich_text_content(props, "Employee"),
-                    "date": self.get_date_value(props, "Date"),
-                    "reminder_sent": self.get_checkbox_value(props, "Reminder Sent", False),
-                    "category": self.get_rich_text_content(props, "Category"),
-                }
-                rows.append(task)
+                schema = self.client.databases.retrieve(database_id=database_id)["properties"]
+                # IDs come back URL-encoded; decode them so the query string
+                # encoding doesn't escape them a second time
+                ids_by_name = {name: unquote(prop["id"]) for name, prop in schema.items()}
+                self._property_ids[database_id] = ids_by_name
             except Exception as e:
-                self.debug_print(f"Error processing Notion page {page['id']}: {e}")
-                continue
-
-        tasks_df = pd.DataFrame(rows)
+                self.debug_print(f"Could not retrieve properties of database {database_id}: {e}")
+                return None
         
+        return [ids_by_name[name] for name in properties if name in ids_by_name]
+
+    def _project_page(self, page: Dict[str, Any], properties) -> Dict[str, Any]:
+        """Keep only the page fields and properties the caller reads."""
+        projected = {field: page[field] for field in self.PAGE_FIELDS if field in page}
+        props = page.get("properties") or {}
+        projected["properties"] = {name: props[name] for name in properties if name in props}
+        return projected
+
+    @traced("notion.query_page")
+    def _query_page(self, database_id, properties, **query) -> Dict[str, Any]:
+        """Fetch one page of a database query, projected to the given properties."""
+        response = self.client.databases.query(
+            database_id=database_id,
+            page_size=100,  # Maximum allowed by Notion API
+            **query
+        )
+        if properties:
+            response["results"] = [self._project_page(page, properties) for page in response["results"]]
+        annotate(results=len(response["results"]))
+        return response
+
+    def query_database(self, database_id, properties=None, **query) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page through a Notion database query.
+        
+        The next page is requested on a background thread while the caller
+        is still working on the current one, so parsing overlaps the network wait.
+        
+        When properties are given, Notion is asked to return only those
+        (filter_properties), and anything else left in the results is dropped
+        on the fetch thread before the page reaches the caller.
+        
+        Args:
+            database_id: ID of the database to query.
+            properties: Names of the properties the caller reads. None returns full pages.
+            **query: Extra arguments for databases.query (filter, sorts, ...).
+            
+        Yields:
+            List[Dict[str, Any]]: The results of each query page.
+        """
+        if properties:
+            property_ids = self.resolve_property_ids(database_id, properties)
+            if property_ids:
+                query["filter_properties"] = property_ids
+        
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="notion-prefetch") as executor:
+            future = executor.submit(propagate(self._query_page), database_id, properties, **query)
+            while future is not None:
+                response = future.result()
+                
+                # Request the next page before handing this one to the caller
+                future = None
+                if response["has_more"]:
+                    future = executor.submit(
+                        propagate(self._query_page),
+                        database_id,
+                        properties,
+                        start_cursor=response["next_cursor"],
+                        **query
+                    )
+                
+                yield response["results"]
+
+    def _add_task_pages(self, columns: TaskColumns, pages: List[Dict[str, Any]]) -> None:
+        """Parse a page of query results into the column buffers."""
+        skipped = columns.add_pages(pages)
+        if skipped:
+            self.debug_print(f"Skipped {skipped} Notion pages that could not be parsed")
+
+    def _unprotect_tasks(self, tasks_df: pd.DataFrame) -> pd.DataFrame:
+        """Restore protected project names in a task DataFrame."""
         # Get the protection plugin if available
         protection_plugin = plugin_manager.get_plugin('ProjectProtectionPlugin')
         
         # Unprotect task data if necessary
         if protection_plugin and protection_plugin.enabled and not tasks_df.empty:
             try:
-                # Convert DataFrame to list of dicts for unprotection
-                tasks_list = tasks_df.to_dict('records')
-                
-                # Unprotect task data
-                unprotected_tasks = protection_plugin.unprotect_task_list(tasks_list)
-                
-                # Convert back to DataFrame
-                tasks_df = pd.DataFrame(unprotected_tasks)
+                tasks_df = protection_plugin.unprotect_task_frame(tasks_df)
             except Exception as e:
                 self.debug_print(f"Error unprotecting tasks: {e}")
         
         return tasks_df
 
+    @traced("notion.fetch_tasks")
+    def fetch_tasks(self) -> pd.DataFrame:
+        """
+        Fetch tasks from Notion with pagination support.
+        
+        Returns:
+            pd.DataFrame: DataFrame containing all tasks.
+        """
+        columns = TaskColumns()
+        # Tasks recorded after this point may be missing from the fetch without being archived
+        try:
+            feed_seq = self.change_feed.seq
+        except Exception as e:
+            self.debug_print(f"Error reading change feed: {e}")
+            feed_seq = None
+        
+        # Parse each page of results as it arrives instead of keeping the raw JSON
+        for pages in self.query_database(self.task_db_id, properties=self.TASK_PROPERTIES):
+            self._add_task_pages(columns, pages)
+        
+        tasks_df = self._unprotect_tasks(columns.to_frame())
+        self._remember_tasks(tasks_df)
+        
+        # A full fetch is the ground truth for the category and employee registry
+        try:
+            self.registry.sync(tasks_df)
+        except Exception as e:
+            self.debug_print(f"Error syncing task registry: {e}")
+        
+        # Archived pages never show up in queries; notice them by their absence
+        try:
+            self.change_feed.reconcile(tasks_df["id"].tolist() if "id" in tasks_df.columns else [],
+                                       before_seq=feed_seq)
+        except Exception as e:
+            self.debug_print(f"Error reconciling change feed: {e}")
+        
+        annotate(tasks=len(tasks_df))
+        return tasks_df
+
+    @staticmethod
+    def days_old(dates: pd.Series) -> pd.Series:
+        """
+        Compute the age in whole days of each date, vectorized.
+        
+        Args:
+            dates: Task dates; missing dates count as 0 days old.
+            
+        Returns:
+            pd.Series: Integer ages aligned with dates.
+        """
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            # Mixed naive and timezone-aware dates: compare everything in UTC
+            dates = pd.to_datetime(dates, errors="coerce", utc=True)
+        
+        now = pd.Timestamp.now(tz=dates.dt.tz)
+        return (now - dates).dt.days.fillna(0).astype(int)
+
+    def fetch_stale_candidates(self, days_threshold=None) -> pd.DataFrame:
+        """
+        Fetch only tasks that may need a reminder.
+        
+        Notion filters out completed, recent and already reminded tasks,
+        so only the candidates are transferred and parsed.
+        
+        Args:
+            days_threshold: Days before a task is considered stale.
+                           If None, uses value from config.
+                           
+        Returns:
+            pd.DataFrame: Open, unreminded tasks older than the threshold.
+        """
+        if days_threshold is None:
+            days_threshold = DAYS_THRESHOLD
+        
+        cutoff = (datetime.now() - timedelta(days=days_threshold)).strftime("%Y-%m-%d")
+        stale_filter = {
+            "and": [
+                {"property": "Status", "select": {"does_not_equal": "Completed"}},
+                {"property": "Date", "date": {"before": cutoff}},
+                {"property": "Reminder Sent", "checkbox": {"equals": False}},
+            ]
+        }
+        
+        columns = TaskColumns()
+        for pages in self.query_database(self.task_db_id, properties=self.TASK_PROPERTIES, filter=stale_filter):
+            self._add_task_pages(columns, pages)
+        
+        return self._unprotect_tasks(columns.to_frame())
+
     def identify_stale_tasks(self, df=None, days_threshold=None):
         """
         Identify tasks that need reminders.
         
         Args:
-            df: DataFrame containing tasks. If None, fetches tasks.
+            df: DataFrame containing tasks. If None, asks Notion for the
+                stale candidates only instead of fetching every task.
             days_threshold: Days before a task is considered stale.
                            If None, uses value from config.
                            
         Returns:
             pd.DataFrame: DataFrame containing stale tasks.
         """
-        if df is None:
-            df = self.fetch_tasks()
-        
         if days_threshold is None:
             days_threshold = DAYS_THRESHOLD
-            
-        now = datetime.now()
-        # Handle potential None values in date column
-        df["days_old"] = df["date"].apply(lambda d: (now - d).days if d else 0)
+        
+        if df is None:
+            df = self.fetch_stale_candidates(days_threshold)
+        
+        df["days_old"] = self.days_old(df["date"])
 
         # Basic stale task identification
         stale_tasks = df[(df["status"] != "Completed") & 
                          (df["days_old"] > days_threshold) & 
-                         (~df["reminder_sent"])]
+                         (~df["reminder_sent"].astype(bool))]
 
         return stale_tasks
 
@@ -212,10 +392,11 @@ class NotionAdapter:
             bool: True if successful, False otherwise.
         """
         try:
-            self.client.pages.update(
-                page_id=task_id,
-                properties={"Reminder Sent": {"checkbox": True}}
-            )
+            with span("notion.mark_reminded"):
+                self.client.pages.update(
+                    page_id=task_id,
+                    properties={"Reminder Sent": {"checkbox": True}}
+                )
             return True
         except Exception as e:
             self.debug_print(f"Error marking task as reminded: {e}")
@@ -238,132 +419,426 @@ class NotionAdapter:
                 date_str = date_str.strftime("%Y-%m-%d")
 
             # Create the task in Notion
-            self.client.pages.create(
-                parent={"database_id": self.task_db_id},
-                properties={
-                    "Task": {
-                        "title": [{"text": {"content": task["task"]}}]
-                    },
-                    "Status": {
-                        "select": {"name": task["status"]}
-                    },
-                    "Date": {
-                        "date": {"start": date_str}
-                    },
-                    "Employee": {
-                        "rich_text": [{"text": {"content": task["employee"]}}]
-                    },
-                    "Reminder sent": {
-                        "checkbox": False
-                    },
-                    "Category": {
-                        "rich_text": [{"text": {"content": task["category"]}}]
+            with span("notion.insert_task"):
+                page = self.client.pages.create(
+                    parent={"database_id": self.task_db_id},
+                    properties={
+                        "Task": {
+                            "title": [{"text": {"content": task["task"]}}]
+                        },
+                        "Status": {
+                            "select": {"name": task["status"]}
+                        },
+                        "Date": {
+                            "date": {"start": date_str}
+                        },
+                        "Employee": {
+                            "rich_text": [{"text": {"content": task["employee"]}}]
+                        },
+                        "Reminder sent": {
+                            "checkbox": False
+                        },
+                        "Category": {
+                            "rich_text": [{"text": {"content": task["category"]}}]
+                        }
                     }
-                }
-            )
+                )
+            unprotected = self._record_inserted_task(task)
+            if isinstance(page, dict) and page.get("id"):
+                self._remember_task(page["id"], task)
+                self._publish_change(page["id"], "created", unprotected)
             return True, f"✅ Added new task: {task['task']}"
         except Exception as e:
             self.debug_print(f"Task creation error details: {traceback.format_exc()}")
             return False, f"❌ Error creating task: {e}"
 
-    def update_task(self, task_id, task):
+    def _unprotect_fields(self, task):
+        """Restore protected project names in a single task dictionary."""
+        protection_plugin = plugin_manager.get_plugin('ProjectProtectionPlugin')
+        if protection_plugin and protection_plugin.enabled:
+            return protection_plugin.unprotect_task(task)
+        return task
+
+    def _record_inserted_task(self, task):
+        """
+        Count an inserted task in the registry under its real project name.
+        
+        Returns:
+            dict: The task with unprotected names.
+        """
+        try:
+            task = self._unprotect_fields(task)
+            self.registry.record_task(task)
+        except Exception as e:
+            self.debug_print(f"Error updating task registry: {e}")
+        return task
+
+    def _publish_change(self, task_id, action, fields=None):
+        """Publish a task written by this process to the change feed."""
+        try:
+            self.change_feed.record(task_id, action, fields)
+        except Exception as e:
+            self.debug_print(f"Error recording task change: {e}")
+
+    def _remember_task(self, task_id, fields):
+        """Store the writable fields of a task as last seen in Notion."""
+        state = {field: str(fields.get(field) or "") for field in self.WRITABLE_FIELDS}
+        with self._write_lock:
+            self._known_state[task_id] = state
+
+    def _remember_tasks(self, tasks_df: pd.DataFrame) -> None:
+        """Replace the known task state with a complete task DataFrame."""
+        if tasks_df.empty or "id" not in tasks_df.columns:
+            return
+        columns = [
+            tasks_df[field].astype(object).fillna("").astype(str).tolist()
+            if field in tasks_df.columns else [""] * len(tasks_df)
+            for field in self.WRITABLE_FIELDS
+        ]
+        state = {
+            task_id: dict(zip(self.WRITABLE_FIELDS, values))
+            for task_id, *values in zip(tasks_df["id"].tolist(), *columns)
+        }
+        with self._write_lock:
+            self._known_state = state
+
+    def _diff_task(self, task, existing) -> Dict[str, str]:
+        """
+        Work out which fields of an existing task an update would change.
+        
+        Status is written whenever it differs. Employee and category are
+        only filled in when the existing task has none, so an update never
+        overwrites information already in Notion.
+        
+        Args:
+            task: Incoming task dictionary.
+            existing: Known fields of the task, or None if unknown.
+            
+        Returns:
+            Dict[str, str]: New values keyed by task field.
+        """
+        if existing is None:
+            # Nothing to compare against: keep the previous behaviour
+            return {"status": task["status"]}
+        
+        changes = {}
+        if task.get("status") and str(existing.get("status") or "") != task["status"]:
+            changes["status"] = task["status"]
+        for field in ("employee", "category"):
+            value = task.get(field)
+            if value and not str(existing.get(field) or "").strip():
+                changes[field] = value
+        return changes
+
+    def update_task(self, task_id, task, existing=None):
         """
         Update task with intelligent field updates.
         
+        The incoming task is compared with the existing task, and only
+        fields that actually change are sent, in a single request. If
+        nothing changes, no request is made.
+        
         Args:
             task_id: ID of the task to update.
             task: Dictionary containing updated task information.
+            existing: The matched task row (dict or Series). If None, the
+                      state remembered from the last fetch or write is used.
             
         Returns:
             tuple: (success, message)
         """
+        if existing is None:
+            with self._write_lock:
+                existing = self._known_state.get(task_id)
+        elif not isinstance(existing, dict):
+            existing = existing.to_dict()
+        
+        changes = self._diff_task(task, existing)
+        if not changes:
+            with self._write_lock:
+                self.write_stats["skipped"] += 1
+            return True, f"⏭️ Task already up to date: {task['task']}"
+        
         try:
-            # Build update properties
-            update_props = {
-                # Always update status
-                "Status": {"select": {"name": task["status"]}}
-            }
-
-            # Only update other fields if they provide more information
-            # For example, we could update the description if the new one is more detailed
+            # Build update properties for the changed fields only
+            update_props = {}
+            for field, value in changes.items():
+                name = self.WRITABLE_FIELDS[field]
+                if field == "status":
+                    update_props[name] = {"select": {"name": value}}
+                else:
+                    update_props[name] = {"rich_text": [{"text": {"content": value}}]}
 
             # Update the task
-            self.client.pages.update(
-                page_id=task_id,
-                properties=update_props
-            )
+            with span("notion.update_task", fields=len(changes)):
+                self.client.pages.update(
+                    page_id=task_id,
+                    properties=update_props
+                )
+            
+            state = dict(existing or {})
+            state.update(changes)
+            self._remember_task(task_id, state)
+            self._publish_change(task_id, "updated", self._unprotect_fields(changes))
+            with self._write_lock:
+                self.write_stats["sent"] += 1
+                self.write_stats["fields_written"] += len(changes)
             return True, f"✅ Updated task: {task['task']}"
         except Exception as e:
             self.debug_print(f"Task update error details: {traceback.format_exc()}")
             return False, f"❌ Error updating task: {e}"
 
-    def fetch_peer_feedback(self, person_name, days_back=14):
+    def archive_task(self, task_id):
         """
-        Fetch peer feedback for a specific person.
+        Archive a task in Notion.
         
         Args:
-            person_name: Name of the person to fetch feedback for.
-            days_back: Number of days back to fetch feedback for.
+            task_id: ID of the task to archive.
             
         Returns:
-            list: List of feedback dictionaries.
+            tuple: (success, message)
         """
-        if not person_name or not self.feedback_db_id:
-            return []
-
-        recent_cutoff = datetime.now() - timedelta(days=days_back)
-
         try:
-            all_results = []
-            has_more = True
-            start_cursor = None
-
-            while has_more:
-                response = self.client.databases.query(
-                    database_id=self.feedback_db_id,
-                    start_cursor=start_cursor,
-                    page_size=100
-                )
+            with span("notion.archive_task"):
+                self.client.pages.update(page_id=task_id, archived=True)
+            with self._write_lock:
+                self._known_state.pop(task_id, None)
+            self._publish_change(task_id, "archived")
+            return True, "✅ Archived task"
+        except Exception as e:
+            self.debug_print(f"Task archive error details: {traceback.format_exc()}")
+            return False, f"❌ Error archiving task: {e}"
 
-                all_results.extend(response["results"])
-                has_more = response["has_more"]
+    def sync_changes(self) -> int:
+        """
+        Pull tasks edited in Notion since the last sync into the change feed.
+        
+        Only pages whose last_edited_time is at or after the stored
+        watermark are requested; the first sync reads every task.
+        
+        Returns:
+            int: Number of changes published to the feed.
+        """
+        watermark = self.change_feed.watermark
+        query = {"sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}]}
+        if watermark:
+            # Notion compares edit times at minute precision, so pages edited
+            # at the watermark come back again; the feed ignores unchanged ones
+            query["filter"] = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": watermark}
+            }
+        
+        changes = []
+        latest = watermark
+        for pages in self.query_database(self.task_db_id, properties=self.TASK_PROPERTIES, **query):
+            columns = TaskColumns()
+            self._add_task_pages(columns, pages)
+            for row in self._unprotect_tasks(columns.to_frame()).to_dict("records"):
+                row["action"] = "created"  # Recorded as an update if the feed knows the task
+                changes.append(row)
+            
+            edited = [page["last_edited_time"] for page in pages if page.get("last_edited_time")]
+            if edited:
+                latest = max(edited + ([latest] if latest else []))
+        
+        return self.change_feed.record_many(changes, source="notion", watermark=latest)
+
+    def get_task_changes(self, since=0, limit=1000, max_age=CHANGE_FEED_SYNC_SECONDS) -> Dict[str, Any]:
+        """
+        Get tasks created, updated or archived after a change feed cursor.
+        
+        The feed is synced with Notion first if it hasn't been for max_age
+        seconds, so frequent pollers share one incremental query.
+        
+        Args:
+            since: Cursor from the previous call; 0 returns every task.
+            limit: Maximum number of changes to return.
+            max_age: Seconds a previous sync stays fresh.
+            
+        Returns:
+            Dict[str, Any]: "changes", the next "cursor" and "has_more".
+        """
+        last_synced = self.change_feed.last_synced
+        if last_synced is None or (datetime.now() - last_synced).total_seconds() > max_age:
+            # Concurrent callers skip the sync rather than queue behind it
+            if self._feed_sync_lock.acquire(blocking=False):
+                try:
+                    self.sync_changes()
+                except Exception as e:
+                    self.debug_print(f"Error syncing change feed: {e}")
+                finally:
+                    self._feed_sync_lock.release()
+        
+        return self.change_feed.changes_since(since, limit)
 
-                if has_more:
-                    start_cursor = response["next_cursor"]
+    def get_write_stats(self) -> Dict[str, int]:
+        """
+        Get counts of task updates sent to Notion and skipped as no-ops.
+        
+        Returns:
+            Dict[str, int]: Counts of updates sent, updates skipped and fields written.
+        """
+        with self._write_lock:
+            return dict(self.write_stats)
 
-            entries = []
-            for row in all_results:
+    def sync_feedback(self, full=None) -> int:
+        """
+        Copy feedback edited in Notion since the last sync into the feedback store.
+        
+        Incremental syncs only ask for pages whose last_edited_time is at or
+        after the watermark. Queries never return deleted or archived pages,
+        so the whole feedback database is read again, replacing the store,
+        on the first sync and once the last full one is older than
+        FEEDBACK_FULL_SYNC_SECONDS.
+        
+        Args:
+            full: Whether to read the whole database. If None, decided by
+                  the age of the last full sync.
+        
+        Returns:
+            int: Number of feedback entries stored.
+        """
+        watermark = self.feedback_store.watermark
+        if full is None:
+            last_full_sync = self.feedback_store.last_full_sync
+            full = (watermark is None or last_full_sync is None
+                    or (datetime.now() - last_full_sync).total_seconds() > FEEDBACK_FULL_SYNC_SECONDS)
+        query = {}
+        if not full:
+            query["filter"] = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": watermark}
+            }
+        
+        entries = []
+        latest = watermark
+        for pages in self.query_database(self.feedback_db_id, properties=self.FEEDBACK_PROPERTIES, **query):
+            for page in pages:
                 try:
-                    props = row["properties"]
+                    props = page["properties"]
                     name = self.get_title_content(props, "Name")
                     feedback = self.get_rich_text_content(props, "Feedback")
-                    date = self.get_date_value(props, "Date")
-
-                    if name.lower() == person_name.lower() and date and date >= recent_cutoff:
-                        entries.append({"date": date.strftime("%Y-%m-%d"), "feedback": feedback})
+                    try:
+                        date = parse_notion_date(props["Date"]["date"]["start"])
+                    except (KeyError, TypeError):
+                        date = None
+                    entries.append((page["id"], name, date.strftime("%Y-%m-%d") if date else None, feedback))
                 except Exception as e:
                     self.debug_print(f"Error processing feedback entry: {e}")
                     continue
+                
+                edited = page.get("last_edited_time")
+                if edited and (latest is None or edited > latest):
+                    latest = edited
+        
+        return self.feedback_store.apply(entries, watermark=latest, replace=full)
 
-            return entries
+    def fetch_peer_feedback(self, person_name, days_back=14, max_age=FEEDBACK_SYNC_SECONDS):
+        """
+        Fetch peer feedback for a specific person.
+        
+        Reads the local feedback store, after an incremental sync with
+        Notion if the store hasn't been synced for max_age seconds.
+        
+        Args:
+            person_name: Name of the person to fetch feedback for.
+            days_back: Number of days back to fetch feedback for.
+            max_age: Seconds a previous sync stays fresh.
+            
+        Returns:
+            list: List of feedback dictionaries.
+        """
+        if not person_name or not self.feedback_db_id:
+            return []
+
+        try:
+            last_synced = self.feedback_store.last_synced
+            if last_synced is None or (datetime.now() - last_synced).total_seconds() > max_age:
+                # Wait for the first sync; afterwards concurrent callers read
+                # the current copy rather than queue behind a refresh
+                if self._feedback_sync_lock.acquire(blocking=last_synced is None):
+                    try:
+                        self.sync_feedback()
+                    finally:
+                        self._feedback_sync_lock.release()
+        except Exception as e:
+            self.debug_print(f"Error syncing peer feedback: {e}")
+
+        try:
+            return self.feedback_store.recent(person_name, days_back)
         except Exception as e:
             self.debug_print(f"Error fetching peer feedback: {e}")
             return []
 
+    def _sync_registry_in_background(self):
+        """Refresh the registry from Notion without blocking the caller."""
+        if not self._registry_sync_lock.acquire(blocking=False):
+            return  # A sync is already running
+        
+        def sync():
+            try:
+                self.fetch_tasks()
+            except Exception as e:
+                self.debug_print(f"Error syncing task registry: {e}")
+            finally:
+                self._registry_sync_lock.release()
+        
+        threading.Thread(target=sync, name="task-registry-sync", daemon=True).start()
+
+    def _sync_registry(self, max_age=REGISTRY_SYNC_SECONDS):
+        """
+        Sync the task registry with Notion if it is missing or stale.
+        
+        A registry that was never synced is filled before returning, so the
+        first caller doesn't get an empty list; an older one than max_age
+        seconds is refreshed in the background while callers read it.
+        """
+        try:
+            last_synced = self.registry.last_synced
+            if last_synced is None:
+                with self._registry_sync_lock:
+                    # Another caller may have finished the first sync while this one waited
+                    if self.registry.last_synced is None:
+                        self.fetch_tasks()
+            elif (datetime.now() - last_synced).total_seconds() > max_age:
+                self._sync_registry_in_background()
+        except Exception as e:
+            self.debug_print(f"Error syncing task registry: {e}")
+
     def list_all_categories(self):
         """
         Get all unique categories from existing tasks.
         
+        Reads the task registry rather than Notion, after filling it from
+        Notion if it has never been synced.
+        
         Returns:
             list: List of category names.
         """
+        self._sync_registry()
         try:
-            df = self.fetch_tasks()
-            categories = sorted(df["category"].dropna().unique().tolist())
+            categories = self.registry.categories()
             # Add "Uncategorized" if it doesn't exist
             if not categories:
                 categories = ["Uncategorized"]
             return categories
         except Exception as e:
             self.debug_print(f"Error listing categories: {e}")
-            return ["Uncategorized"]  # Fallback
\ No newline at end of file
+            return ["Uncategorized"]  # Fallback
+
+    def list_all_employees(self):
+        """
+        Get all employees with tasks, from the task registry.
+        
+        The registry is filled from Notion first if it has never been synced.
+        
+        Returns:
+            list: List of employee names.
+        """
+        self._sync_registry()
+        try:
+            return self.registry.employees()
+        except Exception as e:
+            self.debug_print(f"Error listing employees: {e}")
+            return []
@@ -0,0 +1,161 @@
+"""
+Columnar parsing of Notion query results for Task Manager.
+Builds task DataFrames straight from the raw Notion JSON without per-row dicts.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+from dateutil import parser
+
+# Column order of the task DataFrame returned by NotionAdapter.fetch_tasks
+TASK_COLUMNS = ["id", "task", "status", "employee", "date", "reminder_sent", "category"]
+
+
+def parse_notion_date(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a Notion date string.
+
+    Notion returns ISO 8601 strings, so ``datetime.fromisoformat`` handles
+    almost every value; ``dateutil`` is only used for anything it rejects.
+
+    Args:
+        value: The date string from a Notion date property.
+
+    Returns:
+        Optional[datetime]: The parsed date, or None if it can't be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        pass
+    try:
+        return parser.parse(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+class TaskColumns:
+    """
+    Accumulates task properties from Notion pages into per-column lists.
+
+    Pages can be added as they arrive from the API, so the raw JSON of a
+    query page can be released as soon as it has been consumed.
+    """
+
+    def __init__(self):
+        """Initialize empty column buffers."""
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all accumulated rows."""
+        self.ids: List[str] = []
+        self.tasks: List[str] = []
+        self.statuses: List[str] = []
+        self.employees: List[str] = []
+        self.dates: List[Optional[datetime]] = []
+        self.reminders: List[bool] = []
+        self.categories: List[str] = []
+
+    def __len__(self) -> int:
+        """Number of rows accumulated so far."""
+        return len(self.ids)
+
+    def add_pages(self, pages: Iterable[Dict[str, Any]]) -> int:
+        """
+        Parse Notion pages and append their properties to the columns.
+
+        Args:
+            pages: Page objects from a Notion database query.
+
+        Returns:
+            int: Number of pages that could not be parsed and were skipped.
+        """
+        skipped = 0
+        for page in pages:
+            try:
+                page_id = page["id"]
+                props = page["properties"]
+
+                prop = props.get("Task")
+                try:
+                    task = prop["title"][0]["text"]["content"]
+                except (KeyError, IndexError, TypeError):
+                    task = ""
+
+                prop = props.get("Status")
+                try:
+                    status = prop["select"]["name"]
+                except (KeyError, TypeError):
+                    status = "No Status"
+
+                prop = props.get("Employee")
+                try:
+                    employee = prop["rich_text"][0]["text"]["content"]
+                except (KeyError, IndexError, TypeError):
+                    employee = ""
+
+                prop = props.get("Date")
+                try:
+                    date = parse_notion_date(prop["date"]["start"])
+                except (KeyError, TypeError):
+                    date = None
+
+                prop = props.get("Reminder Sent")
+                try:
+                    reminder_sent = bool(prop["checkbox"])
+                except (KeyError, TypeError):
+                    reminder_sent = False
+
+                prop = props.get("Category")
+                try:
+                    category = prop["rich_text"][0]["text"]["content"]
+                except (KeyError, IndexError, TypeError):
+                    category = ""
+            except Exception:
+                skipped += 1
+                continue
+
+            # Append only once the whole row parsed, so columns stay aligned
+            self.ids.append(page_id)
+            self.tasks.append(task)
+            self.statuses.append(status)
+            self.employees.append(employee)
+            self.dates.append(date)
+            self.reminders.append(reminder_sent)
+            self.categories.append(category)
+        return skipped
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build the task DataFrame in a single construction.
+
+        Returns:
+            pd.DataFrame: Tasks with categorical status, employee and category columns.
+        """
+        return pd.DataFrame({
+            "id": self.ids,
+            "task": self.tasks,
+            "status": pd.Categorical(self.statuses),
+            "employee": pd.Categorical(self.employees),
+            "date": self.dates,
+            "reminder_sent": self.reminders,
+            "category": pd.Categorical(self.categories),
+        }, columns=TASK_COLUMNS)
+
+
+def parse_task_pages(pages: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Parse Notion task pages into a DataFrame.
+
+    Args:
+        pages: Page objects from a Notion database query.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the parsed tasks.
+    """
+    columns = TaskColumns()
+    columns.add_pages(pages)
+    return columns.to_frame()
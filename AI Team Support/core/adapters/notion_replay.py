@@ -0,0 +1,704 @@
+"""
+Offline Notion backend for Task Manager.
+Serves database queries and page writes from a local fixture store, so the
+application can be load-tested without network access.
+"""
+import base64
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Union
+from urllib.parse import unquote
+
+import httpx
+from notion_client import Client
+
+from core.adapters.notion_transport import RetryingTransport, EndpointStats
+
+# Largest page of results Notion returns from a query
+MAX_PAGE_SIZE = 100
+
+# Timestamps that can be filtered and sorted on, stored as columns
+TIMESTAMP_COLUMNS = ("created_time", "last_edited_time")
+
+# Where the comparable value of each property type lives in its JSON
+_VALUE_PATHS = {
+    "title": "title[0].plain_text",
+    "rich_text": "rich_text[0].plain_text",
+    "select": "select.name",
+    "status": "status.name",
+    "checkbox": "checkbox",
+    "date": "date.start",
+    "number": "number",
+}
+
+_DEFAULT_ANNOTATIONS = {
+    "bold": False, "italic": False, "strikethrough": False,
+    "underline": False, "code": False, "color": "default"
+}
+
+
+class NotionFixtureError(Exception):
+    """A request the fixture store rejects, with Notion's status and error code."""
+
+    def __init__(self, status: int, code: str, message: str):
+        """
+        Initialize the error.
+
+        Args:
+            status: HTTP status Notion would answer with.
+            code: Notion error code, e.g. "validation_error".
+            message: Human readable message.
+        """
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def _now() -> str:
+    """Current time in Notion's timestamp format."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _key(object_id: str) -> str:
+    """Normalize a Notion ID; the API accepts IDs with or without dashes."""
+    return object_id.replace("-", "").lower()
+
+
+def _rich_text_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Expand rich text input into the shape Notion returns."""
+    expanded = []
+    for item in items or []:
+        content = (item.get("text") or {}).get("content", item.get("plain_text", ""))
+        expanded.append({
+            "type": "text",
+            "text": {"content": content, "link": (item.get("text") or {}).get("link")},
+            "annotations": dict(_DEFAULT_ANNOTATIONS, **(item.get("annotations") or {})),
+            "plain_text": content,
+            "href": None,
+        })
+    return expanded
+
+
+def _encode_cursor(values: List[Any]) -> str:
+    """Make an opaque pagination cursor from the sort key of the last row."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> List[Any]:
+    """Read the sort key back from a pagination cursor."""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise NotionFixtureError(400, "validation_error", f"start_cursor {cursor!r} is not valid.")
+
+
+class NotionFixtureStore:
+    """
+    Notion databases and pages held in SQLite.
+
+    Pages are stored as JSON with their timestamps in indexed columns.
+    Query filters are translated to SQL over that JSON, and results are
+    paginated with keyset cursors, so paging through 100k pages stays
+    linear however far in the cursor is.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite file holding the fixtures, or ":memory:".
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript('''
+        CREATE TABLE IF NOT EXISTS databases (
+            key TEXT PRIMARY KEY,
+            id TEXT,
+            properties TEXT
+        );
+        CREATE TABLE IF NOT EXISTS pages (
+            position INTEGER PRIMARY KEY AUTOINCREMENT,
+            key TEXT UNIQUE,
+            id TEXT,
+            database_key TEXT,
+            created_time TEXT,
+            last_edited_time TEXT,
+            archived INTEGER,
+            properties TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_pages_database ON pages(database_key, position);
+        CREATE INDEX IF NOT EXISTS idx_pages_edited ON pages(database_key, last_edited_time, position);
+        CREATE INDEX IF NOT EXISTS idx_pages_created ON pages(database_key, created_time, position);
+        ''')
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_json(cls, path: str) -> "NotionFixtureStore":
+        """
+        Load fixtures from a JSON file into an in-memory store.
+
+        The file holds {"databases": {database_id: [page, ...]}}, or a plain
+        list of pages that each name their database in "parent".
+
+        Args:
+            path: Path to the JSON file.
+
+        Returns:
+            NotionFixtureStore: The loaded store.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        store = cls()
+        if isinstance(data, dict):
+            for database_id, pages in data.get("databases", {}).items():
+                store.add_pages(database_id, pages)
+        else:
+            by_database: Dict[str, List[Dict[str, Any]]] = {}
+            for page in data:
+                by_database.setdefault(page["parent"]["database_id"], []).append(page)
+            for database_id, pages in by_database.items():
+                store.add_pages(database_id, pages)
+        return store
+
+    def schema(self, database_id: str) -> Dict[str, Any]:
+        """
+        Get the property schema of a database.
+
+        Args:
+            database_id: ID of the database.
+
+        Returns:
+            Dict[str, Any]: Property definitions keyed by name.
+        """
+        key = _key(database_id)
+        schema = self._schemas.get(key)
+        if schema is None:
+            with self._lock:
+                row = self._conn.execute('SELECT properties FROM databases WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                raise NotionFixtureError(404, "object_not_found",
+                                         f"Could not find database with ID: {database_id}.")
+            schema = self._schemas[key] = json.loads(row[0])
+        return schema
+
+    def _merge_schema(self, database_id: str, pages: Iterable[Dict[str, Any]]) -> None:
+        """Add any property seen on the pages to the database schema."""
+        key = _key(database_id)
+        try:
+            schema = dict(self.schema(database_id))
+        except NotionFixtureError:
+            schema = {}
+
+        changed = False
+        for page in pages:
+            for name, prop in (page.get("properties") or {}).items():
+                if name not in schema:
+                    prop_type = prop.get("type") or next(
+                        (t for t in _VALUE_PATHS if t in prop), "rich_text")
+                    schema[name] = {"id": prop.get("id", name), "name": name, "type": prop_type, prop_type: {}}
+                    changed = True
+
+        if changed or key not in self._schemas:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO databases (key, id, properties) VALUES (?, ?, ?)',
+                    (key, database_id, json.dumps(schema))
+                )
+                self._conn.commit()
+            self._schemas[key] = schema
+
+    def add_pages(self, database_id: str, pages: List[Dict[str, Any]]) -> int:
+        """
+        Add pages to a database, creating the database if needed.
+
+        Args:
+            database_id: ID of the database.
+            pages: Page objects shaped like Notion query results.
+
+        Returns:
+            int: Number of pages added.
+        """
+        self._merge_schema(database_id, pages)
+        rows = [
+            (
+                _key(page["id"]), page["id"], _key(database_id),
+                page.get("created_time") or _now(),
+                page.get("last_edited_time") or page.get("created_time") or _now(),
+                int(bool(page.get("archived") or page.get("in_trash"))),
+                json.dumps(page.get("properties") or {}),
+            )
+            for page in pages
+        ]
+        with self._lock:
+            self._conn.executemany('''
+            INSERT OR REPLACE INTO pages
+                (key, id, database_key, created_time, last_edited_time, archived, properties)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            self._conn.commit()
+        return len(rows)
+
+    def count(self, database_id: str) -> int:
+        """Number of pages in a database that aren't archived."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM pages WHERE database_key = ? AND archived = 0', (_key(database_id),)
+            ).fetchone()[0]
+
+    def _page_object(self, row: Tuple, database_id: str) -> Dict[str, Any]:
+        """Build a Notion page object from a stored row."""
+        page_id, created_time, last_edited_time, archived, properties = row
+        properties = json.loads(properties)
+        return {
+            "object": "page",
+            "id": page_id,
+            "created_time": created_time,
+            "last_edited_time": last_edited_time,
+            "archived": bool(archived),
+            "in_trash": bool(archived),
+            "parent": {"type": "database_id", "database_id": database_id},
+            "properties": properties,
+            "url": f"https://www.notion.so/{_key(page_id)}",
+        }
+
+    def _compile_filter(self, filter_obj: Dict[str, Any], schema: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Translate a Notion query filter into a SQL condition."""
+        for compound in ("and", "or"):
+            if compound in filter_obj:
+                parts = [self._compile_filter(f, schema) for f in filter_obj[compound]]
+                if not parts:
+                    return "1", []
+                sql = f" {compound.upper()} ".join(f"({part})" for part, _ in parts)
+                return sql, [param for _, params in parts for param in params]
+
+        if "timestamp" in filter_obj:
+            column = filter_obj["timestamp"]
+            if column not in TIMESTAMP_COLUMNS:
+                raise NotionFixtureError(400, "validation_error", f"Unsupported timestamp filter: {column}.")
+            return self._compile_condition(column, "date", filter_obj.get(column) or {})
+
+        name = filter_obj.get("property")
+        if name not in schema:
+            raise NotionFixtureError(400, "validation_error",
+                                     f"Could not find property with name or id: {name}.")
+        prop_type = next((t for t in filter_obj if t != "property"), None)
+        if prop_type not in _VALUE_PATHS or '"' in name:
+            raise NotionFixtureError(400, "validation_error", f"Unsupported filter on property {name}.")
+
+        expr = f"json_extract(properties, '$.\"{name}\".{_VALUE_PATHS[prop_type]}')"
+        return self._compile_condition(expr, prop_type, filter_obj[prop_type] or {})
+
+    @staticmethod
+    def _compile_condition(expr: str, prop_type: str, condition: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Translate one filter condition on a SQL expression."""
+        if len(condition) != 1:
+            raise NotionFixtureError(400, "validation_error", f"Invalid filter condition: {condition}.")
+        op, value = next(iter(condition.items()))
+
+        if op == "is_empty":
+            return f"COALESCE({expr}, '') = ''", []
+        if op == "is_not_empty":
+            return f"COALESCE({expr}, '') != ''", []
+
+        if prop_type in ("title", "rich_text", "select", "status"):
+            text = f"COALESCE({expr}, '')"
+            conditions = {
+                "equals": (f"{text} = ?", [value]),
+                "does_not_equal": (f"{text} != ?", [value]),
+                "contains": (f"instr(lower({text}), lower(?)) > 0", [value]),
+                "does_not_contain": (f"instr(lower({text}), lower(?)) = 0", [value]),
+                "starts_with": (f"lower(substr({text}, 1, length(?))) = lower(?)", [value, value]),
+                "ends_with": (f"lower(substr({text}, -length(?))) = lower(?)", [value, value]),
+            }
+        elif prop_type == "checkbox":
+            conditions = {
+                "equals": (f"COALESCE({expr}, 0) = ?", [int(bool(value))]),
+                "does_not_equal": (f"COALESCE({expr}, 0) != ?", [int(bool(value))]),
+            }
+        elif prop_type == "number":
+            conditions = {
+                "equals": (f"{expr} = ?", [value]),
+                "does_not_equal": (f"{expr} != ?", [value]),
+                "greater_than": (f"{expr} > ?", [value]),
+                "less_than": (f"{expr} < ?", [value]),
+                "greater_than_or_equal_to": (f"{expr} >= ?", [value]),
+                "less_than_or_equal_to": (f"{expr} <= ?", [value]),
+            }
+        else:  # date and timestamps, compared as ISO 8601 strings
+            conditions = {
+                "equals": (f"substr({expr}, 1, 10) = substr(?, 1, 10)", [value]),
+                "before": (f"{expr} < ?", [value]),
+                "after": (f"{expr} > ?", [value]),
+                "on_or_before": (f"{expr} <= ?", [value]),
+                "on_or_after": (f"{expr} >= ?", [value]),
+            }
+
+        if op not in conditions:
+            raise NotionFixtureError(400, "validation_error", f"Unsupported {prop_type} filter: {op}.")
+        return conditions[op]
+
+    def query_json(self, database_id: str, body: Dict[str, Any],
+                   filter_properties: Optional[List[str]] = None) -> str:
+        """
+        Answer a database query like POST /v1/databases/{id}/query.
+
+        Supports compound and property filters, timestamp filters, a single
+        timestamp sort, pagination and filter_properties. Page objects are
+        assembled as JSON inside SQLite, so stored pages are never decoded
+        in Python.
+
+        Args:
+            database_id: ID of the database.
+            body: Request body (filter, sorts, start_cursor, page_size).
+            filter_properties: Property IDs to return; None returns all.
+
+        Returns:
+            str: The Notion list response, as JSON.
+        """
+        schema = self.schema(database_id)
+        page_size = min(int(body.get("page_size") or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+
+        where = ["database_key = ?", "archived = 0"]
+        params: List[Any] = [_key(database_id)]
+        if body.get("filter"):
+            sql, filter_params = self._compile_filter(body["filter"], schema)
+            where.append(f"({sql})")
+            params.extend(filter_params)
+
+        sorts = body.get("sorts") or []
+        if len(sorts) > 1 or any(s.get("timestamp") not in TIMESTAMP_COLUMNS for s in sorts):
+            raise NotionFixtureError(400, "validation_error", "Only a single timestamp sort is supported.")
+        sort_column = sorts[0]["timestamp"] if sorts else None
+        descending = bool(sorts) and sorts[0].get("direction") == "descending"
+
+        # Keyset pagination: continue strictly after the last row returned
+        if body.get("start_cursor"):
+            last = _decode_cursor(body["start_cursor"])
+            if sort_column is None:
+                where.append("position > ?")
+                params.append(last[0])
+            else:
+                op = "<" if descending else ">"
+                where.append(f"({sort_column} {op} ? OR ({sort_column} = ? AND position > ?))")
+                params.extend([last[0], last[0], last[1]])
+
+        order = "position"
+        if sort_column:
+            order = f"{sort_column} {'DESC' if descending else 'ASC'}, position"
+
+        properties_sql = "json(properties)"
+        properties_params: List[Any] = []
+        if filter_properties:
+            wanted = {unquote(p) for p in filter_properties}
+            names = [
+                name for name, prop in schema.items()
+                if name in wanted or unquote(str(prop.get("id", name))) in wanted
+            ]
+            if len(names) < len(schema):
+                # json_patch drops the members of pages that lack a property
+                pairs = ", ".join(f"?, json(json_extract(properties, ?))" for _ in names)
+                properties_sql = f"json_patch('{{}}', json_object({pairs}))" if names else "json('{}')"
+                for name in names:
+                    properties_params.extend([name, f'$."{name}"'])
+
+        with self._lock:
+            rows = self._conn.execute(f'''
+            SELECT position, created_time, last_edited_time, json_object(
+                'object', 'page',
+                'id', id,
+                'created_time', created_time,
+                'last_edited_time', last_edited_time,
+                'archived', json(CASE archived WHEN 1 THEN 'true' ELSE 'false' END),
+                'in_trash', json(CASE archived WHEN 1 THEN 'true' ELSE 'false' END),
+                'parent', json_object('type', 'database_id', 'database_id', ?),
+                'properties', {properties_sql},
+                'url', 'https://www.notion.so/' || key
+            )
+            FROM pages WHERE {' AND '.join(where)} ORDER BY {order} LIMIT ?
+            ''', [database_id] + properties_params + params + [page_size + 1]).fetchall()
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        next_cursor = None
+        if has_more:
+            position, created_time, last_edited_time, _ = rows[-1]
+            if sort_column is None:
+                next_cursor = _encode_cursor([position])
+            else:
+                next_cursor = _encode_cursor(
+                    [created_time if sort_column == "created_time" else last_edited_time, position])
+
+        return (
+            '{"object": "list", "results": [' + ", ".join(row[3] for row in rows) + '], '
+            f'"next_cursor": {json.dumps(next_cursor)}, "has_more": {json.dumps(has_more)}, '
+            '"type": "page_or_database", "page_or_database": {}}'
+        )
+
+    def query(self, database_id: str, body: Dict[str, Any],
+              filter_properties: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Answer a database query, see query_json().
+
+        Returns:
+            Dict[str, Any]: The Notion list response.
+        """
+        return json.loads(self.query_json(database_id, body, filter_properties))
+
+    def _expand_properties(self, schema: Dict[str, Any], properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn property values sent in a write into the shape Notion returns."""
+        expanded = {}
+        for name, value in (properties or {}).items():
+            prop_type = schema.get(name, {}).get("type") or next(
+                (t for t in _VALUE_PATHS if t in value), None)
+            if prop_type is None or prop_type not in value:
+                raise NotionFixtureError(400, "validation_error", f"Invalid value for property {name}.")
+
+            raw = value[prop_type]
+            if prop_type in ("title", "rich_text"):
+                raw = _rich_text_items(raw)
+            elif prop_type in ("select", "status") and raw is not None:
+                raw = {"id": raw.get("id") or uuid.uuid4().hex[:4], "name": raw.get("name"),
+                       "color": raw.get("color", "default")}
+            elif prop_type == "date" and raw is not None:
+                raw = {"start": raw.get("start"), "end": raw.get("end"), "time_zone": raw.get("time_zone")}
+
+            expanded[name] = {"id": schema.get(name, {}).get("id", name), "type": prop_type, prop_type: raw}
+        return expanded
+
+    def create_page(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create a page like POST /v1/pages.
+
+        Args:
+            body: Request body with "parent" and "properties".
+
+        Returns:
+            Dict[str, Any]: The created page.
+        """
+        database_id = (body.get("parent") or {}).get("database_id")
+        if not database_id:
+            raise NotionFixtureError(400, "validation_error", "body.parent.database_id should be defined.")
+        schema = self.schema(database_id)
+        properties = self._expand_properties(schema, body.get("properties"))
+        self._merge_schema(database_id, [{"properties": properties}])
+
+        now = _now()
+        page = {"id": str(uuid.uuid4()), "created_time": now, "last_edited_time": now, "properties": properties}
+        self.add_pages(database_id, [page])
+        return self.get_page(page["id"])
+
+    def _page_row(self, page_id: str) -> Tuple:
+        """Load a stored page row, or raise object_not_found."""
+        with self._lock:
+            row = self._conn.execute('''
+            SELECT pages.id, created_time, last_edited_time, archived, pages.properties, databases.id
+            FROM pages JOIN databases ON databases.key = pages.database_key
+            WHERE pages.key = ?
+            ''', (_key(page_id),)).fetchone()
+        if row is None:
+            raise NotionFixtureError(404, "object_not_found", f"Could not find page with ID: {page_id}.")
+        return row
+
+    def get_page(self, page_id: str) -> Dict[str, Any]:
+        """
+        Retrieve a page like GET /v1/pages/{id}.
+
+        Args:
+            page_id: ID of the page.
+
+        Returns:
+            Dict[str, Any]: The page.
+        """
+        row = self._page_row(page_id)
+        return self._page_object(row[:5], row[5])
+
+    def update_page(self, page_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update a page like PATCH /v1/pages/{id}.
+
+        Args:
+            page_id: ID of the page.
+            body: Request body with "properties" and/or "archived".
+
+        Returns:
+            Dict[str, Any]: The updated page.
+        """
+        row = self._page_row(page_id)
+        database_id = row[5]
+        properties = json.loads(row[4])
+        properties.update(self._expand_properties(self.schema(database_id), body.get("properties")))
+        archived = row[3]
+        for flag in ("archived", "in_trash"):
+            if flag in body:
+                archived = int(bool(body[flag]))
+
+        with self._lock:
+            self._conn.execute('''
+            UPDATE pages SET properties = ?, archived = ?, last_edited_time = ? WHERE key = ?
+            ''', (json.dumps(properties), archived, _now(), _key(page_id)))
+            self._conn.commit()
+        return self.get_page(page_id)
+
+    def database_object(self, database_id: str) -> Dict[str, Any]:
+        """
+        Retrieve a database like GET /v1/databases/{id}.
+
+        Args:
+            database_id: ID of the database.
+
+        Returns:
+            Dict[str, Any]: The database with its property schema.
+        """
+        return {
+            "object": "database",
+            "id": database_id,
+            "title": [],
+            "properties": self.schema(database_id),
+        }
+
+
+class ReplayTransport(RetryingTransport):
+    """
+    Transport that answers Notion API requests from a NotionFixtureStore.
+
+    Requests go through the same retry, pacing and statistics code as real
+    Notion traffic; only the network send is replaced. Latency and rate
+    limiting can be injected to approximate the real service:
+
+    - ``latency`` seconds (plus up to ``jitter`` more) are slept per request.
+    - every ``rate_limit_every``-th request is answered with a 429.
+    - ``requests_per_second`` enforces Notion's rate limit with a token
+      bucket of ``burst`` requests; requests over it get a 429.
+    """
+
+    def __init__(self, store: NotionFixtureStore, latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit_every: int = 0, requests_per_second: Optional[float] = None,
+                 burst: int = 10, retry_after: float = 1.0, seed: int = 0,
+                 stats: Optional[EndpointStats] = None, **kwargs):
+        """
+        Initialize the transport.
+
+        Args:
+            store: Fixture store serving the requests.
+            latency: Seconds added to every request.
+            jitter: Maximum random seconds added on top of latency.
+            rate_limit_every: Answer every Nth request with a 429 (0 disables).
+            requests_per_second: Sustained rate before requests get a 429 (None disables).
+            burst: Requests allowed at once before the sustained rate applies.
+            retry_after: Retry-After seconds sent with injected 429s.
+            seed: Seed for the latency jitter.
+            stats: Where to record per-endpoint latency. Defaults to endpoint_stats.
+            **kwargs: Passed on to RetryingTransport (max_retries, backoff_base, ...).
+        """
+        super().__init__(stats=stats, **kwargs)
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_every = rate_limit_every
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.retry_after = retry_after
+
+        self._random = random.Random(seed)
+        self._counter_lock = threading.Lock()
+        self._requests = 0
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+
+    def _rate_limited(self) -> Optional[float]:
+        """Decide whether to reject this request; returns the Retry-After delay if so."""
+        with self._counter_lock:
+            self._requests += 1
+            if self.rate_limit_every and self._requests % self.rate_limit_every == 0:
+                return self.retry_after
+
+            if self.requests_per_second:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.requests_per_second)
+                self._refilled = now
+                if self._tokens < 1:
+                    return (1 - self._tokens) / self.requests_per_second
+                self._tokens -= 1
+        return None
+
+    def _route(self, request: httpx.Request) -> Union[Dict[str, Any], str]:
+        """Dispatch a request to the fixture store; query results come back as JSON text."""
+        parts = request.url.path.strip("/").split("/")
+        if parts and parts[0] == "v1":
+            parts = parts[1:]
+        request.read()
+        body = json.loads(request.content) if request.content else {}
+        method = request.method
+
+        if len(parts) == 3 and parts[0] == "databases" and parts[2] == "query" and method == "POST":
+            filter_properties = request.url.params.get_list("filter_properties") or None
+            return self.store.query_json(parts[1], body, filter_properties)
+        if len(parts) == 2 and parts[0] == "databases" and method == "GET":
+            return self.store.database_object(parts[1])
+        if parts == ["pages"] and method == "POST":
+            return self.store.create_page(body)
+        if len(parts) == 2 and parts[0] == "pages" and method == "PATCH":
+            return self.store.update_page(parts[1], body)
+        if len(parts) == 2 and parts[0] == "pages" and method == "GET":
+            return self.store.get_page(parts[1])
+        raise NotionFixtureError(400, "invalid_request_url", f"Invalid request URL: {method} {request.url.path}.")
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        """Answer a single attempt of a request locally."""
+        if self.latency or self.jitter:
+            with self._counter_lock:
+                delay = self.latency + self._random.uniform(0, self.jitter)
+            time.sleep(delay)
+
+        retry_after = self._rate_limited()
+        if retry_after is not None:
+            return httpx.Response(
+                429,
+                headers={"Retry-After": f"{retry_after:.3f}"},
+                json={"object": "error", "status": 429, "code": "rate_limited",
+                      "message": "You have been rate limited. Please try again in a few minutes."},
+                request=request,
+            )
+
+        try:
+            result = self._route(request)
+            if isinstance(result, str):
+                return httpx.Response(200, content=result.encode(),
+                                      headers={"Content-Type": "application/json"}, request=request)
+            return httpx.Response(200, json=result, request=request)
+        except NotionFixtureError as e:
+            return httpx.Response(
+                e.status,
+                json={"object": "error", "status": e.status, "code": e.code, "message": e.message},
+                request=request,
+            )
+
+
+def replay_notion_client(store: Union[str, NotionFixtureStore], **options) -> Client:
+    """
+    Build a Notion client that is served from local fixtures.
+
+    The client can be passed to NotionAdapter(client=...), or selected for
+    the whole process by setting NOTION_REPLAY_STORE.
+
+    Args:
+        store: A NotionFixtureStore, a JSON fixture file, or a SQLite fixture file.
+        **options: Passed on to ReplayTransport (latency, rate_limit_every, ...).
+
+    Returns:
+        Client: A notion_client Client backed by the fixtures.
+    """
+    if isinstance(store, str):
+        store = NotionFixtureStore.from_json(store) if store.endswith(".json") else NotionFixtureStore(store)
+    transport = ReplayTransport(store, **options)
+    return Client(auth="replay", client=httpx.Client(transport=transport))
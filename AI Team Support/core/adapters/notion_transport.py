@@ -0,0 +1,303 @@
+"""
+Shared HTTP transport for Notion clients in Task Manager.
+Pools keep-alive connections across adapters and retries rate-limited requests.
+"""
+import random
+import re
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import httpx
+from notion_client import Client
+
+from core.adapters.cassettes import wrap_transport
+from core.metrics import observe_client_request, CLIENT_REQUESTS_IN_FLIGHT, QUEUE_DEPTH
+from config import (
+    DEBUG_MODE,
+    NOTION_MAX_CONNECTIONS,
+    NOTION_MAX_RETRIES,
+    NOTION_REPLAY_STORE
+)
+
+# Statuses worth retrying; 429 is Notion's rate limit response
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Notion's documented average request rate limit per integration
+NOTION_REQUESTS_PER_SECOND = 3.0
+
+# Notion object IDs, with or without dashes
+_ID_PATTERN = re.compile(r"/[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}")
+
+
+def debug_print(message):
+    """Print debug messages if DEBUG_MODE is True."""
+    if DEBUG_MODE:
+        print(message)
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """
+    Group a request under its endpoint, e.g. "POST /v1/databases/{id}/query".
+
+    Args:
+        method: HTTP method.
+        path: URL path of the request.
+
+    Returns:
+        str: The endpoint name with object IDs replaced by {id}.
+    """
+    return f"{method} {_ID_PATTERN.sub('/{id}', path)}"
+
+
+class EndpointStats:
+    """Thread-safe latency and error counters per endpoint of an external service."""
+
+    def __init__(self, service: Optional[str] = None):
+        """
+        Initialize empty counters.
+
+        Args:
+            service: Service name the attempts are also reported under in the
+                     process metrics (e.g. "notion"). None keeps them local.
+        """
+        self.service = service
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, endpoint: str, seconds: float, error: bool = False, retried: bool = False) -> None:
+        """
+        Record one HTTP attempt.
+
+        Args:
+            endpoint: Endpoint name from endpoint_key().
+            seconds: Time spent on the attempt.
+            error: Whether the attempt failed or returned an error status.
+            retried: Whether the attempt is going to be retried.
+        """
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = {
+                    "count": 0, "errors": 0, "retries": 0,
+                    "total_seconds": 0.0, "max_seconds": 0.0
+                }
+            stats["count"] += 1
+            stats["total_seconds"] += seconds
+            if seconds > stats["max_seconds"]:
+                stats["max_seconds"] = seconds
+            if error:
+                stats["errors"] += 1
+            if retried:
+                stats["retries"] += 1
+        if self.service:
+            observe_client_request(self.service, endpoint, seconds, error=error, retried=retried)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get a copy of the counters with the average latency filled in.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Counters keyed by endpoint.
+        """
+        with self._lock:
+            result = {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
+        for stats in result.values():
+            stats["avg_seconds"] = stats["total_seconds"] / stats["count"] if stats["count"] else 0.0
+        return result
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self._stats = {}
+
+
+class RetryingTransport(httpx.HTTPTransport):
+    """
+    HTTP transport that retries rate-limited and failed Notion requests.
+
+    A 429 response is retried after the Retry-After delay Notion sends, and
+    also widens a minimum spacing between requests that is shared by every
+    thread using the transport. The spacing shrinks again as requests succeed,
+    so sustained paging settles just under the rate limit instead of
+    repeatedly hitting it.
+
+    Server errors and read failures are only retried for requests that are
+    safe to repeat; a page creation that may have reached Notion is not.
+    """
+
+    # Bounds for the adaptive spacing between requests, in seconds
+    MIN_INTERVAL_ON_LIMIT = 1.0 / NOTION_REQUESTS_PER_SECOND
+    MAX_INTERVAL = 5.0
+
+    def __init__(self, max_retries: int = NOTION_MAX_RETRIES, backoff_base: float = 0.5,
+                 max_backoff: float = 30.0, stats: Optional[EndpointStats] = None, **kwargs):
+        """
+        Initialize the transport.
+
+        Args:
+            max_retries: Maximum number of retries per request.
+            backoff_base: First backoff delay in seconds, doubled on each retry.
+            max_backoff: Upper bound for a single backoff delay in seconds.
+            stats: Where to record per-endpoint latency. Defaults to endpoint_stats.
+            **kwargs: Passed on to httpx.HTTPTransport (limits, retries, ...).
+        """
+        super().__init__(**kwargs)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.stats = stats if stats is not None else endpoint_stats
+
+        self._pace_lock = threading.Lock()
+        self._interval = 0.0
+        self._next_slot = 0.0
+
+    @staticmethod
+    def _is_idempotent(request: httpx.Request) -> bool:
+        """Whether a request can be repeated without side effects."""
+        if request.method in ("GET", "PATCH", "DELETE"):
+            return True
+        # Database queries are POSTs but only read data
+        return request.method == "POST" and request.url.path.endswith("/query")
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given retry attempt."""
+        delay = min(self.max_backoff, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def _wait_for_slot(self) -> None:
+        """Sleep until this thread may send its next request."""
+        with self._pace_lock:
+            if self._interval <= 0:
+                return
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            with QUEUE_DEPTH.track_inprogress(queue="notion_rate_limit"):
+                time.sleep(slot - now)
+
+    def _slow_down(self) -> None:
+        """Widen the spacing between requests after a rate limit response."""
+        with self._pace_lock:
+            self._interval = min(self.MAX_INTERVAL, max(self.MIN_INTERVAL_ON_LIMIT, self._interval * 2))
+
+    def _speed_up(self) -> None:
+        """Narrow the spacing between requests after a success."""
+        if self._interval <= 0:
+            return
+        with self._pace_lock:
+            self._interval *= 0.9
+            if self._interval < 0.01:
+                self._interval = 0.0
+
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Read the Retry-After header in seconds, if present."""
+        try:
+            return min(self.max_backoff, float(response.headers["Retry-After"]))
+        except (KeyError, ValueError):
+            return None
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        """Send a single attempt of a request over the network."""
+        return super().handle_request(request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, retrying rate limits and transient failures."""
+        endpoint = endpoint_key(request.method, request.url.path)
+        idempotent = self._is_idempotent(request)
+        attempt = 0
+
+        while True:
+            self._wait_for_slot()
+            start = time.perf_counter()
+            try:
+                with CLIENT_REQUESTS_IN_FLIGHT.track_inprogress(service="notion"):
+                    response = self._send(request)
+            except httpx.TransportError as e:
+                retry = idempotent and attempt < self.max_retries
+                self.stats.record(endpoint, time.perf_counter() - start, error=True, retried=retry)
+                if not retry:
+                    raise
+                delay = self._backoff(attempt)
+                debug_print(f"Notion request {endpoint} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            elapsed = time.perf_counter() - start
+            status = response.status_code
+            rate_limited = status == 429
+            retry = (status in RETRY_STATUSES and attempt < self.max_retries
+                     and (rate_limited or idempotent))
+            self.stats.record(endpoint, elapsed, error=status >= 400, retried=retry)
+
+            if not retry:
+                if status < 400:
+                    self._speed_up()
+                return response
+
+            if rate_limited:
+                self._slow_down()
+                delay = self._retry_after(response) or self._backoff(attempt)
+            else:
+                delay = self._backoff(attempt)
+
+            # Release the connection before waiting
+            response.read()
+            response.close()
+            debug_print(f"Notion returned {status} for {endpoint}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+# Latency and error counters for every Notion endpoint used by this process
+endpoint_stats = EndpointStats(service="notion")
+
+_clients_lock = threading.Lock()
+_clients: Dict[str, Client] = {}
+
+
+def get_notion_client(token: str) -> Client:
+    """
+    Get the Notion client for a token, shared by every adapter in the process.
+
+    All clients send requests through one pooled keep-alive connection pool
+    per token, so repeated paging reuses open TLS connections, and are
+    recorded to or replayed from a cassette when CASSETTE_MODE is set. If
+    NOTION_REPLAY_STORE is set, every client is served from that local
+    fixture store instead of the Notion API.
+
+    Args:
+        token: Notion API token.
+
+    Returns:
+        Client: The shared Notion client.
+    """
+    with _clients_lock:
+        client = _clients.get(token)
+        if client is None and NOTION_REPLAY_STORE:
+            from core.adapters.notion_replay import replay_notion_client
+            client = _clients[token] = replay_notion_client(NOTION_REPLAY_STORE)
+        elif client is None:
+            transport = RetryingTransport(
+                limits=httpx.Limits(
+                    max_connections=NOTION_MAX_CONNECTIONS,
+                    max_keepalive_connections=NOTION_MAX_CONNECTIONS,
+                    keepalive_expiry=60.0
+                ),
+                retries=NOTION_MAX_RETRIES  # Connection failures are always safe to retry
+            )
+            client = Client(auth=token, client=httpx.Client(transport=wrap_transport("notion", transport)))
+            _clients[token] = client
+        return client
+
+
+def get_endpoint_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get latency and error counters for each Notion endpoint.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Counters keyed by endpoint name.
+    """
+    return endpoint_stats.snapshot()
@@ -0,0 +1,102 @@
+"""
+Shared HTTP client for OpenAI in Task Manager.
+Gives every module one pooled OpenAI client per API key.
+"""
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import httpx
+from openai import OpenAI
+
+from config import OPENAI_API_KEY
+from core.adapters.cassettes import wrap_transport
+from core.adapters.notion_transport import EndpointStats, endpoint_key
+from core.metrics import CLIENT_REQUESTS_IN_FLIGHT
+
+# Latency and error counters for every OpenAI endpoint used by this process
+openai_stats = EndpointStats(service="openai")
+
+_clients_lock = threading.Lock()
+_clients: Dict[str, OpenAI] = {}
+_transport: Optional[httpx.BaseTransport] = None
+
+
+class MeteredTransport(httpx.BaseTransport):
+    """Transport that records the latency and outcome of every OpenAI request."""
+
+    def __init__(self, transport: httpx.BaseTransport, stats: EndpointStats = openai_stats):
+        """
+        Initialize the transport.
+
+        Args:
+            transport: Transport that sends the requests.
+            stats: Where to record per-endpoint latency.
+        """
+        self.transport = transport
+        self.stats = stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request and record how it went."""
+        endpoint = endpoint_key(request.method, request.url.path)
+        start = time.perf_counter()
+        try:
+            with CLIENT_REQUESTS_IN_FLIGHT.track_inprogress(service="openai"):
+                response = self.transport.handle_request(request)
+        except Exception:
+            self.stats.record(endpoint, time.perf_counter() - start, error=True)
+            raise
+        self.stats.record(endpoint, time.perf_counter() - start, error=response.status_code >= 400)
+        return response
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+def set_openai_transport(transport: Optional[httpx.BaseTransport]) -> None:
+    """
+    Send requests from OpenAI clients created after this call through a transport.
+
+    Used by benchmarks to serve OpenAI from a local stand-in. Modules create
+    their client when imported, so this must be called before importing them.
+
+    Args:
+        transport: Transport to use, or None to go back to the OpenAI API.
+    """
+    global _transport
+    with _clients_lock:
+        _transport = transport
+        _clients.clear()
+
+
+def get_openai_client(api_key: Optional[str] = None) -> OpenAI:
+    """
+    Get the OpenAI client for an API key, shared by every module in the process.
+
+    Requests are recorded to or replayed from a cassette when CASSETTE_MODE is set.
+
+    Args:
+        api_key: OpenAI API key. If None, uses value from config.
+
+    Returns:
+        OpenAI: The shared OpenAI client.
+    """
+    api_key = api_key or OPENAI_API_KEY
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            transport = _transport or wrap_transport("openai", httpx.HTTPTransport())
+            http_client = httpx.Client(transport=MeteredTransport(transport))
+            client = _clients[api_key] = OpenAI(api_key=api_key, http_client=http_client)
+        return client
+
+
+def get_openai_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get latency and error counters for each OpenAI endpoint.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Counters keyed by endpoint name.
+    """
+    return openai_stats.snapshot()
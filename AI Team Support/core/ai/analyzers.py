@@ -8,7 +8,7 @@ from datetime import datetime
 
 # Import OpenAI client for AI-powered analysis
 # We'll use the new OpenAI client structure
-from openai import OpenAI
+from core.adapters.openai_transport import get_openai_client
 
 # Import from config for now - will be updated with plugin config later
 from config import (
@@ -29,7 +29,7 @@ class AnalyzerBase:
         """
         self.api_key = openai_api_key or OPENAI_API_KEY
         self.model = model or CHAT_MODEL
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_openai_client(self.api_key)
     
     def analyze(self, content, **kwargs):
         """
@@ -86,7 +86,7 @@ class TaskAnalyzer(AnalyzerBase):
             
             # Status distribution
             if "status" in tasks_df.columns:
-                status_counts = tasks_df["status"].value_counts().to_dict()
+                status_counts = tasks_df["status"].value_counts().loc[lambda counts: counts > 0].to_dict()
                 result["status_distribution"] = status_counts
                 
                 # Calculate completion rate
@@ -95,11 +95,11 @@ class TaskAnalyzer(AnalyzerBase):
             
             # Category distribution
             if "category" in tasks_df.columns:
-                result["category_distribution"] = tasks_df["category"].value_counts().to_dict()
+                result["category_distribution"] = tasks_df["category"].value_counts().loc[lambda counts: counts > 0].to_dict()
             
             # Employee distribution
             if "employee" in tasks_df.columns:
-                result["employee_distribution"] = tasks_df["employee"].value_counts().to_dict()
+                result["employee_distribution"] = tasks_df["employee"].value_counts().loc[lambda counts: counts > 0].to_dict()
             
             # Date statistics
             if "date" in tasks_df.columns:
@@ -329,7 +329,7 @@ class ProjectAnalyzer(AnalyzerBase):
             total_tasks = len(project_tasks)
             
             if "status" in project_tasks.columns:
-                status_counts = project_tasks["status"].value_counts().to_dict()
+                status_counts = project_tasks["status"].value_counts().loc[lambda counts: counts > 0].to_dict()
                 completed = status_counts.get("Completed", 0)
                 blocked = status_counts.get("Blocked", 0)
                 
@@ -433,12 +433,12 @@ class ProjectAnalyzer(AnalyzerBase):
         # Status distribution
         status_dist = {}
         if 'status' in tasks_df.columns:
-            status_dist = tasks_df["status"].value_counts().to_dict()
+            status_dist = tasks_df["status"].value_counts().loc[lambda counts: counts > 0].to_dict()
             
         # Employee distribution
         employee_dist = {}
         if 'employee' in tasks_df.columns:
-            employee_dist = tasks_df["employee"].value_counts().to_dict()
+            employee_dist = tasks_df["employee"].value_counts().loc[lambda counts: counts > 0].to_dict()
         
         prompt = f"""
         You are ProjectAnalyst, a strategic advisor on project management and team productivity.
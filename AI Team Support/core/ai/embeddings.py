@@ -9,7 +9,7 @@ import traceback
 from hashlib import md5
 from datetime import datetime
 import numpy as np
-from openai import OpenAI
+from core.adapters.openai_transport import get_openai_client
 
 from config import (
     OPENAI_API_KEY, 
@@ -22,7 +22,7 @@ from config import (
 )
 
 # Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+client = get_openai_client(OPENAI_API_KEY)
 
 def setup_embedding_cache():
     """Initialize the SQLite-based embedding cache."""
@@ -215,7 +215,7 @@ def get_coaching_insight(person_name, tasks, recent_tasks, peer_feedback):
                 "total_tasks": len(recent_tasks),
                 "completed_tasks": len(completed_tasks),
                 "completion_rate": f"{len(completed_tasks) / len(recent_tasks):.1%}" if len(recent_tasks) > 0 else "0%",
-                "category_counts": recent_tasks['category'].value_counts().to_dict(),
+                "category_counts": recent_tasks['category'].value_counts().loc[lambda counts: counts > 0].to_dict(),
                 "date_range": (recent_tasks['date'].max() - recent_tasks['date'].min()).days + 1 if not recent_tasks.empty else 0
             }
     except Exception as e:
@@ -277,11 +277,11 @@ def get_project_insight(selected_category, filtered_tasks):
                 date_range = 0
 
             # Calculate team distribution
-            team_counts = filtered_tasks['employee'].value_counts().to_dict()
+            team_counts = filtered_tasks['employee'].value_counts().loc[lambda counts: counts > 0].to_dict()
 
             basic_stats = {
                 "total_tasks": len(filtered_tasks),
-                "status_counts": filtered_tasks['status'].value_counts().to_dict(),
+                "status_counts": filtered_tasks['status'].value_counts().loc[lambda counts: counts > 0].to_dict(),
                 "team_distribution": team_counts,
                 "date_range": date_range
             }
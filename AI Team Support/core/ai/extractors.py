@@ -2,14 +2,13 @@
 Task extraction functionality for Task Manager.
 Handles extracting structured tasks from freeform text with security protection.
 """
-import json
-import re
-import ast
 import traceback
 from dateutil import parser
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from core.adapters.openai_transport import get_openai_client
+from core.storage.extraction_cache import extraction_cache, extraction_key
+from core.task_parser import parse_task_list, TaskParseError
 
 from config import (
     OPENAI_API_KEY,
@@ -21,11 +20,44 @@ from config import (
 # Import security manager for protecting sensitive data
 from plugins import plugin_manager
 
+# Bump whenever the prompt or the validation below changes, so cached extractions are redone
+PROMPT_VERSION = "1"
+# Keeps this extractor's cache entries apart from core.task_extractor's, whose prompt differs
+CACHE_NAMESPACE = "ai.extractors"
+
 def debug_print(message):
     """Print debug messages if DEBUG_MODE is True."""
     if DEBUG_MODE:
         print(message)
 
+def _unprotect_extracted(valid_tasks: List[Dict[str, Any]], protection_plugin) -> List[Dict[str, Any]]:
+    """
+    Restore project names in extracted tasks.
+    
+    Args:
+        valid_tasks: Validated tasks as extracted from the protected text.
+        protection_plugin: The ProjectProtectionPlugin, or None.
+        
+    Returns:
+        List[Dict[str, Any]]: Tasks with original project names.
+    """
+    # Unprotect tasks if protection was applied
+    if protection_plugin and protection_plugin.enabled:
+        try:
+            # First, process the tasks to add any new project categories to the security manager
+            for task in valid_tasks:
+                if 'category' in task and task['category'] and task['category'] != "Uncategorized":
+                    # Make sure this category is known to the security manager
+                    # This call will create a token mapping if it doesn't exist
+                    protection_plugin.security_manager.tokenize_project(task['category'])
+            
+            # Now unprotect the tasks to restore original project names
+            valid_tasks = protection_plugin.unprotect_task_list(valid_tasks)
+        except Exception as e:
+            print(f"Error unprotecting tasks: {e}")
+    
+    return valid_tasks
+
 def extract_tasks_from_update(text: str) -> List[Dict[str, Any]]:
     """
     Extract structured tasks from freeform text with improved error handling and security.
@@ -50,6 +82,14 @@ def extract_tasks_from_update(text: str) -> List[Dict[str, Any]]:
         # Only protect project names that are already known
         # New projects will be discovered during processing and protected afterward
         protected_text = protection_plugin.protect_text(text)
+    
+    # Keyed on the text as submitted, since protecting it depends on the projects known so far;
+    # the tasks are stored in protected form, so the cache holds no project names
+    cache_key = extraction_key(text, PROMPT_VERSION, CHAT_MODEL, CACHE_NAMESPACE)
+    valid_tasks = extraction_cache.get(cache_key)
+    if valid_tasks is not None:
+        print(f"Using {len(valid_tasks)} cached tasks")
+        return _unprotect_extracted(valid_tasks, protection_plugin)
 
     prompt = f"""You are TaskExtractor, an expert system that extracts structured task updates from complex work logs and emails.
 
@@ -116,7 +156,7 @@ Now extract the tasks from this input: {protected_text}"""
 
     try:
         # Create OpenAI client with API key
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client(OPENAI_API_KEY)
         
         print("Calling OpenAI API...")
         response = client.chat.completions.create(
@@ -128,56 +168,15 @@ Now extract the tasks from this input: {protected_text}"""
         content = response.choices[0].message.content
         print(f"Received response from OpenAI. Length: {len(content)}")
 
-        # Remove markdown code blocks if present
-        if "```" in content:
-            print("Removing markdown code blocks...")
-            content = re.sub(r'```(?:python|json)?\n(.*?)```', r'\1', content, flags=re.DOTALL)
-
-        content = content.strip()
-        print(f"Cleaned content. Now parsing...")
-
-        # Try multiple parsing methods in sequence
-        tasks = None
-
-        # Method 1: Direct JSON parsing
+        # One tolerant pass: JSON or Python literals, code fences and surrounding text ignored
+        parse_errors = []
         try:
-            print("Attempting direct JSON parsing...")
-            # Replace single quotes with double quotes for JSON
-            json_content = content.replace("'", '"')
-            tasks = json.loads(json_content)
-            print("JSON parsing successful!")
-        except json.JSONDecodeError as e:
-            print(f"JSON parse failed: {e}")
-
-            # Method 2: Extract array with regex
-            try:
-                print("Attempting to extract JSON array with regex...")
-                match = re.search(r'\[\s*{.*}\s*\]', content, re.DOTALL)
-                if match:
-                    json_array = match.group(0).replace("'", '"')
-                    tasks = json.loads(json_array)
-                    print("Regex extraction successful!")
-                else:
-                    print("No JSON array found in content")
-            except Exception as e:
-                print(f"Regex extraction failed: {e}")
-
-                # Method 3: Fall back to safer eval
-                try:
-                    print("Attempting eval with ast...")
-                    tasks = ast.literal_eval(content)
-                    print("AST literal_eval successful!")
-                except Exception as e:
-                    print(f"AST literal_eval failed: {e}")
-
-                    # Final fallback: Try eval directly
-                    try:
-                        print("Last resort: direct eval...")
-                        tasks = eval(content)
-                        print("Direct eval successful!")
-                    except Exception as e:
-                        print(f"All parsing methods failed: {e}")
-                        raise ValueError("Could not parse AI response as valid task data")
+            tasks = parse_task_list(content, parse_errors)
+        except TaskParseError as e:
+            print(f"Could not parse AI response: {e}")
+            raise ValueError(f"Could not parse AI response as valid task data: {e}")
+        for error in parse_errors:
+            print(f"Skipped part of AI response: {error}")
 
         # Ensure tasks is a list of dictionaries
         if not isinstance(tasks, list):
@@ -220,23 +219,11 @@ Now extract the tasks from this input: {protected_text}"""
                 continue
 
         print(f"Successfully validated {len(valid_tasks)} tasks")
+        # An empty result may be a bad response rather than an update without tasks, so try again next time
+        if valid_tasks:
+            extraction_cache.put(cache_key, valid_tasks)
         
-        # Unprotect tasks if protection was applied
-        if protection_plugin and protection_plugin.enabled:
-            try:
-                # First, process the tasks to add any new project categories to the security manager
-                for task in valid_tasks:
-                    if 'category' in task and task['category'] and task['category'] != "Uncategorized":
-                        # Make sure this category is known to the security manager
-                        # This call will create a token mapping if it doesn't exist
-                        protection_plugin.security_manager.tokenize_project(task['category'])
-                
-                # Now unprotect the tasks to restore original project names
-                valid_tasks = protection_plugin.unprotect_task_list(valid_tasks)
-            except Exception as e:
-                print(f"Error unprotecting tasks: {e}")
-        
-        return valid_tasks
+        return _unprotect_extracted(valid_tasks, protection_plugin)
 
     except Exception as e:
         import traceback
@@ -5,7 +5,7 @@ Handles coaching and project insights with security protection.
 from typing import Dict, List, Any, Optional, Union
 import pandas as pd
 from datetime import datetime, timedelta
-from openai import OpenAI
+from core.adapters.openai_transport import get_openai_client
 
 from config import (
     OPENAI_API_KEY,
@@ -47,7 +47,7 @@ def get_coaching_insight(person_name: str, tasks: List[Dict[str, Any]], recent_t
                 "total_tasks": len(recent_tasks),
                 "completed_tasks": len(completed_tasks),
                 "completion_rate": f"{len(completed_tasks) / len(recent_tasks):.1%}" if len(recent_tasks) > 0 else "0%",
-                "category_counts": recent_tasks['category'].value_counts().to_dict(),
+                "category_counts": recent_tasks['category'].value_counts().loc[lambda counts: counts > 0].to_dict(),
                 "date_range": (recent_tasks['date'].max() - recent_tasks['date'].min()).days + 1 if not recent_tasks.empty else 0
             }
     except Exception as e:
@@ -109,7 +109,7 @@ def get_coaching_insight(person_name: str, tasks: List[Dict[str, Any]], recent_t
 
     try:
         # Initialize OpenAI client
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client(OPENAI_API_KEY)
         
         response = client.chat.completions.create(
             model=CHAT_MODEL,
@@ -157,11 +157,11 @@ def get_project_insight(selected_category: str, filtered_tasks: pd.DataFrame) ->
                 date_range = 0
 
             # Calculate team distribution
-            team_counts = filtered_tasks['employee'].value_counts().to_dict()
+            team_counts = filtered_tasks['employee'].value_counts().loc[lambda counts: counts > 0].to_dict()
 
             basic_stats = {
                 "total_tasks": len(filtered_tasks),
-                "status_counts": filtered_tasks['status'].value_counts().to_dict(),
+                "status_counts": filtered_tasks['status'].value_counts().loc[lambda counts: counts > 0].to_dict(),
                 "team_distribution": team_counts,
                 "date_range": date_range
             }
@@ -178,31 +178,20 @@ def get_project_insight(selected_category: str, filtered_tasks: pd.DataFrame) ->
             # Protect the category name
             protected_category = protection_plugin.security_manager.tokenize_project(selected_category)
             
-            # Convert DataFrame to list of dicts for protection
-            tasks_list = []
-            for _, row in filtered_tasks.iterrows():
-                task_dict = row.to_dict()
-                # Ensure 'task' key exists for compatibility with protect_task_data
-                if 'task' not in task_dict and 'Task' in task_dict:
-                    task_dict['task'] = task_dict['Task']
-                tasks_list.append(task_dict)
-            
-            # Protect each task
-            protected_tasks_list = protection_plugin.protect_task_list(tasks_list)
-            
-            # Convert back to DataFrame if needed
-            # For simplicity, we'll just use the list for the prompt
+            # Protect the same columns that are sent unprotected, without leaving the DataFrame
+            protected_tasks = protection_plugin.protect_task_frame(
+                filtered_tasks[['task', 'status', 'employee', 'date']].copy())
         except Exception as e:
             debug_print(f"Error protecting project data: {e}")
             # Continue with unprotected data if protection fails
-            protected_tasks_list = tasks_list
+            protected_tasks = filtered_tasks
 
     # AI-generated insight based on tasks in the category
     project_prompt = f"""
     You are ProjectAnalyst, a strategic advisor on project management and team productivity.
 
     ANALYZE PROJECT '{protected_category}' TASKS:
-    {protected_tasks_list if use_protection else filtered_tasks[['task', 'status', 'employee', 'date']].to_dict(orient='records')}
+    {protected_tasks[['task', 'status', 'employee', 'date']].to_dict(orient='records')}
 
     PROJECT METADATA:
     {basic_stats}
@@ -225,7 +214,7 @@ def get_project_insight(selected_category: str, filtered_tasks: pd.DataFrame) ->
 
     try:
         # Initialize OpenAI client
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client(OPENAI_API_KEY)
         
         response = client.chat.completions.create(
             model=CHAT_MODEL,
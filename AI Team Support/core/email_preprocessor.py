@@ -0,0 +1,239 @@
+"""
+Email preprocessing for Task Manager.
+Handles trimming quoted replies, signatures and legal footers from email
+bodies before their tasks are extracted.
+"""
+import re
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+from config import CHAT_MODEL, EMAIL_MIN_REPLY_CHARS, DEBUG_MODE
+from core.metrics import EMAIL_PREPROCESS_TOKENS_TOTAL
+
+try:
+    import tiktoken
+except ImportError:  # Token counts are estimated from the length instead
+    tiktoken = None
+
+# Start of the quoted history in a reply: everything from here on was written before
+REPLY_HEADER = re.compile(
+    r"^(?:on\s.{1,200}\swrote:"
+    r"|-{2,}\s*original message\s*-{2,}"
+    r"|_{10,})\s*$",
+    re.IGNORECASE
+)
+# Outlook puts a From:/Sent: block above the quoted message instead of an "On ... wrote:" line
+OUTLOOK_FROM = re.compile(r"^\*?from:\*?\s.+", re.IGNORECASE)
+OUTLOOK_FIELD = re.compile(r"^\*?(?:sent|date|to|cc|subject):\*?\s", re.IGNORECASE)
+FORWARD_SUBJECT = re.compile(r"^\*?subject:\*?\s*(?:fw|fwd):", re.IGNORECASE)
+FORWARD_MARKER = re.compile(r"^-{2,}\s*forwarded message\s*-{2,}\s*$", re.IGNORECASE)
+QUOTE_PREFIX = re.compile(r"^\s*>[>\s]*")
+
+# Signatures: the "-- " delimiter, mobile client footers, and sign-offs near the end of the message
+SIGNATURE_DELIMITER = re.compile(r"^--\s?$")
+MOBILE_FOOTER = re.compile(r"^(?:sent from my \w+|sent from (?:outlook|mail) for \w+|get outlook for \w+).*$",
+                           re.IGNORECASE)
+SIGN_OFF = re.compile(
+    r"^(?:(?:best|kind|warm|many)\s+)?(?:regards|thanks|thank you|thx|cheers|best|sincerely|br)"
+    r"(?:\s+(?:again|so much|all))?[\s,.!-]*$",
+    re.IGNORECASE
+)
+SIGNATURE_MAX_LINES = 8  # Lines after a sign-off that are still taken as a signature
+
+# Legal footers and disclaimers, removed a paragraph at a time
+LEGAL_FOOTER = re.compile(
+    r"confidentiality notice|disclaimer:"
+    r"|intended (?:solely |only )?for the (?:use of the )?(?:named )?(?:individual|addressee|recipient|person)"
+    r"|if you (?:are not the intended|have received this (?:e-?mail|message|communication) in error)"
+    r"|please consider the environment before printing"
+    r"|this (?:e-?mail|message)(?: and any (?:files|attachments)[^.]{0,60})? (?:is|are|may be|contains?) "
+    r"(?:strictly )?(?:confidential|privileged)",
+    re.IGNORECASE
+)
+
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+BLANK_LINES = re.compile(r"\n{3,}")
+
+# Estimated characters per token when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def debug_print(message):
+    """Print debug messages if DEBUG_MODE is True."""
+    if DEBUG_MODE:
+        print(message)
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens a text uses in the chat model's prompt.
+
+    Uses tiktoken when it is installed, otherwise estimates from the length.
+
+    Args:
+        text: The text.
+
+    Returns:
+        int: Number of tokens.
+    """
+    global _encoding
+    if not text:
+        return 0
+    if tiktoken is not None:
+        if _encoding is None:
+            with _encoding_lock:
+                if _encoding is None:
+                    try:
+                        _encoding = tiktoken.encoding_for_model(CHAT_MODEL)
+                    except Exception as e:
+                        print(f"Error loading tokenizer for {CHAT_MODEL}, estimating tokens: {e}")
+                        _encoding = False
+        if _encoding:
+            return len(_encoding.encode(text, disallowed_special=()))
+    return max(1, round(len(text) / CHARS_PER_TOKEN))
+
+
+def _find_reply_header(lines: List[str]) -> Optional[int]:
+    """Index of the line where the quoted history of a reply starts, if any."""
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if REPLY_HEADER.match(stripped):
+            return i
+        # "On <date>, <name> <address>" wrapped over two lines before "wrote:"
+        if (stripped.lower().startswith("on ") and i + 1 < len(lines)
+                and REPLY_HEADER.match(stripped + " " + lines[i + 1].strip())):
+            return i
+        if OUTLOOK_FROM.match(stripped):
+            block = [candidate.strip() for candidate in lines[i + 1:i + 6]]
+            if any(FORWARD_SUBJECT.match(field) for field in block):
+                continue
+            if i > 0 and FORWARD_MARKER.match(lines[i - 1].strip()):
+                continue
+            if sum(bool(OUTLOOK_FIELD.match(field)) for field in block) >= 2:
+                return i
+    return None
+
+
+def _strip_signature(lines: List[str]) -> Tuple[List[str], List[str]]:
+    """Split off the signature at the end of a message; returns (message, signature)."""
+    for i, line in enumerate(lines):
+        if SIGNATURE_DELIMITER.match(line):
+            return lines[:i], lines[i:]
+
+    kept = [line for line in lines if not MOBILE_FOOTER.match(line.strip())]
+    removed = [line for line in lines if MOBILE_FOOTER.match(line.strip())]
+
+    # A sign-off followed by a name and a few short lines (title, phone, address)
+    content = [i for i, line in enumerate(kept) if line.strip()]
+    for i in content[-(SIGNATURE_MAX_LINES + 1):]:
+        if SIGN_OFF.match(kept[i].strip()):
+            tail = [line for line in kept[i + 1:] if line.strip()]
+            if len(tail) <= SIGNATURE_MAX_LINES and all(len(line.strip()) <= 80 for line in tail):
+                # Keep the sign-off and the name under it
+                names = [j for j in content if j > i][:1]
+                cut = names[0] + 1 if names else i + 1
+                return kept[:cut], removed + kept[cut:]
+            break
+    return kept, removed
+
+
+def _strip_legal_footers(text: str) -> Tuple[str, str]:
+    """Remove disclaimer paragraphs; returns (text, removed text)."""
+    kept, removed = [], []
+    for paragraph in PARAGRAPH_BREAK.split(text):
+        (removed if LEGAL_FOOTER.search(paragraph) else kept).append(paragraph)
+    return "\n\n".join(kept), "\n\n".join(removed)
+
+
+def preprocess_email(body: str, min_reply_chars: int = EMAIL_MIN_REPLY_CHARS) -> Tuple[str, Dict[str, Any]]:
+    """
+    Trim an email body to the part worth sending for task extraction.
+
+    Legal footers and the signature are removed, and quoted history (an
+    "On ... wrote:" line, "Original Message" or Outlook From:/Sent: headers
+    and everything below them, and "> " lines) is replaced by a one-line
+    note. Forwarded messages are kept, as forwarding an update is how it
+    reaches the task manager. If the new text of a reply is shorter than
+    min_reply_chars ("See below", "FYI"), the quoted history is the update
+    and is kept.
+
+    Args:
+        body: Decoded plain text body of the email.
+        min_reply_chars: Shortest new text for which quoted history is dropped.
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: The trimmed body, and a report with
+            tokens_before, tokens_after, tokens_saved, the tokens removed
+            as "quoted", "signature" and "footer", and kept_history (True
+            when a short reply kept its quoted history).
+    """
+    removed = {"quoted": [], "signature": [], "footer": []}
+    note = None
+
+    # Corporate footers usually sit below the quoted history, so they go first
+    text, footer = _strip_legal_footers(body.replace("\r\n", "\n").replace("\r", "\n"))
+    if footer:
+        removed["footer"] = [footer]
+    lines = text.split("\n")
+
+    # Quoted history: everything below the reply header, and "> " lines above it
+    header = _find_reply_header(lines)
+    message, history = (lines[:header], lines[header:]) if header is not None else (lines, [])
+    new_lines = [line for line in message if not line.lstrip().startswith(">")]
+    quoted = [line for line in message if line.lstrip().startswith(">")]
+    reply, removed["signature"] = _strip_signature(new_lines)
+
+    if len("\n".join(reply).strip()) >= min_reply_chars:
+        if history or quoted:
+            removed["quoted"] = history + quoted
+            note = f"[Quoted earlier messages removed: {len(history) + len(quoted)} lines]"
+        message = reply
+    elif history or quoted:
+        # The reply only points at the history, so the history is the update.
+        # The reply's signature sits above the history and is cut from the
+        # reply alone; the history's signature is looked for below it only
+        boundary = next((i for i, line in enumerate(message) if line.lstrip().startswith(">")), len(message))
+        reply, removed["signature"] = _strip_signature(message[:boundary])
+        update, signature = _strip_signature([QUOTE_PREFIX.sub("", line) for line in message[boundary:] + history])
+        message = reply + update
+        removed["signature"] += signature
+    else:
+        message = reply
+
+    text = BLANK_LINES.sub("\n\n", "\n".join(message)).strip()
+    if note:
+        text = f"{text}\n\n{note}"
+
+    tokens_before = count_tokens(body)
+    tokens_after = count_tokens(text)
+    report = {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": max(0, tokens_before - tokens_after),
+        "kept_history": bool(history or quoted) and not removed["quoted"],
+    }
+    for part, part_lines in removed.items():
+        report[part] = count_tokens("\n".join(part_lines))
+        if report[part]:
+            EMAIL_PREPROCESS_TOKENS_TOTAL.inc(report[part], part=part)
+    EMAIL_PREPROCESS_TOKENS_TOTAL.inc(tokens_after, part="kept")
+    debug_print(f"Email preprocessing report: {report}")
+    return text, report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Describe a preprocessing report in one line, for logs.
+
+    Args:
+        report: Report returned by preprocess_email().
+
+    Returns:
+        str: e.g. "1,240 -> 310 tokens (saved 930: quoted 850, signature 30, footer 50)".
+    """
+    parts = ", ".join(f"{part} {report[part]:,}" for part in ("quoted", "signature", "footer") if report[part])
+    summary = f"{report['tokens_before']:,} -> {report['tokens_after']:,} tokens (saved {report['tokens_saved']:,}"
+    return summary + (f": {parts})" if parts else ")")
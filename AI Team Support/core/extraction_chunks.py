@@ -0,0 +1,228 @@
+"""
+Chunked task extraction helpers for Task Manager.
+Handles splitting long email threads into chunks and merging the tasks
+extracted from each chunk.
+"""
+import re
+from typing import Dict, List, Any, Callable, Optional
+
+import numpy as np
+
+from config import SIMILARITY_THRESHOLD
+from core.storage.task_tiers import (
+    SAME_EMPLOYEE_BONUS,
+    SAME_CATEGORY_BONUS,
+    RECURRING_DATE_PENALTY,
+    date_key
+)
+
+# Lines that start a new message in a forwarded or replied-to thread
+MESSAGE_BOUNDARY = re.compile(
+    r"^(?:-{2,}\s*(?:original message|forwarded message)\s*-{2,}"
+    r"|_{10,}"
+    r"|on .{1,200} wrote:"
+    r"|from:\s.+)\s*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Header lines repeated at the top of every chunk cut from the same message
+HEADER_LINE = re.compile(r"^(?:-{2,}.*-{2,}|_{10,}|(?:from|sent|date|to|cc|subject):.*)$", re.IGNORECASE)
+
+# Blank lines separating sections of a message
+SECTION_BREAK = re.compile(r"\n[ \t]*\n")
+
+
+def split_messages(text: str) -> List[str]:
+    """
+    Split an email thread into its messages.
+
+    Args:
+        text: The update text.
+
+    Returns:
+        List[str]: Messages in thread order, each starting at its boundary line.
+    """
+    starts = sorted({0} | {match.start() for match in MESSAGE_BOUNDARY.finditer(text)})
+    messages = []
+    pending = ""
+    for start, end in zip(starts, starts[1:] + [len(text)]):
+        piece = pending + text[start:end]
+        # A separator line directly followed by a From: line is one header, not two messages
+        if not piece.strip() or all(HEADER_LINE.match(line) for line in piece.strip().splitlines()):
+            pending = piece
+            continue
+        messages.append(piece)
+        pending = ""
+    if pending.strip():
+        messages.append(pending)
+    return messages
+
+
+def _message_header(message: str) -> str:
+    """The leading header lines of a message, e.g. From: and Date:."""
+    header = []
+    for line in message.lstrip("\n").splitlines():
+        if not HEADER_LINE.match(line.strip()):
+            break
+        header.append(line)
+    return "\n".join(header)
+
+
+def _hard_split(text: str, max_chars: int) -> List[str]:
+    """Split text with no section breaks at line ends, or anywhere as a last resort."""
+    pieces = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and len(current) + len(line) > max_chars:
+            pieces.append(current)
+            current = ""
+        current += line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _split_message(message: str, max_chars: int) -> List[str]:
+    """Split one message into pieces of at most max_chars, each starting with the message header."""
+    if len(message) <= max_chars:
+        return [message]
+
+    header = _message_header(message)
+    body = message.lstrip("\n")[len(header):]
+    prefix = header + "\n\n" if header else ""
+    budget = max(max_chars - len(prefix), max_chars // 2)
+
+    sections = []
+    for section in SECTION_BREAK.split(body):
+        if section.strip():
+            sections.extend(_hard_split(section, budget) if len(section) > budget else [section])
+
+    pieces = []
+    current = ""
+    for section in sections:
+        if current and len(current) + len(section) + 2 > budget:
+            pieces.append(prefix + current)
+            current = ""
+        current = current + "\n\n" + section if current else section
+    if current:
+        pieces.append(prefix + current)
+    return pieces
+
+
+def split_update(text: str, max_chars: int) -> List[str]:
+    """
+    Split a long update into chunks that can be extracted independently.
+
+    The text is cut at message boundaries first. Messages longer than
+    max_chars are cut between sections (blank lines), and each of their
+    pieces repeats the message's From:/Date: header so the author and date
+    can still be found. Consecutive small pieces are packed together, so
+    the number of chunks stays close to len(text) / max_chars.
+
+    Args:
+        text: The update text.
+        max_chars: Largest chunk to produce, in characters.
+
+    Returns:
+        List[str]: Chunks in thread order; [text] if it is short enough.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces = []
+    for message in split_messages(text):
+        pieces.extend(_split_message(message, max_chars))
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += piece if not current or current.endswith("\n") else "\n" + piece
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def merge_extracted_tasks(chunk_tasks: List[List[Dict[str, Any]]],
+                          embed: Callable[[List[str]], Dict[str, Any]],
+                          is_recurring: Optional[Callable[[Dict[str, Any]], bool]] = None
+                          ) -> List[Dict[str, Any]]:
+    """
+    Merge tasks extracted from the chunks of one update, keeping one entry per task.
+
+    Tasks are compared the way insert_or_update_task compares a new task
+    with existing ones: cosine similarity of their embeddings, plus the
+    same-employee and same-category bonuses, minus the date penalty for
+    recurring tasks, against SIMILARITY_THRESHOLD (0.9 for recurring tasks).
+    Of each group of duplicates the one with the latest date is kept, so
+    the most recent status wins; on equal dates the one from the earlier
+    chunk is kept, as replies and forwards put the newest message first.
+
+    Args:
+        chunk_tasks: Validated tasks of each chunk, in chunk order.
+        embed: Function returning embeddings keyed by text, e.g. get_batch_embeddings.
+        is_recurring: Function telling whether a task is a training, meeting or recurring task.
+
+    Returns:
+        List[Dict[str, Any]]: Merged tasks, in the order each was first seen.
+    """
+    tasks = [task for chunk in chunk_tasks for task in chunk]
+    if len(tasks) < 2:
+        return tasks
+
+    try:
+        embeddings = embed([task["task"] for task in tasks]) or {}
+    except Exception as e:
+        print(f"Error embedding extracted tasks for merging: {e}")
+        embeddings = {}
+
+    # Cosine similarity of every pair; without an embedding a task only matches an identical description
+    known = np.array([task["task"] in embeddings for task in tasks])
+    similarity = np.zeros((len(tasks), len(tasks)))
+    if known.any():
+        vectors = np.asarray([embeddings[task["task"]] for task in tasks if task["task"] in embeddings],
+                             dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors /= norms
+        rows = np.flatnonzero(known)
+        similarity[np.ix_(rows, rows)] = vectors @ vectors.T
+    texts = [" ".join(task["task"].lower().split()) for task in tasks]
+
+    kept: List[int] = []  # Task chosen for each group so far
+    first_seen: List[int] = []  # Where each group first appeared, for ordering
+    for i, task in enumerate(tasks):
+        try:
+            recurring = bool(is_recurring and is_recurring(task))
+        except Exception:
+            recurring = False
+        threshold = 0.9 if recurring else SIMILARITY_THRESHOLD
+        best_score, best = 0.0, None
+        for slot, j in enumerate(kept):
+            other = tasks[j]
+            if known[i] and known[j]:
+                score = float(similarity[i, j])
+            else:
+                score = 1.0 if texts[i] == texts[j] else 0.0
+            score += SAME_EMPLOYEE_BONUS * (task.get("employee") == other.get("employee"))
+            score += SAME_CATEGORY_BONUS * (task.get("category") == other.get("category"))
+            if recurring and date_key(task.get("date")) != date_key(other.get("date")):
+                score -= RECURRING_DATE_PENALTY
+            if score > best_score:
+                best_score, best = score, slot
+
+        if best is None or best_score <= threshold:
+            kept.append(i)
+            first_seen.append(i)
+        elif (date_key(task.get("date")) or "") > (date_key(tasks[kept[best]].get("date")) or ""):
+            kept[best] = i
+
+    return [tasks[i] for _, i in sorted(zip(first_seen, kept))]
@@ -0,0 +1,347 @@
+"""
+Runtime metrics for Task Manager.
+Handles counters, gauges and histograms shared by every thread, rendered in
+the Prometheus text exposition format for the /metrics endpoint.
+"""
+import threading
+import time
+from bisect import bisect_left
+from operator import itemgetter
+from contextlib import contextmanager
+from typing import Dict, List, Any, Tuple, Callable, Iterable, Sequence
+
+# Latency buckets in seconds, wide enough for multi-second LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PREFIX = "taskmanager_"
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value for the text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    """Format label pairs as {a="1",b="2"}, or "" when there are none."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, using the text format's spelling of infinity."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class holding one value per combination of label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name, without the taskmanager_ prefix.
+            documentation: Help text shown by Prometheus.
+            labelnames: Names of the labels every sample must have.
+        """
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[Any, ...], Any] = {}
+        # Built once, so reading the label values of a sample is a single C call
+        if len(self.labelnames) > 1:
+            self._getter = itemgetter(*self.labelnames)
+        else:
+            self._getter = None
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Label values in declaration order."""
+        if self._getter is not None:
+            return self._getter(labels)
+        return (labels[self.labelnames[0]],) if self.labelnames else ()
+
+    def render(self) -> List[str]:
+        """Lines for this metric in the text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items(), key=lambda item: tuple(map(str, item[0])))
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """A value that only goes up, e.g. requests served."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount: How much to add.
+            **labels: Value for each label name.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, e.g. requests in flight."""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increase the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        """Decrease the gauge."""
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        """Set the gauge to a value."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        """Count the wrapped block as in progress while it runs."""
+        self.inc(1, **labels)
+        try:
+            yield
+        finally:
+            self.dec(1, **labels)
+
+
+class Histogram(_Metric):
+    """Observations counted into latency buckets, with their count and sum."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Metric name, without the taskmanager_ prefix.
+            documentation: Help text shown by Prometheus.
+            labelnames: Names of the labels every sample must have.
+            buckets: Upper bounds of the buckets, in increasing order.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: The observed value, e.g. seconds.
+            **labels: Value for each label name.
+        """
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (plus +Inf), count and sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0, 0.0]
+            state[0][index] += 1
+            state[1] += 1
+            state[2] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the wrapped block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        """Lines for this histogram in the text format, with cumulative buckets."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()),
+                           key=lambda item: tuple(map(str, item[0])))
+        for key, (counts, count, total) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """All metrics of the process, plus callbacks that report values only read at scrape time."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, Any], float]]]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        """Add a metric, returning the existing one if the name is taken."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create or get a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create or get a gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Create or get a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, Dict[str, Any], float]]]) -> None:
+        """
+        Add a callback run on every scrape.
+
+        Args:
+            collector: Function yielding (name, type, help, labels, value) samples,
+                       with names given without the taskmanager_ prefix.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The page served at /metrics.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+
+        families: Dict[str, Tuple[str, str, List[str]]] = {}
+        for collector in collectors:
+            try:
+                for name, kind, documentation, labels, value in collector():
+                    family = families.setdefault(PREFIX + name, (kind, documentation, []))
+                    family[2].append(f"{PREFIX}{name}{_format_labels(list(labels), list(labels.values()))} "
+                                     f"{_format_value(value)}")
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+        for name, (kind, documentation, samples) in families.items():
+            lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"] + samples
+
+        return "\n".join(lines) + "\n"
+
+
+# Create a default instance for easy imports
+registry = MetricsRegistry()
+
+# Incoming HTTP requests
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "Time to handle an HTTP request.", ("method", "route"))
+HTTP_REQUESTS_TOTAL = registry.counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests being handled.")
+
+# Outgoing calls to OpenAI and Notion, per endpoint
+CLIENT_REQUEST_SECONDS = registry.histogram(
+    "client_request_duration_seconds", "Time per request attempt to an external service.",
+    ("service", "endpoint"))
+CLIENT_REQUESTS_TOTAL = registry.counter(
+    "client_requests_total", "Request attempts to an external service.", ("service", "endpoint"))
+CLIENT_REQUEST_ERRORS_TOTAL = registry.counter(
+    "client_request_errors_total", "Request attempts that failed or returned an error status.",
+    ("service", "endpoint"))
+CLIENT_REQUEST_RETRIES_TOTAL = registry.counter(
+    "client_request_retries_total", "Request attempts that were retried.", ("service", "endpoint"))
+CLIENT_REQUESTS_IN_FLIGHT = registry.gauge(
+    "client_requests_in_flight", "Requests to an external service waiting for a response.", ("service",))
+
+# Embedding cache
+EMBEDDING_CACHE_LOOKUPS_TOTAL = registry.counter(
+    "embedding_cache_lookups_total", "Embedding cache lookups by result (hit or miss).", ("result",))
+EMBEDDING_CACHE_EVICTIONS_TOTAL = registry.counter(
+    "embedding_cache_evictions_total", "Embeddings pruned from the cache to stay under its size limit.")
+
+# Task extraction cache
+EXTRACTION_CACHE_LOOKUPS_TOTAL = registry.counter(
+    "extraction_cache_lookups_total", "Task extraction cache lookups by result (hit or miss).", ("result",))
+EXTRACTION_CACHE_EVICTIONS_TOTAL = registry.counter(
+    "extraction_cache_evictions_total", "Extraction results dropped for age or to stay under the size limit.")
+
+# Project name protection memo
+PROTECTION_MEMO_LOOKUPS_TOTAL = registry.counter(
+    "protection_memo_lookups_total", "Protect/unprotect memo lookups by operation and result (hit or miss).",
+    ("op", "result"))
+
+# Rule-based extraction fast path
+FAST_PATH_EXTRACTIONS_TOTAL = registry.counter(
+    "fast_path_extractions_total", "Updates tried on the rule-based extractor by result (hit, or why the model was used).",
+    ("result",))
+FAST_PATH_CONFIDENCE = registry.histogram(
+    "fast_path_confidence", "Confidence of rule-based extractions that found tasks.",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 1.0))
+
+# Email preprocessing
+EMAIL_PREPROCESS_TOKENS_TOTAL = registry.counter(
+    "email_preprocess_tokens_total", "Email body tokens kept, or removed as quoted, signature or footer.", ("part",))
+
+# Update processing and queued work
+PIPELINE_STAGE_SECONDS = registry.histogram(
+    "pipeline_stage_duration_seconds", "Time spent in each stage of processing an update.", ("stage",))
+UPDATES_IN_FLIGHT = registry.gauge(
+    "updates_in_flight", "Updates being processed.")
+QUEUE_DEPTH = registry.gauge(
+    "queue_depth", "Work items waiting in a queue.", ("queue",))
+
+
+def observe_client_request(service: str, endpoint: str, seconds: float,
+                           error: bool = False, retried: bool = False) -> None:
+    """
+    Record one request attempt to an external service.
+
+    Args:
+        service: "openai" or "notion".
+        endpoint: Endpoint name, e.g. "POST /v1/databases/{id}/query".
+        seconds: Time the attempt took.
+        error: Whether it failed or returned an error status.
+        retried: Whether it will be retried.
+    """
+    CLIENT_REQUEST_SECONDS.observe(seconds, service=service, endpoint=endpoint)
+    CLIENT_REQUESTS_TOTAL.inc(service=service, endpoint=endpoint)
+    if error:
+        CLIENT_REQUEST_ERRORS_TOTAL.inc(service=service, endpoint=endpoint)
+    if retried:
+        CLIENT_REQUEST_RETRIES_TOTAL.inc(service=service, endpoint=endpoint)
+
+
+def render_metrics() -> str:
+    """Render the default registry in the Prometheus text format."""
+    return registry.render()
@@ -2,12 +2,12 @@
 Notion API integration for Task Manager.
 Handles all interactions with Notion databases.
 """
-from notion_client import Client
 from datetime import datetime, timedelta
 from dateutil import parser
 import pandas as pd
 import traceback
 
+from core.adapters.notion_transport import get_notion_client
 from config import (
     NOTION_TOKEN, 
     NOTION_DATABASE_ID, 
@@ -16,8 +16,8 @@ from config import (
     DAYS_THRESHOLD
 )
 
-# Initialize Notion client
-notion = Client(auth=NOTION_TOKEN)
+# Use the process-wide pooled Notion client
+notion = get_notion_client(NOTION_TOKEN)
 database_id = NOTION_DATABASE_ID
 feedback_db_id = NOTION_FEEDBACK_DB_ID
 
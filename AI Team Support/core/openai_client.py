@@ -9,7 +9,9 @@ import traceback
 from hashlib import md5
 from datetime import datetime
 import numpy as np
-from openai import OpenAI
+from core.adapters.openai_transport import get_openai_client
+from core.tracing import traced, annotate
+from core.metrics import EMBEDDING_CACHE_LOOKUPS_TOTAL, EMBEDDING_CACHE_EVICTIONS_TOTAL
 
 from config import (
     OPENAI_API_KEY, 
@@ -22,7 +24,7 @@ from config import (
 )
 
 # Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+client = get_openai_client(OPENAI_API_KEY)
 
 def setup_embedding_cache():
     """Initialize the SQLite-based embedding cache."""
@@ -77,6 +79,7 @@ def get_cached_embedding(text):
     result = cursor.fetchone()
     
     if result:
+        EMBEDDING_CACHE_LOOKUPS_TOTAL.inc(result="hit")
         # Update last_used timestamp
         cursor.execute('UPDATE embeddings SET last_used = ? WHERE text_hash = ?', 
                       (datetime.now().isoformat(), text_hash))
@@ -86,6 +89,7 @@ def get_cached_embedding(text):
         return embedding
 
     # Cache miss - get from OpenAI
+    EMBEDDING_CACHE_LOOKUPS_TOTAL.inc(result="miss")
     try:
         response = client.embeddings.create(
             input=[text],
@@ -110,6 +114,7 @@ def get_cached_embedding(text):
                 'DELETE FROM embeddings WHERE text_hash IN (SELECT text_hash FROM embeddings ORDER BY last_used ASC LIMIT ?)',
                 (prune_count,)
             )
+            EMBEDDING_CACHE_EVICTIONS_TOTAL.inc(prune_count)
             debug_print(f"Pruned {prune_count} entries from embedding cache")
         
         conn.commit()
@@ -120,6 +125,7 @@ def get_cached_embedding(text):
         debug_print(f"Error getting embedding: {e}")
         return None
 
+@traced("openai.embeddings")
 def get_batch_embeddings(texts):
     """Get embeddings for multiple texts, using cache where possible."""
     if not texts:
@@ -154,6 +160,9 @@ def get_batch_embeddings(texts):
             text_hashes_to_request.append(text_hash)
     
     conn.commit()
+    annotate(texts=len(hash_lookup), cache_misses=len(texts_to_request))
+    EMBEDDING_CACHE_LOOKUPS_TOTAL.inc(len(hash_lookup) - len(texts_to_request), result="hit")
+    EMBEDDING_CACHE_LOOKUPS_TOTAL.inc(len(texts_to_request), result="miss")
 
     # Only call API if we have texts not in cache
     if texts_to_request:
@@ -193,6 +202,7 @@ def get_batch_embeddings(texts):
                     'DELETE FROM embeddings WHERE text_hash IN (SELECT text_hash FROM embeddings ORDER BY last_used ASC LIMIT ?)',
                     (prune_count,)
                 )
+                EMBEDDING_CACHE_EVICTIONS_TOTAL.inc(prune_count)
                 debug_print(f"Pruned {prune_count} entries from embedding cache")
             
             conn.commit()
@@ -204,6 +214,7 @@ def get_batch_embeddings(texts):
     # Return embeddings mapped to original texts
     return {hash_lookup[h]: embeddings[h] for h in embeddings}
 
+@traced("coaching_insight")
 def get_coaching_insight(person_name, tasks, recent_tasks, peer_feedback):
     """Generate coaching insights using OpenAI."""
     # Calculate basic statistics for the AI
@@ -215,7 +226,7 @@ def get_coaching_insight(person_name, tasks, recent_tasks, peer_feedback):
                 "total_tasks": len(recent_tasks),
                 "completed_tasks": len(completed_tasks),
                 "completion_rate": f"{len(completed_tasks) / len(recent_tasks):.1%}" if len(recent_tasks) > 0 else "0%",
-                "category_counts": recent_tasks['category'].value_counts().to_dict(),
+                "category_counts": recent_tasks['category'].value_counts().loc[lambda counts: counts > 0].to_dict(),
                 "date_range": (recent_tasks['date'].max() - recent_tasks['date'].min()).days + 1 if not recent_tasks.empty else 0
             }
     except Exception as e:
@@ -277,11 +288,11 @@ def get_project_insight(selected_category, filtered_tasks):
                 date_range = 0
 
             # Calculate team distribution
-            team_counts = filtered_tasks['employee'].value_counts().to_dict()
+            team_counts = filtered_tasks['employee'].value_counts().loc[lambda counts: counts > 0].to_dict()
 
             basic_stats = {
                 "total_tasks": len(filtered_tasks),
-                "status_counts": filtered_tasks['status'].value_counts().to_dict(),
+                "status_counts": filtered_tasks['status'].value_counts().loc[lambda counts: counts > 0].to_dict(),
                 "team_distribution": team_counts,
                 "date_range": date_range
             }
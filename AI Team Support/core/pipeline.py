@@ -0,0 +1,258 @@
+"""
+Update processing pipeline for Task Manager.
+Handles the flow from a freeform update to stored tasks and coaching insights.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterator
+
+import pandas as pd
+
+from config import DEBUG_MODE
+from core import fetch_notion_tasks, fetch_peer_feedback
+from core.task_extractor import extract_tasks_from_update, stream_tasks_from_update
+from core.task_processor import insert_or_update_task
+from core.openai_client import get_coaching_insight
+from core.tracing import span, propagate
+from core.metrics import PIPELINE_STAGE_SECONDS, UPDATES_IN_FLIGHT
+from plugins import plugin_manager
+
+# Pipeline stages, in the order they run
+STAGES = ("extract", "fetch", "process", "feedback", "coaching")
+
+
+def debug_print(message):
+    """Print debug messages if DEBUG_MODE is True."""
+    if DEBUG_MODE:
+        print(message)
+
+
+@contextmanager
+def _timed(timings: Optional[Dict[str, float]], stage: str, observe: bool = True):
+    """
+    Run a block as a pipeline span and record its wall time in metrics and timings[stage].
+
+    Args:
+        timings: Dict the time is added to, if any.
+        stage: Stage name from STAGES.
+        observe: Whether to record the block in the stage metric; stages
+                 run in several pieces are observed once when they end instead.
+    """
+    start = time.perf_counter()
+    try:
+        with span(f"pipeline.{stage}"):
+            yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if observe:
+            PIPELINE_STAGE_SECONDS.observe(elapsed, stage=stage)
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def _format_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of a task shown to the user."""
+    return {
+        'task': task['task'],
+        'status': task['status'],
+        'employee': task.get('employee', ''),
+        'category': task.get('category', '')
+    }
+
+
+def process_update(update_text: str, log_output: Optional[List[str]] = None,
+                   timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Process a freeform update end to end.
+
+    Extracts the tasks, fetches the existing tasks from Notion, inserts or
+    updates each task, then generates coaching insights for the author.
+
+    Args:
+        update_text: The update as written by the employee.
+        log_output: List that progress messages are appended to.
+        timings: Dict that receives the wall time in seconds of each stage in STAGES.
+
+    Returns:
+        Dict[str, Any]: "success", and either "message" or the extracted "tasks"
+                        and "coaching" text.
+    """
+    with UPDATES_IN_FLIGHT.track_inprogress():
+        return _process_update(update_text, log_output, timings)
+
+
+def _process_update(update_text: str, log_output: Optional[List[str]],
+                    timings: Optional[Dict[str, float]]) -> Dict[str, Any]:
+    """Run the pipeline stages for process_update."""
+    if log_output is None:
+        log_output = []
+    log_output.append("⏳ Processing your update...")
+
+    # Extract tasks from update text
+    with _timed(timings, "extract"):
+        tasks = extract_tasks_from_update(update_text)
+
+    if not tasks:
+        return {
+            'success': False,
+            'message': 'No tasks could be extracted from your update. Please check your input and try again.'
+        }
+
+    log_output.append(f"✅ Extracted {len(tasks)} tasks from your update")
+
+    # Get existing tasks from Notion
+    log_output.append("⏳ Fetching existing tasks from Notion...")
+    with _timed(timings, "fetch"):
+        existing_tasks = fetch_notion_tasks()
+    log_output.append(f"✅ Fetched {len(existing_tasks)} existing tasks")
+
+    # Match each task against the existing ones and write it to Notion
+    log_output.append("⏳ Processing tasks...")
+    with _timed(timings, "process"):
+        security_plugin = plugin_manager.get_plugin('ProjectProtectionPlugin')
+        for task in tasks:
+            if DEBUG_MODE and security_plugin and security_plugin.enabled:
+                protected_task = security_plugin.protect_task(task.copy())
+                debug_print(f"Original category: {task.get('category', 'None')}")
+                debug_print(f"Protected category: {protected_task.get('category', 'None')}")
+
+            insert_or_update_task(task, existing_tasks, log_output)
+
+    return _finish_update(tasks, existing_tasks, log_output, timings)
+
+
+def _finish_update(tasks: List[Dict[str, Any]], existing_tasks, log_output: List[str],
+                   timings: Optional[Dict[str, float]]) -> Dict[str, Any]:
+    """Fetch peer feedback and generate coaching insights once the tasks are stored."""
+    person_name = ""
+    if isinstance(tasks[0], dict) and "employee" in tasks[0]:
+        person_name = tasks[0].get("employee", "")
+
+    peer_feedback = []
+    with _timed(timings, "feedback"):
+        if person_name:
+            try:
+                peer_feedback = fetch_peer_feedback(person_name)
+                log_output.append(f"✅ Fetched {len(peer_feedback)} peer feedback entries")
+            except Exception as e:
+                log_output.append(f"⚠️ Error fetching peer feedback: {e}")
+
+    # Generate coaching insights from the update and the last two weeks of tasks
+    log_output.append("⏳ Generating coaching insights...")
+    with _timed(timings, "coaching"):
+        recent_tasks = pd.DataFrame()
+        try:
+            recent_tasks = existing_tasks[existing_tasks['date'] >= datetime.now() - timedelta(days=14)]
+            log_output.append(f"✅ Retrieved {len(recent_tasks)} recent tasks for analysis")
+        except Exception as e:
+            log_output.append(f"⚠️ Error retrieving recent tasks: {e}")
+
+        try:
+            reflection = get_coaching_insight(person_name, tasks, recent_tasks, peer_feedback)
+            log_output.append("✅ Generated coaching insights")
+        except Exception as e:
+            log_output.append(f"⚠️ Error generating coaching insights: {e}")
+            reflection = "Unable to generate coaching insights at this time."
+
+    # Format tasks for display
+    tasks_formatted = [_format_task(task) for task in tasks
+                       if isinstance(task, dict) and "task" in task and "status" in task]
+
+    return {
+        'success': True,
+        'tasks': tasks_formatted,
+        'coaching': reflection
+    }
+
+
+def stream_update(update_text: str, log_output: Optional[List[str]] = None,
+                  timings: Optional[Dict[str, float]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Process a freeform update, reporting each task as soon as it is stored.
+
+    Tasks are read from the model response while it is still being
+    written, and each one is matched and written to Notion right away.
+    Existing tasks are fetched on another thread meanwhile, so the fetch
+    overlaps the model call instead of following it. Updates long enough
+    to be extracted in chunks are only available once all chunks are
+    merged, and then arrive together.
+
+    Args:
+        update_text: The update as written by the employee.
+        log_output: List that progress messages are appended to.
+        timings: Dict that receives the wall time in seconds of each stage in
+                 STAGES. Stages overlap, so "fetch" is the time spent waiting
+                 for the fetch and "extract" the time spent waiting for the model.
+
+    Yields:
+        Dict[str, Any]: {"event": "task", "task": ...} for each stored task, then
+                        {"event": "result", ...} with the same fields process_update returns.
+    """
+    with UPDATES_IN_FLIGHT.track_inprogress():
+        yield from _stream_update(update_text, [] if log_output is None else log_output,
+                                  {} if timings is None else timings)
+
+
+def _report_unused_fetch(future) -> None:
+    """Report the error of a task fetch whose result was never needed."""
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Error fetching existing tasks: {future.exception()}")
+
+
+def _stream_update(update_text: str, log_output: List[str],
+                   timings: Dict[str, float]) -> Iterator[Dict[str, Any]]:
+    """Run the pipeline stages for stream_update."""
+    log_output.append("⏳ Processing your update...")
+
+    # Get existing tasks from Notion while the model is still writing
+    log_output.append("⏳ Fetching existing tasks from Notion...")
+    fetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fetch-tasks")
+    fetching = fetch_pool.submit(propagate(fetch_notion_tasks))
+    fetch_pool.shutdown(wait=False)
+
+    tasks = []
+    existing_tasks = None
+    extracted = stream_tasks_from_update(update_text)
+    try:
+        while True:
+            with _timed(timings, "extract", observe=False):
+                task = next(extracted, None)
+            if task is None:
+                break
+            tasks.append(task)
+
+            if existing_tasks is None:
+                with _timed(timings, "fetch", observe=False):
+                    existing_tasks = fetching.result()
+                log_output.append(f"✅ Fetched {len(existing_tasks)} existing tasks")
+                log_output.append("⏳ Processing tasks...")
+
+            with _timed(timings, "process", observe=False):
+                insert_or_update_task(task, existing_tasks, log_output)
+            yield {'event': 'task', 'task': _format_task(task)}
+    except ValueError as e:
+        # Keep the tasks already stored if the response breaks off part way
+        if not tasks:
+            raise
+        log_output.append(f"⚠️ Task extraction stopped early: {e}")
+    finally:
+        # No task arrived (or the caller stopped early): drop the fetch, or still surface its error
+        if existing_tasks is None and not fetching.cancel():
+            fetching.add_done_callback(_report_unused_fetch)
+        for stage in ("extract", "fetch", "process"):
+            if stage in timings:
+                PIPELINE_STAGE_SECONDS.observe(timings[stage], stage=stage)
+
+    if not tasks:
+        yield {
+            'event': 'result',
+            'success': False,
+            'message': 'No tasks could be extracted from your update. Please check your input and try again.'
+        }
+        return
+
+    log_output.append(f"✅ Extracted {len(tasks)} tasks from your update")
+    result = _finish_update(tasks, existing_tasks, log_output, timings)
+    yield dict(result, event='result')
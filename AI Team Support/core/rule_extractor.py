@@ -0,0 +1,418 @@
+"""
+Rule-based task extraction for Task Manager.
+Handles reading well-structured updates (name, date, project headers and
+bullet lists) without a model call, with a confidence score deciding when
+the LLM is still needed.
+"""
+import re
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
+
+from dateutil import parser as date_parser
+
+from config import FAST_PATH_MIN_CONFIDENCE, DEBUG_MODE
+from core.email_preprocessor import SIGN_OFF
+from core.extraction_chunks import split_messages
+from core.metrics import registry, FAST_PATH_EXTRACTIONS_TOTAL, FAST_PATH_CONFIDENCE
+
+BULLET = re.compile(r"^(?P<indent>\s*)(?:[-*•‣◦]|\d{1,2}[.)])\s+(?P<text>.+)$")
+CHECKBOX = re.compile(r"^\[(?P<mark>[ xX✓])\]\s*")
+HEADER_FIELD = re.compile(r"^(?P<field>from|date|sent|subject|to|cc):\s*(?P<value>.*)$", re.IGNORECASE)
+SECTION = re.compile(r"^(?:#{1,6}\s*)?(?:\*\*|__)?(?P<title>[^:*_#][^:]{0,60}?)(?:\*\*|__)?\s*:?\s*(?:\*\*|__)?$")
+GREETING = re.compile(r"^(?:hi|hello|hey|dear|good (?:morning|afternoon|evening))\b.{0,40}$", re.IGNORECASE)
+PREPROCESSOR_NOTE = re.compile(r"^\[.*removed.*\]$", re.IGNORECASE)
+NAME = re.compile(r"^[A-Z][\w'\-.]*(?:\s+[A-Z][\w'\-.]*){1,3}$")
+NOT_NAME_WORDS = {"update", "updates", "report", "status", "daily", "weekly", "project", "summary",
+                  "tasks", "notes", "team", "progress", "plan", "hours", "breakdown"}
+DATE_LIKE = re.compile(r"\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}/\d{2,4}|"
+                       r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{1,2}\b|"
+                       r"\b\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)", re.IGNORECASE)
+
+# Sections whose title gives the status of their bullets rather than a project
+STATUS_SECTIONS = (
+    (re.compile(r"\b(?:blocked|blockers?|impediments?)\b", re.IGNORECASE), "Blocked"),
+    (re.compile(r"\b(?:in progress|ongoing|working on|wip)\b", re.IGNORECASE), "In Progress"),
+    (re.compile(r"\b(?:planned|plans?|next(?: steps| week)?|to ?do|upcoming|tomorrow|pending)\b", re.IGNORECASE),
+     "Pending"),
+    (re.compile(r"\b(?:completed?|done|finished|accomplished|achievements?)\b", re.IGNORECASE), "Completed"),
+)
+# Sections that hold no tasks, like the model prompt's "Hours Breakdown"
+SKIPPED_SECTION = re.compile(r"\b(?:hours|timesheet|time spent|time log)\b", re.IGNORECASE)
+# Lines introducing a list rather than naming a project ("Today I worked on the following:")
+INTRO = re.compile(r"\b(?:following|below|today|yesterday|this week|these|here|i|we)\b", re.IGNORECASE)
+
+# Status cues in a task line, checked in this order; the first status found wins
+STATUS_CUES = (
+    ("Blocked", re.compile(
+        r"\b(?:blocked|waiting (?:for|on)|awaiting|on hold|stuck|pending (?:approval|feedback|review|input)|"
+        r"depends on|can'?t proceed)\b", re.IGNORECASE)),
+    ("In Progress", re.compile(
+        r"\b(?:started|starting|working on|in progress|ongoing|continu(?:ed|ing|e)|will (?:finish|complete)|"
+        r"wip|partially|halfway|still)\b", re.IGNORECASE)),
+    ("Pending", re.compile(
+        r"^(?:need(?:s)? to|to ?do|will|plan(?:ning)? to|going to|should|must|schedule|tbd)\b|"
+        r"\b(?:next week|tomorrow|not (?:yet )?started)\b", re.IGNORECASE)),
+    ("Completed", re.compile(
+        r"\b(?:completed|finished|done|delivered|sent|submitted|fixed|resolved|merged|deployed|closed|"
+        r"shipped|published|approved)\b", re.IGNORECASE)),
+)
+# Negated cues ("Did not finish", "Haven't started") read as the opposite status, so the model decides
+NEGATION = re.compile(r"\b(?:not|never|yet to|no longer)\b|n't\b", re.IGNORECASE)
+IRREGULAR_PAST = {"built", "wrote", "sent", "met", "made", "ran", "did", "led", "took", "gave", "found", "held",
+                  "got", "put", "read", "spoke", "taught", "brought", "bought", "chose", "drew", "kept", "left",
+                  "paid", "said", "sold", "spent", "told", "won", "set", "began"}
+
+# Confidence of a task's status by how it was found
+EXPLICIT_CONFIDENCE = 1.0  # Checkbox or status section
+KEYWORD_CONFIDENCE = 0.95  # One status keyword in the line
+TENSE_CONFIDENCE = 0.85  # First word in the past tense or an -ing form
+CONFLICT_CONFIDENCE = 0.5  # Cues for more than one status
+UNKNOWN_CONFIDENCE = 0.4  # No cue at all
+SHORT_TASK_WORDS = 3  # Fewer words than this is too vague to take without the model
+NO_DATE_FACTOR = 0.7  # Without a date the model is better at finding one
+
+
+def debug_print(message):
+    """Print debug messages if DEBUG_MODE is True."""
+    if DEBUG_MODE:
+        print(message)
+
+
+def infer_status(text: str, section_status: Optional[str] = None) -> Tuple[str, float]:
+    """
+    Infer the status of a task line from its keywords and tense.
+
+    Args:
+        text: The task line, without its bullet.
+        section_status: Status given by the section the line is in, if any.
+
+    Returns:
+        Tuple[str, float]: The status and the confidence in it.
+    """
+    status, confidence = _status_cues(text, section_status)
+    if NEGATION.search(text):
+        confidence = min(confidence, CONFLICT_CONFIDENCE)
+    return status, confidence
+
+
+def _status_cues(text: str, section_status: Optional[str]) -> Tuple[str, float]:
+    """Status and confidence from the cues in a task line, ignoring negation."""
+    found = [status for status, cue in STATUS_CUES if cue.search(text)]
+    # A leading verb ("Fixed the build, still testing it") names the work more than its status
+    later = [status for status, cue in STATUS_CUES if any(match.start() > 0 for match in cue.finditer(text))]
+    if len(set(found)) > 1:
+        found = later or found
+    if section_status:
+        if later and later[0] != section_status:
+            return later[0], CONFLICT_CONFIDENCE
+        return section_status, EXPLICIT_CONFIDENCE
+
+    first = text.split(None, 1)[0].lower().strip(",.;:") if text.strip() else ""
+    if not found:
+        if first.endswith("ed") or first in IRREGULAR_PAST:
+            found = ["In Progress" if first == "began" else "Completed"]
+            confidence = TENSE_CONFIDENCE
+        elif first.endswith("ing"):
+            found = ["In Progress"]
+            confidence = TENSE_CONFIDENCE
+        else:
+            confidence = UNKNOWN_CONFIDENCE
+    else:
+        confidence = KEYWORD_CONFIDENCE
+    if not found:
+        return "Pending", confidence
+    if len(set(found)) > 1:
+        return found[0], CONFLICT_CONFIDENCE
+    return found[0], confidence
+
+
+def _parse_date(value: str) -> Optional[str]:
+    """A YYYY-MM-DD date if the text is a date, else None."""
+    if not DATE_LIKE.search(value):
+        return None
+    try:
+        return date_parser.parse(value, fuzzy=True).strftime("%Y-%m-%d")
+    except (ValueError, OverflowError):
+        return None
+
+
+def _is_name(line: str) -> bool:
+    """Whether a line looks like a person's name, e.g. "John Smith"."""
+    return bool(NAME.match(line)) and not any(word.lower() in NOT_NAME_WORDS for word in line.split())
+
+
+def _name_key(name: str) -> str:
+    """A name case-folded with whitespace collapsed, for comparing names."""
+    return " ".join(name.casefold().split())
+
+
+def _known_employees() -> List[str]:
+    """Employees with tasks in Notion, from the task registry."""
+    # Imported here as core loads the Notion adapter, which loads the plugins
+    from core import list_all_employees
+    return list_all_employees()
+
+
+def _clean_name(value: str) -> str:
+    """Name part of a From: value such as '"Smith, John" <john@x.com>'."""
+    name = value.split("<")[0].strip().strip('"\'')
+    if "," in name:
+        last, first = [part.strip() for part in name.split(",", 1)]
+        name = f"{first} {last}"
+    return name
+
+
+class RuleBasedExtractor:
+    """
+    Deterministic extractor for updates in the format shown in the help text.
+
+    An update such as:
+
+        John Smith
+        April 12, 2025
+
+        Project Alpha:
+        - Completed the design documentation
+        - Started working on the prototype, will finish by Friday
+
+    is read line by line: the name and date from the first lines (or From:
+    and Date: headers), the category from each section header, and one task
+    per bullet, with its status inferred from status sections, checkboxes,
+    keywords and tense. The confidence of the result is that of its least
+    certain task, scaled down by the share of text that was not recognized;
+    results below min_confidence are left to the model.
+
+    A name on the first line is only taken as the employee if it is a known
+    employee or agrees with the From: header; a title such as "Client
+    Onboarding Recap" looks the same, and only the model can tell them apart.
+    """
+
+    def __init__(self, min_confidence: float = FAST_PATH_MIN_CONFIDENCE,
+                 known_employees: Optional[Callable[[], Iterable[str]]] = None):
+        """
+        Initialize the extractor.
+
+        Args:
+            min_confidence: Lowest confidence at which tasks are returned without the model.
+            known_employees: Function returning the known employee names.
+                             If None, uses the task registry.
+        """
+        self.min_confidence = min_confidence
+        self._known_employees = known_employees or _known_employees
+        self._lock = threading.Lock()
+        self.stats = {"attempts": 0, "hits": 0, "fallbacks": {}}
+
+    def parse(self, text: str) -> Tuple[List[Dict[str, Any]], float, str]:
+        """
+        Read the tasks of an update and score how sure the rules are of them.
+
+        Args:
+            text: The update text.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], float, str]: The tasks, the confidence
+                (0 to 1), and "ok" or the reason the update doesn't fit the rules.
+        """
+        if len(split_messages(text)) > 1:
+            return [], 0.0, "thread"
+
+        named = sender = date = None
+        category = "Uncategorized"
+        section_status = None
+        skipping = False
+        in_body = False  # Past the name/date lines at the top
+        after_sign_off = False
+        tasks: List[Dict[str, Any]] = []
+        confidences: List[float] = []
+        seen: Dict[str, int] = {}  # Lowercased task text -> index in tasks
+        recognized = unrecognized = 0
+
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            if not line or PREPROCESSOR_NOTE.match(line):
+                continue
+
+            field = HEADER_FIELD.match(line)
+            if field and not tasks:
+                name, value = field.group("field").lower(), field.group("value")
+                if name == "from":
+                    sender = _clean_name(value)
+                elif name in ("date", "sent"):
+                    date = _parse_date(value) or date
+                continue
+
+            if after_sign_off:
+                continue
+            if SIGN_OFF.match(line):
+                after_sign_off = True
+                continue
+
+            bullet = BULLET.match(raw_line)
+            if bullet:
+                in_body = True
+                if skipping:
+                    continue
+                task_text = bullet.group("text").strip()
+                status, confidence = infer_status(task_text, section_status)
+                checkbox = CHECKBOX.match(task_text)
+                if checkbox:
+                    task_text = task_text[checkbox.end():]
+                    status = "Pending" if checkbox.group("mark") == " " else "Completed"
+                    confidence = EXPLICIT_CONFIDENCE
+                task_text = task_text.rstrip(" .;")
+                if len(task_text.split()) < SHORT_TASK_WORDS:
+                    confidence = min(confidence, CONFLICT_CONFIDENCE)
+                if len(bullet.group("indent").expandtabs(4)) >= 2:
+                    # A sub-bullet may be detail of the task above it
+                    confidence = min(confidence, TENSE_CONFIDENCE)
+                recognized += len(line)
+                key = task_text.lower()
+                if key in seen:
+                    # Listed under two sections ("Planned:" and "Completed:"); the prompt
+                    # allows one entry per task, and a completed one wins
+                    index = seen[key]
+                    if status == "Completed" or tasks[index]["status"] == "Completed":
+                        tasks[index]["status"] = "Completed"
+                        confidences[index] = min(confidences[index], confidence)
+                    elif status != tasks[index]["status"]:
+                        confidences[index] = min(confidences[index], CONFLICT_CONFIDENCE)
+                    continue
+                seen[key] = len(tasks)
+                tasks.append({"task": task_text, "status": status, "category": category})
+                confidences.append(confidence)
+                continue
+
+            if not in_body and not tasks:
+                if named is None and _is_name(line):
+                    named = line
+                    continue
+                parsed_date = _parse_date(line) if len(line) <= 40 else None
+                if parsed_date:
+                    date = parsed_date
+                    continue
+                if GREETING.match(line):
+                    continue
+
+            section = SECTION.match(line)
+            if (section and line.endswith((":", "**", "__"))) or line.startswith("#"):
+                in_body = True
+                title = section.group("title").strip() if section else line.lstrip("#").strip()
+                skipping = bool(SKIPPED_SECTION.search(title))
+                matched = [status for pattern, status in STATUS_SECTIONS if pattern.search(title)]
+                if matched:
+                    section_status = matched[0]
+                elif INTRO.search(title) or len(title.split()) > 5:
+                    section_status = None
+                else:
+                    category, section_status = title, None
+                recognized += len(line)
+                continue
+
+            if GREETING.match(line):
+                continue
+            # Prose the rules can't read may hold tasks only the model would find
+            unrecognized += len(line)
+
+        if not tasks:
+            return [], 0.0, "no_tasks"
+        employee = self._resolve_employee(named, sender)
+        if not employee:
+            return tasks, 0.0, "no_employee"
+
+        confidence = min(confidences) * recognized / (recognized + unrecognized)
+        if sender and employee != sender and sender.lower() not in employee.lower():
+            # Sent on someone else's behalf; the model attributes tasks better
+            confidence *= CONFLICT_CONFIDENCE
+        if not date:
+            confidence *= NO_DATE_FACTOR
+            date = datetime.now().strftime("%Y-%m-%d")
+
+        for task in tasks:
+            task["employee"] = employee
+            task["date"] = date
+        return tasks, confidence, "ok" if confidence >= self.min_confidence else "low_confidence"
+
+    def _resolve_employee(self, named: Optional[str], sender: Optional[str]) -> Optional[str]:
+        """
+        The employee of an update, or None if the rules can't be sure of it.
+
+        Args:
+            named: Name-like first line of the update, if any.
+            sender: Name from the From: header, if any.
+
+        Returns:
+            Optional[str]: A known employee's name as registered, the name
+                confirmed by the sender, or the sender if no name was given.
+        """
+        if not named:
+            return sender
+        try:
+            known = {_name_key(name): name for name in self._known_employees() if name}
+        except Exception as e:
+            print(f"Error loading known employees: {e}")
+            known = {}
+        if _name_key(named) in known:
+            return known[_name_key(named)]
+        if sender and sender.lower() in named.lower():
+            return named
+        return None
+
+    def try_extract(self, text: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract tasks with the rules if they are confident enough.
+
+        Args:
+            text: The update text.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The tasks, or None if the model should extract them.
+        """
+        try:
+            tasks, confidence, reason = self.parse(text)
+        except Exception as e:
+            print(f"Error in rule-based extraction: {e}")
+            tasks, confidence, reason = [], 0.0, "error"
+
+        hit = reason == "ok"
+        with self._lock:
+            self.stats["attempts"] += 1
+            if hit:
+                self.stats["hits"] += 1
+            else:
+                self.stats["fallbacks"][reason] = self.stats["fallbacks"].get(reason, 0) + 1
+        FAST_PATH_EXTRACTIONS_TOTAL.inc(result="hit" if hit else reason)
+        if tasks:
+            FAST_PATH_CONFIDENCE.observe(confidence)
+
+        debug_print(f"Rule-based extraction: {len(tasks)} tasks, confidence {confidence:.2f} ({reason})")
+        if not hit:
+            return None
+        print(f"Extracted {len(tasks)} tasks with rules (confidence {confidence:.2f}); skipping the model")
+        return tasks
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Fast-path counts since start-up, for tuning min_confidence.
+
+        Returns:
+            Dict[str, Any]: attempts, hits, hit_rate and fallbacks by reason.
+        """
+        with self._lock:
+            stats = {"attempts": self.stats["attempts"], "hits": self.stats["hits"],
+                     "fallbacks": dict(self.stats["fallbacks"])}
+        stats["hit_rate"] = stats["hits"] / stats["attempts"] if stats["attempts"] else 0.0
+        return stats
+
+
+# Create a default instance for easy imports
+rule_extractor = RuleBasedExtractor()
+
+
+def _collect_fast_path():
+    """Yield the fast-path hit rate for /metrics."""
+    yield ("fast_path_hit_ratio", "gauge", "Share of updates extracted by rules without a model call.",
+           {}, rule_extractor.get_stats()["hit_rate"])
+
+
+registry.register_collector(_collect_fast_path)
@@ -4,9 +4,73 @@ Handles tokenization and protection of sensitive information.
 This version does not require the cryptography package.
 """
 import os
+import re
 import json
 import hashlib
-from typing import Dict, List, Any, Optional, Union, Tuple
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterable
+
+import pandas as pd
+
+from config import PROTECTION_MEMO_ENTRIES, PROTECTION_MEMO_MAX_CHARS
+from core.metrics import PROTECTION_MEMO_LOOKUPS_TOTAL
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking only covers threads of this process
+    fcntl = None
+
+# Journal lines after which the journal is folded into the snapshot file
+JOURNAL_COMPACT_ENTRIES = 1000
+
+# Any token generated by _generate_token, including collision suffixes
+TOKEN_PATTERN = re.compile(r"(?<!\w)PROJ_[0-9a-f]{8}(?:_[0-9a-f]{4})*(?![0-9a-f])")
+
+
+def _trie_pattern(words: Iterable[str]) -> Optional[str]:
+    """
+    Build a regex matching any of the words, factored as a prefix trie.
+    
+    Shared prefixes are matched once, so the regex engine does work
+    proportional to the text rather than to the number of words. Optional
+    endings are greedy, so the longest word is tried first.
+    
+    Args:
+        words: Literal strings to match.
+        
+    Returns:
+        Optional[str]: The pattern, or None if there are no words.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # Marks the end of a word
+    
+    def build(node: Dict[str, Any]) -> Optional[str]:
+        branches = []
+        leaves = []
+        for char in sorted(key for key in node if key):
+            rest = build(node[char])
+            if rest is None:
+                leaves.append(re.escape(char))
+            else:
+                branches.append(re.escape(char) + rest)
+        if leaves:
+            branches.append(leaves[0] if len(leaves) == 1 else "[" + "".join(leaves) + "]")
+        if not branches:
+            return None
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            pattern = "(?:" + pattern + ")?"
+        return pattern
+    
+    return build(trie)
 
 class SecurityManager:
     """
@@ -14,46 +78,205 @@ class SecurityManager:
     
     This class provides functionality to protect sensitive information
     like project names before they're sent to external services.
+    
+    Mappings are shared by every process using the same token file. The
+    file holds a compacted snapshot; new tokens are appended to a journal
+    beside it under a file lock, and each process reads only the journal
+    lines it has not seen yet.
     """
     
-    def __init__(self, token_file_path: str = "security_tokens.json"):
+    def __init__(self, token_file_path: str = "security_tokens.json", memo_entries: int = PROTECTION_MEMO_ENTRIES):
         """
         Initialize the security manager.
         
         Args:
             token_file_path: Path to the token mapping file.
+            memo_entries: Protect/unprotect results to remember; 0 disables the memo.
         """
         self.token_file_path = token_file_path
+        self.journal_path = token_file_path + ".journal"
+        self.lock_path = token_file_path + ".lock"
         self.token_map = {}
         self.reverse_map = {}
         
+        # Bumped whenever the mappings change, so derived data can be rebuilt lazily
+        self.version = 0
+        self._matcher_lock = threading.Lock()
+        self._project_regex = None
+        self._project_regex_version = -1
+        
+        # Recent protect/unprotect results, valid for one mappings version
+        self.memo_entries = memo_entries
+        self._memo = OrderedDict()
+        self._memo_version = -1
+        self._memo_lock = threading.Lock()
+        self._memo_stats = {op: {'hits': 0, 'misses': 0, 'evictions': 0} for op in ('protect', 'unprotect')}
+        
+        # How far into which journal file this process has read
+        self._lock = threading.RLock()
+        self._journal_inode = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._compacting = False
+        
         # Load any existing token mappings
         self._load_tokens()
     
+    @contextmanager
+    def _file_lock(self, exclusive: bool = True):
+        """Hold the token file lock shared by all processes (in-process only where fcntl is unavailable)."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _add_mapping(self, project_name: str, token: str) -> bool:
+        """Record a mapping unless the name already has a token; the first entry for a name wins."""
+        if not project_name or not token or project_name in self.token_map:
+            return False
+        self.token_map[project_name] = token
+        self.reverse_map[token] = project_name
+        return True
+    
     def _load_tokens(self) -> None:
-        """Load token mappings from file if it exists."""
+        """Load the snapshot and the journal from scratch."""
+        try:
+            with self._file_lock(exclusive=False):
+                self._load_snapshot()
+                self._journal_inode = None
+                self._journal_offset = 0
+                self._journal_entries = 0
+                self._read_journal()
+        except Exception as e:
+            print(f"Error loading token mappings: {e}")
+        self.version += 1
+    
+    def _load_snapshot(self) -> None:
+        """Merge the mappings from the snapshot file, if it exists."""
         if os.path.exists(self.token_file_path):
             try:
                 with open(self.token_file_path, 'r') as f:
                     stored_data = json.load(f)
-                    self.token_map = stored_data.get('token_map', {})
-                    # Also build the reverse mapping
-                    self.reverse_map = {v: k for k, v in self.token_map.items()}
+                for project_name, token in stored_data.get('token_map', {}).items():
+                    self._add_mapping(project_name, token)
             except Exception as e:
                 print(f"Error loading token mappings: {e}")
-                # Initialize with empty mappings if loading fails
-                self.token_map = {}
-                self.reverse_map = {}
+    
+    def _read_journal(self) -> bool:
+        """
+        Apply journal lines written since the last read.
+        
+        Only complete lines are consumed, so a line another process is still
+        writing is picked up on a later read.
+        
+        Returns:
+            bool: True if any mapping was added.
+        """
+        try:
+            f = open(self.journal_path, 'rb')
+        except FileNotFoundError:
+            return False
+        
+        added = False
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self._journal_inode:
+                # Compacted by another process: its old entries are in the snapshot now
+                if self._journal_inode is not None:
+                    self._load_snapshot()
+                    added = True
+                self._journal_inode = inode
+                self._journal_offset = 0
+                self._journal_entries = 0
+            f.seek(self._journal_offset)
+            data = f.read()
+        
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            self._journal_entries += 1
+            try:
+                entry = json.loads(line)
+                added = self._add_mapping(entry['name'], entry['token']) or added
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Skipping bad token journal line: {e}")
+        self._journal_offset += end
+        return added
+    
+    def refresh(self) -> None:
+        """
+        Pick up tokens added by other processes.
+        
+        Costs a stat call when nothing has changed; otherwise only the new
+        journal lines are read.
+        """
+        try:
+            stat = os.stat(self.journal_path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Error checking token journal: {e}")
+            return
+        if stat.st_ino == self._journal_inode and stat.st_size <= self._journal_offset:
+            return
+        with self._lock:
+            if self._read_journal():
+                self.version += 1
     
     def _save_tokens(self) -> None:
-        """Save token mappings to file."""
+        """Save the token mappings to the snapshot file, replacing it atomically."""
+        temp_path = f"{self.token_file_path}.{os.getpid()}.tmp"
         try:
-            with open(self.token_file_path, 'w') as f:
+            with open(temp_path, 'w') as f:
                 json.dump({
                     'token_map': self.token_map
                 }, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.token_file_path)
         except Exception as e:
             print(f"Error saving token mappings: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def compact(self) -> None:
+        """
+        Fold the journal into the snapshot and start an empty journal.
+        
+        Other processes notice the new journal file and reload the snapshot once.
+        """
+        try:
+            with self._file_lock():
+                if self._read_journal():
+                    self.version += 1
+                self._save_tokens()
+                temp_path = f"{self.journal_path}.{os.getpid()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    os.fsync(f.fileno())
+                    inode = os.fstat(f.fileno()).st_ino
+                os.replace(temp_path, self.journal_path)
+                self._journal_inode = inode
+                self._journal_offset = 0
+                self._journal_entries = 0
+        except Exception as e:
+            print(f"Error compacting token journal: {e}")
+        finally:
+            self._compacting = False
+    
+    def _maybe_compact(self) -> None:
+        """Compact on a background thread once the journal has grown past JOURNAL_COMPACT_ENTRIES."""
+        if self._journal_entries < JOURNAL_COMPACT_ENTRIES or self._compacting:
+            return
+        self._compacting = True
+        threading.Thread(target=self.compact, name="token-journal-compaction", daemon=True).start()
     
     def _generate_token(self, project_name: str) -> str:
         """
@@ -88,21 +311,42 @@ class SecurityManager:
         # Check if we already have a token for this project
         if project_name in self.token_map:
             return self.token_map[project_name]
-            
-        # Generate a new token
-        token = self._generate_token(project_name)
-        
-        # Handle collisions (unlikely but possible)
-        while token in self.reverse_map:
-            token = token + "_" + hashlib.md5(os.urandom(8)).hexdigest()[:4]
-        
-        # Store the mapping
-        self.token_map[project_name] = token
-        self.reverse_map[token] = project_name
         
-        # Save the updated mappings
-        self._save_tokens()
+        with self._file_lock():
+            # Another process may have tokenized it since our last read
+            if self._read_journal():
+                self.version += 1
+            if project_name in self.token_map:
+                return self.token_map[project_name]
+            
+            # Generate a new token
+            token = self._generate_token(project_name)
+            
+            # Handle collisions (unlikely but possible)
+            while token in self.reverse_map:
+                token = token + "_" + hashlib.md5(os.urandom(8)).hexdigest()[:4]
+            
+            # Append the mapping to the journal before using it
+            line = json.dumps({'name': project_name, 'token': token}) + "\n"
+            try:
+                with open(self.journal_path, 'ab') as f:
+                    f.write(line.encode())
+                    f.flush()
+                    os.fsync(f.fileno())
+                    inode = os.fstat(f.fileno()).st_ino
+                    end = f.tell()
+                # Our line directly follows what we have read, so just move past it
+                if inode == self._journal_inode or self._journal_inode is None:
+                    self._journal_inode = inode
+                    self._journal_offset = end
+                    self._journal_entries += 1
+            except OSError as e:
+                print(f"Error saving token mappings: {e}")
+            
+            self._add_mapping(project_name, token)
+            self.version += 1
         
+        self._maybe_compact()
         return token
     
     def detokenize_project(self, token: str) -> str:
@@ -120,6 +364,8 @@ class SecurityManager:
             return token
             
         # Look up the original project name
+        if token not in self.reverse_map:
+            self.refresh()
         return self.reverse_map.get(token, token)
     
     def protect_task_data(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -138,14 +384,9 @@ class SecurityManager:
         if 'category' in protected and protected['category']:
             protected['category'] = self.tokenize_project(protected['category'])
         
-        # Also look for project mentions in the task description
+        # Also replace project mentions in the task description
         if 'task' in protected and protected['task']:
-            # This is a simplified approach - for production, you'd want
-            # a more sophisticated detection of project names in text
-            for project_name in self.token_map.keys():
-                if project_name in protected['task']:
-                    token = self.token_map[project_name]
-                    protected['task'] = protected['task'].replace(project_name, token)
+            protected['task'] = self.protect_text(protected['task'])
         
         return protected
     
@@ -167,10 +408,7 @@ class SecurityManager:
         
         # Also restore project mentions in the task description
         if 'task' in original and original['task']:
-            # Replace any tokens with their original project names
-            for token, project_name in self.reverse_map.items():
-                if token in original['task']:
-                    original['task'] = original['task'].replace(token, project_name)
+            original['task'] = self.unprotect_text(original['task'])
         
         return original
     
@@ -198,38 +436,208 @@ class SecurityManager:
         """
         return [self.unprotect_task_data(task) for task in protected_tasks]
     
+    def _map_categories(self, frame: pd.DataFrame, convert) -> None:
+        """Convert each distinct category once and map the column through the results."""
+        if 'category' not in frame.columns:
+            return
+        categories = frame['category']
+        is_categorical = isinstance(categories.dtype, pd.CategoricalDtype)
+        distinct = categories.cat.categories if is_categorical else categories.dropna().unique()
+        mapping = {}
+        for category in distinct:
+            if isinstance(category, str):
+                converted = convert(category)
+                if converted != category:
+                    mapping[category] = converted
+        if not mapping:
+            return
+        if is_categorical:
+            renamed = [mapping.get(category, category) for category in categories.cat.categories]
+            if len(set(renamed)) == len(renamed):
+                # Rename the categories rather than the values, keeping the column categorical
+                frame['category'] = categories.cat.rename_categories(renamed)
+                return
+            # Two names converted to the same one; categories must stay unique
+            frame['category'] = categories.astype(object).map(lambda value: mapping.get(value, value)).astype('category')
+            return
+        mapped = categories.map(mapping)
+        frame['category'] = mapped.where(mapped.notna(), categories)
+    
+    @staticmethod
+    def _replace_in_column(frame: pd.DataFrame, column: str, regex, lookup: Dict[str, str]) -> None:
+        """Replace every regex match in a text column with its value in lookup."""
+        if column not in frame.columns or regex is None:
+            return
+        values = frame[column]
+        if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+            return
+        frame[column] = values.str.replace(regex, lambda match: lookup.get(match.group(0), match.group(0)),
+                                           regex=True)
+    
+    def protect_task_frame(self, tasks_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Protect project names in a task DataFrame, column by column.
+        
+        Equivalent to protect_task_data on every row, without converting the
+        frame to dicts: each distinct category is tokenized once, and the task
+        column goes through the project name regex.
+        
+        Args:
+            tasks_df: Tasks with 'category' and/or 'task' columns; modified in place.
+            
+        Returns:
+            pd.DataFrame: The same frame, protected.
+        """
+        if tasks_df.empty:
+            return tasks_df
+        self._map_categories(tasks_df, self.tokenize_project)
+        self.refresh()
+        self._replace_in_column(tasks_df, 'task', self._get_project_regex(), self.token_map)
+        return tasks_df
+    
+    def unprotect_task_frame(self, tasks_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Restore project names in a protected task DataFrame, column by column.
+        
+        Args:
+            tasks_df: Protected tasks with 'category' and/or 'task' columns; modified in place.
+            
+        Returns:
+            pd.DataFrame: The same frame, with original project names.
+        """
+        if tasks_df.empty:
+            return tasks_df
+        self.refresh()
+        self._map_categories(tasks_df, self.detokenize_project)
+        self._replace_in_column(tasks_df, 'task', TOKEN_PATTERN, self.reverse_map)
+        return tasks_df
+    
+    def _memoized(self, op: str, text: str, compute) -> str:
+        """
+        Return compute(text), reusing the result for a text seen since the mappings last changed.
+        
+        Args:
+            op: "protect" or "unprotect".
+            text: The input text.
+            compute: Function producing the result on a miss.
+            
+        Returns:
+            str: The result.
+        """
+        if self.memo_entries <= 0 or len(text) > PROTECTION_MEMO_MAX_CHARS:
+            return compute(text)
+        
+        key = (op, text)
+        stats = self._memo_stats[op]
+        with self._memo_lock:
+            # A new token changes what both operations produce, so start over
+            if self._memo_version != self.version:
+                self._memo.clear()
+                self._memo_version = self.version
+            version = self._memo_version
+            result = self._memo.get(key)
+            if result is not None:
+                self._memo.move_to_end(key)
+                stats['hits'] += 1
+        if result is not None:
+            PROTECTION_MEMO_LOOKUPS_TOTAL.inc(op=op, result="hit")
+            return result
+        
+        result = compute(text)
+        PROTECTION_MEMO_LOOKUPS_TOTAL.inc(op=op, result="miss")
+        with self._memo_lock:
+            stats['misses'] += 1
+            if self._memo_version == version:
+                self._memo[key] = result
+                if len(self._memo) > self.memo_entries:
+                    (evicted_op, _), _ = self._memo.popitem(last=False)
+                    self._memo_stats[evicted_op]['evictions'] += 1
+        return result
+    
+    def memo_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Hit rates of the protect/unprotect memo since startup.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: hits, misses, evictions and hit_rate per
+                                       operation, plus the current number of entries.
+        """
+        with self._memo_lock:
+            stats = {op: dict(counts) for op, counts in self._memo_stats.items()}
+            size = len(self._memo)
+        for counts in stats.values():
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_rate'] = round(counts['hits'] / lookups, 4) if lookups else 0.0
+        stats['entries'] = size
+        return stats
+    
+    def _get_project_regex(self):
+        """
+        Get the regex matching every known project name, rebuilding it if the mappings changed.
+        
+        Returns:
+            The compiled regex, or None if there are no projects.
+        """
+        if self._project_regex_version == self.version:
+            return self._project_regex
+        
+        with self._matcher_lock:
+            version = self.version
+            if self._project_regex_version != version:
+                pattern = _trie_pattern(list(self.token_map))
+                # Whole names only: "Atlas" must not match inside "Atlassian"
+                self._project_regex = re.compile(rf"(?<!\w)(?:{pattern})(?!\w)") if pattern else None
+                self._project_regex_version = version
+            return self._project_regex
+    
     def protect_text(self, text: str) -> str:
         """
         Protect sensitive information in text.
         
+        All project names are replaced in a single pass, longest name first
+        where names overlap, and only where they appear as whole words.
+        
         Args:
             text: The original text.
             
         Returns:
             str: Protected text.
         """
-        protected = text
+        if not text or not isinstance(text, str):
+            return text
         
-        # Replace project names with tokens
-        for project_name, token in self.token_map.items():
-            protected = protected.replace(project_name, token)
+        self.refresh()
+        return self._memoized('protect', text, self._protect_text)
+    
+    def _protect_text(self, text: str) -> str:
+        """Replace project names in text, without the memo."""
+        regex = self._get_project_regex()
+        if regex is None:
+            return text
         
-        return protected
+        token_map = self.token_map
+        return regex.sub(lambda match: token_map.get(match.group(0), match.group(0)), text)
     
     def unprotect_text(self, protected_text: str) -> str:
         """
         Restore original sensitive information in text.
         
+        Tokens all share one shape, so a single generic pattern finds them
+        and each is looked up in the reverse map; unknown tokens are left as is.
+        
         Args:
             protected_text: The protected text.
             
         Returns:
             str: Original text.
         """
-        text = protected_text
-        
-        # Replace tokens with project names
-        for token, project_name in self.reverse_map.items():
-            text = text.replace(token, project_name)
+        if not protected_text or not isinstance(protected_text, str) or "PROJ_" not in protected_text:
+            return protected_text
         
-        return text
\ No newline at end of file
+        self.refresh()
+        return self._memoized('unprotect', protected_text, self._unprotect_text)
+    
+    def _unprotect_text(self, protected_text: str) -> str:
+        """Replace tokens in text with project names, without the memo."""
+        reverse_map = self.reverse_map
+        return TOKEN_PATTERN.sub(lambda match: reverse_map.get(match.group(0), match.group(0)), protected_text)
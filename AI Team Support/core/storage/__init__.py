@@ -0,0 +1,4 @@
+"""
+Storage package for Task Manager.
+Local stores that keep derived Notion data close at hand.
+"""
@@ -0,0 +1,289 @@
+"""
+Task change feed for Task Manager.
+Records task creations, updates and archivals under an increasing cursor so
+clients can fetch only what changed since their last poll.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable
+
+from config import CHANGE_FEED_PATH
+
+# Task fields published in the feed
+FEED_FIELDS = ("task", "status", "employee", "category", "date", "reminder_sent")
+
+
+def _feed_value(value):
+    """Convert a task field to a JSON-friendly value."""
+    if value is None:
+        return None
+    if hasattr(value, "strftime"):
+        try:
+            return value.strftime("%Y-%m-%d")
+        except ValueError:  # NaT
+            return None
+    if hasattr(value, "item"):  # numpy scalar
+        value = value.item()
+    if isinstance(value, float) and value != value:  # NaN
+        return None
+    return value if isinstance(value, (bool, int, float)) else str(value)
+
+
+class ChangeFeed:
+    """
+    Latest state of every task, stamped with the sequence number of its last change.
+
+    Each task appears once: a change replaces the previous entry for the
+    task and gives it a new sequence number. Reading everything after a
+    cursor therefore returns each changed task once, in its current state,
+    and the cursor to use next time.
+
+    Changes come from two places: tasks written by this process, recorded as
+    they are sent to Notion, and incremental syncs that ask Notion for pages
+    edited since the last sync. A change that leaves a task exactly as
+    already recorded is ignored, so a sync that sees our own writes again
+    doesn't republish them.
+    """
+
+    def __init__(self, db_path: str = CHANGE_FEED_PATH):
+        """
+        Initialize the feed.
+
+        Args:
+            db_path: Path to the SQLite file backing the feed.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the feed database, creating its tables if needed."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS feed (
+            task_id TEXT PRIMARY KEY,
+            seq INTEGER UNIQUE,
+            action TEXT,
+            source TEXT,
+            changed_at TEXT,
+            data TEXT
+        )
+        ''')
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS feed_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        ''')
+        return conn
+
+    def _get_meta(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        """Read one metadata value."""
+        row = conn.execute('SELECT value FROM feed_meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        """Write one metadata value."""
+        conn.execute('INSERT OR REPLACE INTO feed_meta (key, value) VALUES (?, ?)', (key, value))
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """Latest Notion last_edited_time seen by an incremental sync."""
+        with self._lock:
+            conn = self._connect()
+            value = self._get_meta(conn, "notion_watermark")
+            conn.close()
+        return value
+
+    @property
+    def last_synced(self) -> Optional[datetime]:
+        """When the feed was last synced with Notion."""
+        with self._lock:
+            conn = self._connect()
+            value = self._get_meta(conn, "last_synced")
+            conn.close()
+        return datetime.fromisoformat(value) if value else None
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the latest change recorded."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                value = self._get_meta(conn, "seq")
+            finally:
+                conn.close()
+        return int(value or 0)
+
+    def record_many(self, changes: Iterable[Dict[str, Any]], source: str = "local",
+                    watermark: Optional[str] = None, before_seq: Optional[int] = None) -> int:
+        """
+        Record task changes.
+
+        Args:
+            changes: Dicts with "id", "action" ("created", "updated" or
+                     "archived") and any task fields that changed.
+            source: Where the changes came from ("local" or "notion").
+            watermark: New Notion sync watermark to store with the changes.
+            before_seq: If given, skip tasks changed after this sequence
+                        number, as the caller's view of them is older.
+
+        Returns:
+            int: Number of changes that were published.
+        """
+        published = 0
+        now = datetime.now().isoformat()
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    # Take the write lock before reading seq, so processes sharing
+                    # the file (web apps, Gmail worker) never hand out the same one
+                    conn.execute('BEGIN IMMEDIATE')
+                    seq = int(self._get_meta(conn, "seq") or 0)
+                    for change in changes:
+                        task_id = change["id"]
+                        action = change["action"]
+                        row = conn.execute(
+                            'SELECT action, data, seq FROM feed WHERE task_id = ?', (task_id,)
+                        ).fetchone()
+                        if row and before_seq is not None and row[2] > before_seq:
+                            continue
+                        data = json.loads(row[1]) if row else {}
+                        if row and action == "created":
+                            # Already known, e.g. our own insert seen again by a sync
+                            action = "updated"
+
+                        merged = dict(data)
+                        merged.update({
+                            field: _feed_value(change[field])
+                            for field in FEED_FIELDS if field in change
+                        })
+                        if row and merged == data and (action == "archived") == (row[0] == "archived"):
+                            continue
+
+                        seq += 1
+                        conn.execute('''
+                        INSERT INTO feed (task_id, seq, action, source, changed_at, data)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(task_id) DO UPDATE SET
+                            seq = excluded.seq, action = excluded.action, source = excluded.source,
+                            changed_at = excluded.changed_at, data = excluded.data
+                        ''', (task_id, seq, action, source, now, json.dumps(merged)))
+                        published += 1
+
+                    self._set_meta(conn, "seq", str(seq))
+                    if watermark:
+                        self._set_meta(conn, "notion_watermark", watermark)
+                    if source == "notion":
+                        self._set_meta(conn, "last_synced", now)
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error recording task changes: {e}")
+        return published
+
+    def record(self, task_id: str, action: str, fields: Optional[Dict[str, Any]] = None,
+               source: str = "local") -> None:
+        """
+        Record a single task change.
+
+        Args:
+            task_id: Notion page ID of the task.
+            action: "created", "updated" or "archived".
+            fields: Task fields that changed.
+            source: Where the change came from.
+        """
+        change = dict(fields or {})
+        change["id"] = task_id
+        change["action"] = action
+        self.record_many([change], source=source)
+
+    def known_ids(self, before_seq: Optional[int] = None) -> List[str]:
+        """
+        Get the IDs of all tasks the feed holds that aren't archived.
+
+        Args:
+            before_seq: If given, only tasks last changed at or before this sequence number.
+
+        Returns:
+            List[str]: Task IDs.
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                if before_seq is None:
+                    rows = conn.execute("SELECT task_id FROM feed WHERE action != 'archived'").fetchall()
+                else:
+                    rows = conn.execute("SELECT task_id FROM feed WHERE action != 'archived' AND seq <= ?",
+                                        (before_seq,)).fetchall()
+            finally:
+                conn.close()
+        return [row[0] for row in rows]
+
+    def reconcile(self, task_ids: Iterable[str], before_seq: Optional[int] = None) -> int:
+        """
+        Mark tasks missing from a complete task list as archived.
+
+        Notion queries never return archived pages, so a full fetch is the
+        only way to notice tasks archived outside this process. A fetch pages
+        through the database for a while, so tasks created or changed while
+        it ran may be missing from it without being archived; pass the seq
+        read before the fetch started so those are left alone.
+
+        Args:
+            task_ids: IDs of every task currently in the database.
+            before_seq: Feed seq read before the task list was fetched.
+
+        Returns:
+            int: Number of tasks marked as archived.
+        """
+        missing = set(self.known_ids(before_seq)) - set(task_ids)
+        if not missing:
+            return 0
+        return self.record_many(
+            ({"id": task_id, "action": "archived"} for task_id in sorted(missing)),
+            source="notion", before_seq=before_seq
+        )
+
+    def changes_since(self, cursor: int = 0, limit: int = 1000) -> Dict[str, Any]:
+        """
+        Get tasks changed after a cursor.
+
+        Args:
+            cursor: Cursor returned by the previous call; 0 returns every task.
+            limit: Maximum number of changes to return.
+
+        Returns:
+            Dict[str, Any]: "changes" (oldest first), the next "cursor" and "has_more".
+        """
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute('''
+            SELECT seq, task_id, action, source, changed_at, data FROM feed
+            WHERE seq > ? ORDER BY seq LIMIT ?
+            ''', (cursor, limit + 1)).fetchall()
+            conn.close()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        changes = [
+            {
+                "seq": seq,
+                "id": task_id,
+                "action": action,
+                "source": source,
+                "changed_at": changed_at,
+                "task": json.loads(data),
+            }
+            for seq, task_id, action, source, changed_at, data in rows
+        ]
+        return {
+            "changes": changes,
+            "cursor": changes[-1]["seq"] if changes else cursor,
+            "has_more": has_more,
+        }
+
+
+# Create a default instance for easy imports
+change_feed = ChangeFeed()
@@ -0,0 +1,191 @@
+"""
+Task extraction cache for Task Manager.
+Keeps validated extraction results so resubmitted updates skip the LLM call.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Any, Optional
+
+from config import EXTRACTION_CACHE_PATH, EXTRACTION_CACHE_TTL_DAYS, EXTRACTION_CACHE_MAX_ENTRIES
+from core.metrics import EXTRACTION_CACHE_LOOKUPS_TOTAL, EXTRACTION_CACHE_EVICTIONS_TOTAL
+
+_SPACES = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize an update so copies that differ only in layout share a cache entry.
+
+    Unicode is NFC-normalized, line endings become "\\n", runs of spaces and
+    tabs become one space, lines are trimmed and runs of blank lines are
+    collapsed to one. Wording and case are kept, as the model may use them.
+
+    Args:
+        text: The text sent for extraction.
+
+    Returns:
+        str: The normalized text.
+    """
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    lines = [_SPACES.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def extraction_key(text: str, prompt_version: str, model: str, extractor: str) -> str:
+    """
+    Cache key for extracting tasks from a text.
+
+    Args:
+        text: The update as submitted. Only its hash is kept, so keys hold no project
+              names, and the key doesn't change as new projects get tokenized.
+        prompt_version: Version of the extraction prompt; bump it when the prompt changes.
+        model: Chat model doing the extraction.
+        extractor: Name of the extractor, as extractors with their own prompts
+                   and stored task forms share the cache file.
+
+    Returns:
+        str: Hex SHA-256 of the extractor, prompt version, model and normalized text.
+    """
+    digest = hashlib.sha256()
+    for part in (extractor, prompt_version, model, normalize_text(text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Persistent cache of validated task lists keyed by extraction_key().
+
+    Entries expire ttl_days after they were stored, and the least recently
+    used entries are evicted once there are more than max_entries. The
+    SQLite file is shared by every process, so an update reprocessed after a
+    crash or resubmitted from another interface is answered locally.
+    """
+
+    def __init__(self, db_path: str = EXTRACTION_CACHE_PATH, ttl_days: float = EXTRACTION_CACHE_TTL_DAYS,
+                 max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path to the SQLite file backing the cache.
+            ttl_days: Days an entry stays valid; 0 keeps entries until evicted.
+            max_entries: Entries kept before the least recently used are evicted.
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._created = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache, creating its table if needed."""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        if not self._created:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY,
+                tasks TEXT,
+                created_at REAL,
+                last_used REAL
+            )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_extractions_last_used ON extractions(last_used)')
+            conn.commit()
+            self._created = True
+        return conn
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up the tasks extracted for a key.
+
+        Args:
+            key: Key from extraction_key().
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: A fresh copy of the cached tasks, or None
+                                            if there is no valid entry.
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    row = conn.execute('SELECT tasks, created_at FROM extractions WHERE key = ?', (key,)).fetchone()
+                    if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                        with conn:
+                            conn.execute('DELETE FROM extractions WHERE key = ?', (key,))
+                        row = None
+                    if row:
+                        with conn:
+                            conn.execute('UPDATE extractions SET last_used = ? WHERE key = ?', (now, key))
+                finally:
+                    conn.close()
+        except sqlite3.Error as e:
+            print(f"Error reading extraction cache: {e}")
+            row = None
+
+        if row is None:
+            EXTRACTION_CACHE_LOOKUPS_TOTAL.inc(result="miss")
+            return None
+        EXTRACTION_CACHE_LOOKUPS_TOTAL.inc(result="hit")
+        return json.loads(row[0])
+
+    def put(self, key: str, tasks: List[Dict[str, Any]]) -> None:
+        """
+        Store the validated tasks for a key, then drop expired and excess entries.
+
+        Args:
+            key: Key from extraction_key().
+            tasks: Validated task dictionaries.
+        """
+        now = time.time()
+        try:
+            payload = json.dumps(tasks, default=str)
+            with self._lock:
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.execute(
+                            'INSERT OR REPLACE INTO extractions (key, tasks, created_at, last_used) VALUES (?, ?, ?, ?)',
+                            (key, payload, now, now)
+                        )
+                        evicted = 0
+                        if self.ttl_seconds:
+                            evicted += conn.execute('DELETE FROM extractions WHERE created_at < ?',
+                                                    (now - self.ttl_seconds,)).rowcount
+                        count = conn.execute('SELECT COUNT(*) FROM extractions').fetchone()[0]
+                        if count > self.max_entries:
+                            evicted += conn.execute(
+                                'DELETE FROM extractions WHERE key IN '
+                                '(SELECT key FROM extractions ORDER BY last_used ASC LIMIT ?)',
+                                (count - self.max_entries,)
+                            ).rowcount
+                finally:
+                    conn.close()
+            if evicted:
+                EXTRACTION_CACHE_EVICTIONS_TOTAL.inc(evicted)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Error saving extraction cache: {e}")
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute('DELETE FROM extractions')
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error clearing extraction cache: {e}")
+
+
+# Create a default instance for easy imports
+extraction_cache = ExtractionCache()
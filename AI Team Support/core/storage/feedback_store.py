@@ -0,0 +1,216 @@
+"""
+Peer feedback mirror for Task Manager.
+Keeps a local copy of the Notion feedback database indexed by person and date.
+"""
+import os
+import sqlite3
+import threading
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from config import FEEDBACK_STORE_PATH
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Normalize a person's name for lookups.
+
+    Args:
+        name: The name as written in Notion or asked for by a caller.
+
+    Returns:
+        str: The name case-folded with whitespace collapsed.
+    """
+    return " ".join((name or "").casefold().split())
+
+
+def store_path_for(database_id: str, default_path: str = FEEDBACK_STORE_PATH) -> str:
+    """
+    Path of the store mirroring a feedback database other than the configured one.
+
+    Args:
+        database_id: Notion feedback database ID.
+        default_path: Path of the store for the configured database.
+
+    Returns:
+        str: e.g. "peer_feedback_<database id>.db".
+    """
+    root, ext = os.path.splitext(default_path)
+    return f"{root}_{database_id.replace('-', '')}{ext}"
+
+
+class FeedbackStore:
+    """
+    Local mirror of peer feedback entries.
+
+    Entries are persisted in SQLite and held in memory as one date-sorted
+    list per normalized name, so "feedback for X in the last N days" is a
+    dictionary lookup plus a binary search. If another process has written
+    to the file since it was loaded, the index is rebuilt from it first.
+    """
+
+    def __init__(self, db_path: str = FEEDBACK_STORE_PATH):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Path to the SQLite file backing the store.
+        """
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._dates: Dict[str, List[str]] = {}
+        self._entries: Dict[str, List[Dict[str, str]]] = {}
+        self._meta: Dict[str, str] = {}
+        self._loaded_mtime = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the store, creating its tables if needed."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS feedback (
+            page_id TEXT PRIMARY KEY,
+            name_key TEXT,
+            date TEXT,
+            feedback TEXT
+        )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_feedback_name_date ON feedback(name_key, date)')
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS feedback_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        ''')
+        return conn
+
+    def _file_mtime(self):
+        """Modification time of the backing file, or None if it doesn't exist."""
+        try:
+            return os.stat(self.db_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _ensure_loaded(self) -> None:
+        """Build the in-memory index on first use or after another process wrote the file."""
+        mtime = self._file_mtime()
+        if self._loaded_mtime is not None and mtime == self._loaded_mtime:
+            return
+
+        with self._lock:
+            if self._loaded_mtime is not None and mtime == self._loaded_mtime:
+                return
+            try:
+                conn = self._connect()
+                rows = conn.execute(
+                    'SELECT name_key, date, feedback FROM feedback ORDER BY name_key, date'
+                ).fetchall()
+                meta = dict(conn.execute('SELECT key, value FROM feedback_meta').fetchall())
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error loading feedback store: {e}")
+                rows, meta = [], {}
+
+            dates: Dict[str, List[str]] = {}
+            entries: Dict[str, List[Dict[str, str]]] = {}
+            for name_key, date, feedback in rows:
+                dates.setdefault(name_key, []).append(date)
+                entries.setdefault(name_key, []).append({"date": date, "feedback": feedback})
+
+            self._dates, self._entries, self._meta = dates, entries, meta
+            self._loaded_mtime = self._file_mtime()
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """Latest Notion last_edited_time seen by a sync."""
+        self._ensure_loaded()
+        return self._meta.get("notion_watermark")
+
+    @property
+    def last_synced(self) -> Optional[datetime]:
+        """When the store was last synced with Notion."""
+        self._ensure_loaded()
+        value = self._meta.get("last_synced")
+        return datetime.fromisoformat(value) if value else None
+
+    @property
+    def last_full_sync(self) -> Optional[datetime]:
+        """When the whole feedback database was last read into the store."""
+        self._ensure_loaded()
+        value = self._meta.get("last_full_sync")
+        return datetime.fromisoformat(value) if value else None
+
+    def recent(self, person_name: str, days_back: int = 14) -> List[Dict[str, str]]:
+        """
+        Get feedback for a person from the last days_back days.
+
+        Args:
+            person_name: Name of the person, in any case or spacing.
+            days_back: Number of days back to include.
+
+        Returns:
+            List[Dict[str, str]]: Entries with "date" (YYYY-MM-DD) and "feedback", oldest first.
+        """
+        self._ensure_loaded()
+        name_key = normalize_name(person_name)
+        dates = self._dates.get(name_key)
+        if not dates:
+            return []
+
+        cutoff = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        start = bisect_left(dates, cutoff)
+        return [dict(entry) for entry in self._entries[name_key][start:]]
+
+    def apply(self, entries: Iterable[Tuple[str, str, Optional[str], str]],
+              watermark: Optional[str] = None, replace: bool = False) -> int:
+        """
+        Store feedback entries from Notion.
+
+        Args:
+            entries: (page_id, name, date as YYYY-MM-DD or None, feedback) tuples.
+                     Entries without a date are removed, as they can never match.
+            watermark: New Notion sync watermark to store with the entries.
+            replace: Whether the entries are the complete database, replacing
+                     everything stored so far.
+
+        Returns:
+            int: Number of entries stored.
+        """
+        rows = []
+        undated = []
+        for page_id, name, date, feedback in entries:
+            if date:
+                rows.append((page_id, normalize_name(name), date, feedback))
+            else:
+                undated.append((page_id,))
+
+        now = datetime.now().isoformat()
+        meta = [("last_synced", now)]
+        if replace:
+            meta.append(("last_full_sync", now))
+        if watermark:
+            meta.append(("notion_watermark", watermark))
+
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    if replace:
+                        conn.execute('DELETE FROM feedback')
+                    conn.executemany('DELETE FROM feedback WHERE page_id = ?', undated)
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO feedback (page_id, name_key, date, feedback) VALUES (?, ?, ?, ?)',
+                        rows
+                    )
+                    conn.executemany('INSERT OR REPLACE INTO feedback_meta (key, value) VALUES (?, ?)', meta)
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error saving feedback store: {e}")
+                return 0
+            # Rebuild the index on the next read
+            self._loaded_mtime = None
+        return len(rows)
+
+
+# Create a default instance for easy imports
+feedback_store = FeedbackStore()
@@ -0,0 +1,227 @@
+"""
+Category and employee registry for Task Manager.
+Keeps the sets of known project categories and employees, with task counts,
+so listing them never requires fetching tasks from Notion.
+"""
+import os
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+import pandas as pd
+
+from config import TASK_REGISTRY_PATH
+
+# Task fields tracked by the registry
+REGISTRY_KINDS = ("category", "employee")
+
+
+class TaskRegistry:
+    """
+    Persistent counts of tasks per category and per employee.
+
+    Counts are held in memory and mirrored to a small SQLite file. They are
+    updated incrementally as tasks are inserted and replaced wholesale
+    whenever a full task fetch is available. Reads only touch memory; if
+    another process has written to the file since it was last loaded, the
+    counts are reloaded from it first.
+    """
+
+    def __init__(self, db_path: str = TASK_REGISTRY_PATH):
+        """
+        Initialize the registry.
+
+        Args:
+            db_path: Path to the SQLite file backing the registry.
+        """
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._counts: Dict[str, Counter] = {kind: Counter() for kind in REGISTRY_KINDS}
+        self._sorted: Dict[str, List[str]] = {}
+        self._last_synced: Optional[datetime] = None
+        self._loaded_mtime = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the registry database, creating its tables if needed."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS registry (
+            kind TEXT,
+            name TEXT,
+            count INTEGER,
+            PRIMARY KEY (kind, name)
+        )
+        ''')
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS registry_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        ''')
+        return conn
+
+    def _file_mtime(self):
+        """Modification time of the backing file, or None if it doesn't exist."""
+        try:
+            return os.stat(self.db_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _ensure_loaded(self) -> None:
+        """Load counts from disk on first use or after another process wrote them."""
+        mtime = self._file_mtime()
+        if self._loaded_mtime is not None and mtime == self._loaded_mtime:
+            return
+
+        with self._lock:
+            if self._loaded_mtime is not None and mtime == self._loaded_mtime:
+                return
+            try:
+                conn = self._connect()
+                rows = conn.execute('SELECT kind, name, count FROM registry').fetchall()
+                synced = conn.execute(
+                    "SELECT value FROM registry_meta WHERE key = 'last_synced'"
+                ).fetchone()
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error loading task registry: {e}")
+                rows, synced = [], None
+
+            self._counts = {kind: Counter() for kind in REGISTRY_KINDS}
+            for kind, name, count in rows:
+                if kind in self._counts:
+                    self._counts[kind][name] = count
+            self._last_synced = datetime.fromisoformat(synced[0]) if synced else None
+            self._sorted = {}
+            self._loaded_mtime = self._file_mtime()
+
+    def _names(self, kind: str) -> List[str]:
+        """Sorted names of one kind, cached until the counts change."""
+        self._ensure_loaded()
+        names = self._sorted.get(kind)
+        if names is None:
+            with self._lock:
+                names = sorted(self._counts[kind])
+                self._sorted[kind] = names
+        return list(names)
+
+    @property
+    def last_synced(self) -> Optional[datetime]:
+        """When the registry was last rebuilt from a full task fetch."""
+        self._ensure_loaded()
+        return self._last_synced
+
+    def categories(self) -> List[str]:
+        """
+        Get all known project categories.
+
+        Returns:
+            List[str]: Category names, sorted.
+        """
+        return self._names("category")
+
+    def employees(self) -> List[str]:
+        """
+        Get all known employees.
+
+        Returns:
+            List[str]: Employee names, sorted.
+        """
+        return self._names("employee")
+
+    def category_counts(self) -> Dict[str, int]:
+        """
+        Get the number of tasks in each category.
+
+        Returns:
+            Dict[str, int]: Task counts keyed by category.
+        """
+        self._ensure_loaded()
+        return dict(self._counts["category"])
+
+    def employee_counts(self) -> Dict[str, int]:
+        """
+        Get the number of tasks for each employee.
+
+        Returns:
+            Dict[str, int]: Task counts keyed by employee.
+        """
+        self._ensure_loaded()
+        return dict(self._counts["employee"])
+
+    def record_task(self, task: Dict[str, Any]) -> None:
+        """
+        Count a newly inserted task.
+
+        Args:
+            task: The task dictionary, with unprotected names.
+        """
+        self._ensure_loaded()
+        updates = [(kind, task.get(kind)) for kind in REGISTRY_KINDS]
+        updates = [(kind, name) for kind, name in updates if isinstance(name, str) and name.strip()]
+        if not updates:
+            return
+
+        with self._lock:
+            for kind, name in updates:
+                self._counts[kind][name] += 1
+                self._sorted.pop(kind, None)
+            try:
+                conn = self._connect()
+                conn.executemany('''
+                INSERT INTO registry (kind, name, count) VALUES (?, ?, 1)
+                ON CONFLICT(kind, name) DO UPDATE SET count = count + 1
+                ''', updates)
+                conn.commit()
+                conn.close()
+                self._loaded_mtime = self._file_mtime()
+            except sqlite3.Error as e:
+                print(f"Error saving task registry: {e}")
+
+    def sync(self, tasks_df: pd.DataFrame) -> None:
+        """
+        Rebuild the counts from a complete task DataFrame.
+
+        Args:
+            tasks_df: All tasks, as returned by NotionAdapter.fetch_tasks.
+        """
+        counts = {}
+        for kind in REGISTRY_KINDS:
+            if kind in tasks_df.columns:
+                values = tasks_df[kind].dropna()
+                values = values[values.astype(str).str.strip() != ""]
+                counts[kind] = Counter({
+                    str(name): int(count)
+                    for name, count in values.value_counts().items()
+                    if count > 0
+                })
+            else:
+                counts[kind] = Counter()
+        synced = datetime.now()
+
+        with self._lock:
+            self._counts = counts
+            self._sorted = {}
+            self._last_synced = synced
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute('DELETE FROM registry')
+                    conn.executemany(
+                        'INSERT INTO registry (kind, name, count) VALUES (?, ?, ?)',
+                        [(kind, name, count) for kind, names in counts.items() for name, count in names.items()]
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO registry_meta (key, value) VALUES ('last_synced', ?)",
+                        (synced.isoformat(),)
+                    )
+                conn.close()
+                self._loaded_mtime = self._file_mtime()
+            except sqlite3.Error as e:
+                print(f"Error saving task registry: {e}")
+
+
+# Create a default instance for easy imports
+task_registry = TaskRegistry()
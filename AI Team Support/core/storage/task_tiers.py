@@ -0,0 +1,363 @@
+"""
+Hot/cold tiering of the task corpus for Task Manager.
+Keeps recent and open tasks in memory for matching and archives the rest.
+"""
+import json
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple, Callable
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    DEBUG_MODE,
+    HOT_TASK_DAYS,
+    COLD_TASK_STORE_PATH
+)
+
+# Score adjustments applied on top of cosine similarity when matching tasks
+SAME_EMPLOYEE_BONUS = 0.05
+SAME_CATEGORY_BONUS = 0.05
+RECURRING_DATE_PENALTY = 0.1
+
+
+def debug_print(message):
+    """Print debug messages if DEBUG_MODE is True."""
+    if DEBUG_MODE:
+        print(message)
+
+
+def date_key(value) -> Optional[str]:
+    """
+    Normalize a task date to a YYYY-MM-DD string for comparison.
+
+    Args:
+        value: A datetime, date string or None.
+
+    Returns:
+        Optional[str]: The date as YYYY-MM-DD, or None if missing.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, str):
+        return value[:10] or None
+    return value.strftime("%Y-%m-%d")
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length so a dot product is the cosine similarity."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _pack_embedding(embedding) -> bytes:
+    """Compress an embedding for the cold store."""
+    return zlib.compress(np.asarray(embedding, dtype=np.float32).tobytes())
+
+
+def _unpack_embedding(blob: bytes) -> np.ndarray:
+    """Decompress an embedding from the cold store."""
+    return np.frombuffer(zlib.decompress(blob), dtype=np.float32)
+
+
+class TaskTiers:
+    """
+    Task corpus split into a hot set kept in memory and a cold archive.
+
+    Open tasks and tasks dated within the last ``hot_days`` days are hot:
+    they stay in memory together with a normalized embedding matrix, so
+    matching a new task against them is a single matrix product. Completed
+    tasks older than that are cold: they are written to a zlib-compressed
+    SQLite store and only searched when the hot set has no confident match.
+    Cold embeddings are kept in memory next to the fields used for scoring,
+    so a cold search only reads and decompresses the payload it matched.
+    """
+
+    def __init__(self, hot_days: int = HOT_TASK_DAYS, cold_path: str = COLD_TASK_STORE_PATH,
+                 embed: Optional[Callable[[List[str]], Dict[str, Any]]] = None):
+        """
+        Initialize the tiers.
+
+        Args:
+            hot_days: Age in days after which completed tasks become cold.
+            cold_path: Path to the SQLite file holding cold tasks.
+            embed: Function mapping a list of texts to {text: embedding}.
+                   If None, uses the cached OpenAI embeddings.
+        """
+        self.hot_days = hot_days
+        self.cold_path = cold_path
+        self._embed = embed
+        self._lock = threading.RLock()
+
+        self._source = None
+        self.hot = pd.DataFrame()
+        self._hot_matrix: Optional[np.ndarray] = None
+        self._hot_rows = np.array([], dtype=int)
+        self._hot_embeddings: Dict[str, Any] = {}  # Task text -> embedding, reused across loads
+        self._cold_payloads: Optional[Dict[str, bytes]] = None  # Task ID -> payload in the cold store
+        self._cold_embeddings: Dict[str, np.ndarray] = {}  # Task ID -> embedding in the cold store
+        self._cold_matrix: Optional[np.ndarray] = None
+        self._cold_index = pd.DataFrame()  # ID, employee, category and date of each matrix row
+        self.stats = {"hot_searches": 0, "cold_searches": 0, "cold_matches": 0}
+
+    def embed(self, texts: List[str]) -> Dict[str, Any]:
+        """Get embeddings for texts, keyed by text."""
+        if self._embed is None:
+            from core.openai_client import get_batch_embeddings
+            self._embed = get_batch_embeddings
+        return self._embed(texts) or {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cold store, creating its table if needed."""
+        conn = sqlite3.connect(self.cold_path)
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS cold_tasks (
+            id TEXT PRIMARY KEY,
+            payload BLOB,
+            embedding BLOB
+        )
+        ''')
+        return conn
+
+    def partition(self, tasks_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Split tasks into hot and cold sets.
+
+        Args:
+            tasks_df: Tasks as returned by fetch_tasks.
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: The hot and cold tasks.
+        """
+        if tasks_df.empty:
+            return tasks_df, tasks_df.iloc[0:0]
+
+        dates = pd.to_datetime(tasks_df["date"], errors="coerce", utc=True)
+        cutoff = pd.Timestamp.now(tz="UTC") - timedelta(days=self.hot_days)
+        completed = tasks_df["status"].astype(object) == "Completed"
+        # Tasks without a date stay hot, since their age is unknown
+        old = dates.notna() & (dates < cutoff)
+        cold_mask = completed & old
+        return tasks_df[~cold_mask], tasks_df[cold_mask]
+
+    def load(self, tasks_df: pd.DataFrame) -> None:
+        """
+        Rebuild the tiers from a complete task DataFrame.
+
+        Loading the same DataFrame again is a no-op, so callers can pass
+        the frame they already have for every task they process. A new frame
+        only writes the cold tasks that changed and only embeds hot task
+        texts not seen in the previous load and cold tasks that are new or
+        were edited.
+
+        Args:
+            tasks_df: Tasks as returned by fetch_tasks.
+        """
+        with self._lock:
+            if tasks_df is self._source:
+                return
+
+            hot, cold = self.partition(tasks_df)
+            self._archive(cold)
+
+            hot = hot.reset_index(drop=True)
+            texts = hot["task"].tolist() if not hot.empty else []
+            missing = [text for text in dict.fromkeys(texts) if text not in self._hot_embeddings]
+            embeddings = {text: self._hot_embeddings[text] for text in texts if text in self._hot_embeddings}
+            if missing:
+                embeddings.update(self.embed(missing))
+            self._hot_embeddings = embeddings
+
+            rows = [i for i, text in enumerate(texts) if text in embeddings]
+            if rows:
+                matrix = np.array([embeddings[texts[i]] for i in rows], dtype=np.float32)
+                self._hot_matrix = _normalize_rows(matrix)
+            else:
+                self._hot_matrix = None
+            self._hot_rows = np.array(rows, dtype=int)
+            self.hot = hot
+            self._source = tasks_df
+
+            debug_print(f"Task tiers: {len(hot)} hot tasks, {len(cold)} archived as cold")
+
+    def _archive(self, cold: pd.DataFrame) -> None:
+        """
+        Bring the compressed store and the in-memory cold index in line with the cold tasks.
+
+        Only tasks whose payload changed are written. A changed payload drops
+        the stored embedding, so the task is embedded again from its new text;
+        unchanged tasks keep theirs. Tasks without an embedding, such as
+        those whose embedding failed before, are embedded here, so searches
+        never call the embedding API.
+        """
+        records = cold.to_dict("records")
+        payloads = {
+            row["id"]: zlib.compress(json.dumps({
+                    "id": row["id"],
+                    "task": row["task"],
+                    "status": str(row["status"]),
+                    "employee": str(row["employee"]),
+                    "category": str(row["category"]),
+                    "date": date_key(row["date"]),
+                    "reminder_sent": bool(row["reminder_sent"]),
+                }).encode())
+            for row in records
+        }
+        try:
+            conn = self._connect()
+            try:
+                stored, embeddings = self._cold_payloads, self._cold_embeddings
+                if stored is None:
+                    # First load: read the store once, later loads only write the differences
+                    rows = conn.execute('SELECT id, payload, embedding FROM cold_tasks').fetchall()
+                    stored = {task_id: payload for task_id, payload, _ in rows}
+                    embeddings = {task_id: _unpack_embedding(blob) for task_id, _, blob in rows if blob is not None}
+                changed = {task_id for task_id, payload in payloads.items() if stored.get(task_id) != payload}
+                # Tasks that were reopened or deleted since the last load
+                removed = [(task_id,) for task_id in stored if task_id not in payloads]
+                embeddings = {task_id: embedding for task_id, embedding in embeddings.items()
+                              if task_id in payloads and task_id not in changed}
+
+                missing = [row for row in records if row["id"] not in embeddings]
+                new_embeddings = self.embed(list(dict.fromkeys(row["task"] for row in missing))) if missing else {}
+                embedded = set()
+                for row in missing:
+                    if row["task"] in new_embeddings:
+                        embeddings[row["id"]] = np.asarray(new_embeddings[row["task"]], dtype=np.float32)
+                        embedded.add(row["id"])
+
+                writes = [(task_id, payloads[task_id],
+                           _pack_embedding(embeddings[task_id]) if task_id in embeddings else None)
+                          for task_id in changed | embedded]
+                with conn:
+                    conn.executemany('DELETE FROM cold_tasks WHERE id = ?', removed)
+                    conn.executemany('''
+                    INSERT INTO cold_tasks (id, payload, embedding) VALUES (?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET payload = excluded.payload, embedding = excluded.embedding
+                    ''', writes)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error archiving cold tasks: {e}")
+            return
+
+        index = cold.loc[cold["id"].isin(embeddings), ["id", "employee", "category", "date"]]
+        index = index.drop_duplicates("id").reset_index(drop=True)
+        if index.empty:
+            self._cold_matrix = None
+        else:
+            self._cold_matrix = _normalize_rows(np.vstack([embeddings[task_id] for task_id in index["id"]]))
+        self._cold_index = index
+        self._cold_payloads = payloads
+        self._cold_embeddings = embeddings
+        debug_print(f"Cold store: {len(changed)} tasks written, {len(removed)} removed, "
+                    f"{len(embedded)} embedded")
+
+    def _score(self, task: Dict[str, Any], similarity: np.ndarray, frame: pd.DataFrame,
+               is_recurring: bool) -> np.ndarray:
+        """Apply the employee, category and recurring-date adjustments."""
+        scores = similarity.astype(np.float64)
+        scores += SAME_EMPLOYEE_BONUS * (frame["employee"].astype(object) == task.get("employee")).to_numpy()
+        scores += SAME_CATEGORY_BONUS * (frame["category"].astype(object) == task.get("category")).to_numpy()
+        if is_recurring:
+            task_date = date_key(task.get("date"))
+            row_dates = frame["date"].map(date_key)
+            scores -= RECURRING_DATE_PENALTY * (row_dates != task_date).to_numpy()
+        return scores
+
+    def search_hot(self, task: Dict[str, Any], task_embedding, is_recurring: bool = False
+                   ) -> Tuple[float, Optional[pd.Series]]:
+        """
+        Find the best matching hot task.
+
+        Args:
+            task: The incoming task.
+            task_embedding: Embedding of the incoming task text.
+            is_recurring: Whether date mismatches should lower the score.
+
+        Returns:
+            Tuple[float, Optional[pd.Series]]: Best score and matching row, or (0, None).
+        """
+        with self._lock:
+            matrix, rows, hot = self._hot_matrix, self._hot_rows, self.hot
+        self.stats["hot_searches"] += 1
+        if matrix is None or not len(rows):
+            return 0, None
+
+        query = _normalize_rows(np.asarray([task_embedding], dtype=np.float32))[0]
+        candidates = hot.iloc[rows]
+        scores = self._score(task, matrix @ query, candidates, is_recurring)
+        best = int(np.argmax(scores))
+        return float(scores[best]), candidates.iloc[best]
+
+    def search_cold(self, task: Dict[str, Any], task_embedding, is_recurring: bool = False
+                    ) -> Tuple[float, Optional[pd.Series]]:
+        """
+        Find the best matching cold task.
+
+        Scores the in-memory cold index, then reads and decompresses only
+        the payload of the best match from the store.
+
+        Args:
+            task: The incoming task.
+            task_embedding: Embedding of the incoming task text.
+            is_recurring: Whether date mismatches should lower the score.
+
+        Returns:
+            Tuple[float, Optional[pd.Series]]: Best score and matching row, or (0, None).
+        """
+        with self._lock:
+            matrix, index = self._cold_matrix, self._cold_index
+        self.stats["cold_searches"] += 1
+        if matrix is None or index.empty:
+            return 0, None
+
+        query = _normalize_rows(np.asarray([task_embedding], dtype=np.float32))[0]
+        scores = self._score(task, matrix @ query, index, is_recurring)
+        best = int(np.argmax(scores))
+
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT payload FROM cold_tasks WHERE id = ?', (index["id"].iloc[best],)).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error reading cold task: {e}")
+            return 0, None
+        if row is None:
+            return 0, None
+        return float(scores[best]), pd.Series(json.loads(zlib.decompress(row[0])))
+
+    def find_match(self, task: Dict[str, Any], task_embedding, threshold: float,
+                   is_recurring: bool = False) -> Tuple[float, Optional[pd.Series]]:
+        """
+        Find the best existing task, searching the cold store only if needed.
+
+        Args:
+            task: The incoming task.
+            task_embedding: Embedding of the incoming task text.
+            threshold: Score above which a match is confident.
+            is_recurring: Whether date mismatches should lower the score.
+
+        Returns:
+            Tuple[float, Optional[pd.Series]]: Best score and matching row.
+        """
+        best_score, best_row = self.search_hot(task, task_embedding, is_recurring)
+        if best_score > threshold:
+            return best_score, best_row
+
+        cold_score, cold_row = self.search_cold(task, task_embedding, is_recurring)
+        if cold_score > best_score:
+            if cold_score > threshold:
+                self.stats["cold_matches"] += 1
+            return cold_score, cold_row
+        return best_score, best_row
+
+
+# Create a default instance for easy imports
+task_tiers = TaskTiers()
@@ -2,37 +2,45 @@
 Task extraction functionality for Task Manager.
 Handles extracting structured tasks from freeform text.
 """
-import json
-import re
-import ast
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dateutil import parser
 from datetime import datetime
-from openai import OpenAI
+from core.adapters.openai_transport import get_openai_client
+from core.tracing import traced, annotate, propagate
+from core.extraction_chunks import split_update, merge_extracted_tasks
+from core.task_stream import TaskObjectScanner
+from core.task_parser import parse_task_list, parse_task_object, TaskParseError
+from core.openai_client import get_batch_embeddings
+from core.storage.extraction_cache import extraction_cache, extraction_key
+from core.rule_extractor import rule_extractor
 
 from config import (
     OPENAI_API_KEY,
     MIN_TASK_LENGTH, 
     DEBUG_MODE,
-    CHAT_MODEL
+    CHAT_MODEL,
+    FAST_PATH_ENABLED,
+    EXTRACTION_CHUNK_CHARS,
+    EXTRACTION_MAX_PARALLEL
 )
 
 # Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+client = get_openai_client(OPENAI_API_KEY)
+
+# Bump whenever the prompt or the validation below changes, so cached extractions are redone
+PROMPT_VERSION = "1"
+# Keeps this extractor's cache entries apart from core.ai.extractors', whose prompt differs
+CACHE_NAMESPACE = "task_extractor"
 
 def debug_print(message):
     """Print debug messages if DEBUG_MODE is True."""
     if DEBUG_MODE:
         print(message)
 
-def extract_tasks_from_update(text):
-    """Extract structured tasks from freeform text with improved error handling."""
-    if not text or len(text.strip()) < MIN_TASK_LENGTH:
-        return []
-
-    print("Starting task extraction...")
-
-    prompt = f"""You are TaskExtractor, an expert system that extracts structured task updates from complex work logs and emails.
+def _build_prompt(text):
+    """Build the extraction prompt for an update."""
+    return f"""You are TaskExtractor, an expert system that extracts structured task updates from complex work logs and emails.
 
 YOUR TASK:
 Extract ONLY the actionable tasks from the provided work log, which may contain forwarded emails, email threads, or multiple reports. Follow these precise steps:
@@ -95,220 +103,299 @@ SPECIAL CASES TO HANDLE:
 
 Now extract the tasks from this input: {text}"""
 
-    try:
-        print("Calling OpenAI API...")
-        response = client.chat.completions.create(
-            model=CHAT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
-
-        content = response.choices[0].message.content
-        print(f"Received response from OpenAI. Length: {len(content)}")
+def _validate_task(task, i):
+    """
+    Check one task parsed from the model response and standardize its date.
 
-        # Remove markdown code blocks if present
-        if "```" in content:
-            print("Removing markdown code blocks...")
-            content = re.sub(r'```(?:python|json)?\n(.*?)```', r'\1', content, flags=re.DOTALL)
+    Args:
+        task: The parsed task.
+        i: Position of the task in the response, for log messages.
 
-        content = content.strip()
-        print(f"Cleaned content. Now parsing...")
-
-        # Try multiple parsing methods in sequence
-        tasks = None
-
-        # Method 1: Direct JSON parsing
-        try:
-            print("Attempting direct JSON parsing...")
-            # Replace single quotes with double quotes for JSON
-            json_content = content.replace("'", '"')
-            tasks = json.loads(json_content)
-            print("JSON parsing successful!")
-        except json.JSONDecodeError as e:
-            print(f"JSON parse failed: {e}")
-
-            # Method 2: Extract array with regex
+    Returns:
+        The task, or None if it is invalid.
+    """
+    try:
+        if not isinstance(task, dict):
+            print(f"Task {i} is not a dictionary: {type(task)}")
+            return None
+
+        # Ensure all required keys exist
+        required_keys = ["task", "status", "employee", "date", "category"]
+        if not all(key in task for key in required_keys):
+            missing = [key for key in required_keys if key not in task]
+            print(f"Task {i} missing keys: {missing}")
+            return None
+
+        # Ensure task description has minimum length
+        if not task["task"] or len(task["task"].strip()) < MIN_TASK_LENGTH:
+            print(f"Task {i} description too short: '{task['task']}'")
+            return None
+
+        # Standardize date format
+        if isinstance(task["date"], str):
             try:
-                print("Attempting to extract JSON array with regex...")
-                match = re.search(r'\[\s*{.*}\s*\]', content, re.DOTALL)
-                if match:
-                    json_array = match.group(0).replace("'", '"')
-                    tasks = json.loads(json_array)
-                    print("Regex extraction successful!")
-                else:
-                    print("No JSON array found in content")
+                date_obj = parser.parse(task["date"])
+                task["date"] = date_obj.strftime("%Y-%m-%d")
             except Exception as e:
-                print(f"Regex extraction failed: {e}")
-
-                # Method 3: Fall back to safer eval
-                try:
-                    print("Attempting eval with ast...")
-                    tasks = ast.literal_eval(content)
-                    print("AST literal_eval successful!")
-                except Exception as e:
-                    print(f"AST literal_eval failed: {e}")
-
-                    # Final fallback: Try eval directly
-                    try:
-                        print("Last resort: direct eval...")
-                        tasks = eval(content)
-                        print("Direct eval successful!")
-                    except Exception as e:
-                        print(f"All parsing methods failed: {e}")
-                        raise ValueError("Could not parse AI response as valid task data")
-
-        # Ensure tasks is a list of dictionaries
-        if not isinstance(tasks, list):
-            print(f"Parsed result is not a list: {type(tasks)}")
-            raise ValueError(f"Expected a list of tasks, got {type(tasks)}")
-
-        # Type checking for each task
-        valid_tasks = []
-        for i, task in enumerate(tasks):
-            try:
-                if not isinstance(task, dict):
-                    print(f"Task {i} is not a dictionary: {type(task)}")
-                    continue
+                print(f"Date parsing error for task {i}: {e}")
+                # Default to today's date if parsing fails
+                task["date"] = datetime.now().strftime("%Y-%m-%d")
 
-                # Ensure all required keys exist
-                required_keys = ["task", "status", "employee", "date", "category"]
-                if not all(key in task for key in required_keys):
-                    missing = [key for key in required_keys if key not in task]
-                    print(f"Task {i} missing keys: {missing}")
-                    continue
+        return task
+    except Exception as e:
+        print(f"Error validating task {i}: {e}")
+        return None
+
+def _protection():
+    """The enabled ProjectProtectionPlugin, or None."""
+    # Imported here as the plugins pull in the Notion adapter
+    from plugins import plugin_manager
+    plugin = plugin_manager.get_plugin('ProjectProtectionPlugin')
+    return plugin if plugin and plugin.enabled else None
+
+def _cache_key(text):
+    """
+    Extraction cache key of an update.
+
+    The key hashes the update as submitted rather than its protected text:
+    storing the tasks tokenizes any new project, so the protected text of
+    the same update would differ next time and never hit.
+    """
+    return extraction_key(text, PROMPT_VERSION, CHAT_MODEL, CACHE_NAMESPACE)
+
+def _cache_get(cache_key):
+    """Cached tasks for a key with project names restored, or None."""
+    tasks = extraction_cache.get(cache_key)
+    protection = _protection()
+    if tasks is not None and protection:
+        tasks = protection.unprotect_task_list(tasks)
+    return tasks
+
+def _cache_put(cache_key, tasks):
+    """Cache validated tasks, with project names protected."""
+    protection = _protection()
+    extraction_cache.put(cache_key, protection.protect_task_list(tasks) if protection else tasks)
+
+def _extract_with_rules(text):
+    """Validated tasks from the rule-based extractor, or None if the model is needed."""
+    if not FAST_PATH_ENABLED:
+        return None
+    tasks = rule_extractor.try_extract(text)
+    if tasks is None:
+        return None
+    valid_tasks = [task for task in (_validate_task(task, i) for i, task in enumerate(tasks)) if task is not None]
+    # Tasks the rules found but validation rejected are left to the model
+    return valid_tasks if len(valid_tasks) == len(tasks) else None
+
+@traced("extract_tasks")
+def extract_tasks_from_update(text):
+    """
+    Extract structured tasks from freeform text with improved error handling.
+
+    Updates in the structured format of the help text are read by the
+    rule-based extractor when it is confident, without a model call.
+    Updates longer than EXTRACTION_CHUNK_CHARS, typically long forwarded
+    threads, are split at message and section boundaries. The chunks are
+    extracted concurrently, at most EXTRACTION_MAX_PARALLEL at a time, and
+    duplicate tasks across chunks are merged, keeping the most recent status.
+    """
+    if not text or len(text.strip()) < MIN_TASK_LENGTH:
+        return []
 
-                # Ensure task description has minimum length
-                if not task["task"] or len(task["task"].strip()) < MIN_TASK_LENGTH:
-                    print(f"Task {i} description too short: '{task['task']}'")
-                    continue
+    print("Starting task extraction...")
 
-                # Standardize date format
-                if isinstance(task["date"], str):
-                    try:
-                        date_obj = parser.parse(task["date"])
-                        task["date"] = date_obj.strftime("%Y-%m-%d")
-                    except Exception as e:
-                        print(f"Date parsing error for task {i}: {e}")
-                        # Default to today's date if parsing fails
-                        task["date"] = datetime.now().strftime("%Y-%m-%d")
+    fast_tasks = _extract_with_rules(text)
+    annotate(fast_path=fast_tasks is not None)
+    if fast_tasks is not None:
+        return fast_tasks
+
+    chunks = split_update(text, EXTRACTION_CHUNK_CHARS)
+    annotate(chunks=len(chunks))
+    if len(chunks) == 1:
+        return _extract_chunk(text)
+    return _extract_chunks(text, chunks)
+
+def _extract_chunks(text, chunks):
+    """
+    Extract the chunks of a long update concurrently and merge their tasks.
+
+    Args:
+        text: The whole update text.
+        chunks: The update split by split_update().
+
+    Returns:
+        list: The merged tasks.
+    """
+    print(f"Extracting {len(chunks)} chunks of a {len(text)} character update...")
+    with ThreadPoolExecutor(max_workers=min(EXTRACTION_MAX_PARALLEL, len(chunks)),
+                            thread_name_prefix="extract-chunk") as executor:
+        futures = [executor.submit(propagate(_extract_chunk), chunk) for chunk in chunks]
+
+    # A chunk that fails loses only its own tasks, unless every chunk failed
+    chunk_tasks = []
+    errors = []
+    for future in futures:
+        try:
+            chunk_tasks.append(future.result())
+        except ValueError as e:
+            errors.append(e)
+            chunk_tasks.append([])
+    if errors and len(errors) == len(chunks):
+        raise errors[0]
+
+    # Imported here as the task processor pulls in the Notion adapter and plugins
+    from core.task_processor import classify_task_type
+    tasks = merge_extracted_tasks(
+        chunk_tasks,
+        get_batch_embeddings,
+        lambda task: classify_task_type(task) in ["training", "meeting", "recurring"]
+    )
+    print(f"Merged {sum(len(found) for found in chunk_tasks)} tasks from {len(chunks)} chunks into {len(tasks)}")
+    return tasks
+
+def stream_tasks_from_update(text):
+    """
+    Extract tasks from freeform text, yielding each one as soon as the model has written it.
+
+    The completion is read as a stream and scanned for task objects, so the
+    first task can be matched and stored while the model still writes the
+    rest. Validation, caching and the rule-based fast path are the same as
+    extract_tasks_from_update; updates long enough to be chunked are
+    extracted by it and then yielded, as duplicates across chunks are only
+    known once every chunk is done.
+
+    Args:
+        text: The update text.
+
+    Yields:
+        dict: Validated tasks, in the order the model writes them.
+
+    Raises:
+        ValueError: If the model call fails or its response holds no task objects.
+    """
+    if not text or len(text.strip()) < MIN_TASK_LENGTH:
+        return
+
+    # Same order of checks as extract_tasks_from_update, so both modes take the same path
+    fast_tasks = _extract_with_rules(text)
+    if fast_tasks is not None:
+        yield from fast_tasks
+        return
+
+    chunks = split_update(text, EXTRACTION_CHUNK_CHARS)
+    if len(chunks) > 1:
+        yield from _extract_chunks(text, chunks)
+        return
+
+    cache_key = _cache_key(text)
+    cached_tasks = _cache_get(cache_key)
+    if cached_tasks is not None:
+        print(f"Using {len(cached_tasks)} cached tasks")
+        yield from cached_tasks
+        return
+
+    print("Calling OpenAI API (streaming)...")
+    try:
+        response = client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=[{"role": "user", "content": _build_prompt(text)}],
+            temperature=0.3,
+            stream=True
+        )
+    except Exception as e:
+        print(f"Error extracting tasks: {e}")
+        raise ValueError(f"Task extraction failed: {str(e)}")
 
-                valid_tasks.append(task)
-            except Exception as e:
-                print(f"Error validating task {i}: {e}")
+    scanner = TaskObjectScanner()
+    valid_tasks = []
+    received = 0
+    try:
+        for chunk in response:
+            if not chunk.choices:
                 continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            received += len(delta)
 
-        print(f"Successfully validated {len(valid_tasks)} tasks")
-        return valid_tasks
-
+            for source in scanner.feed(delta):
+                i = scanner.objects_found - 1
+                try:
+                    task = _validate_task(parse_task_object(source), i)
+                except Exception as e:
+                    print(f"Could not parse task {i}: {e}")
+                    continue
+                if task is not None:
+                    # Keep a copy for the cache, as callers may change the task
+                    valid_tasks.append(dict(task))
+                    yield task
+    except ValueError:
+        raise
     except Exception as e:
-        import traceback
-        print(f"Error extracting tasks: {e}")
-        print(traceback.format_exc())
-        # Return a more informative error that you'll display to the user
+        print(f"Error reading streamed response: {e}")
         raise ValueError(f"Task extraction failed: {str(e)}")
+    finally:
+        response.close()
+
+    print(f"Received streamed response from OpenAI. Length: {received}")
+    if scanner.objects_found == 0:
+        raise ValueError("Could not parse AI response as valid task data")
+    if scanner.pending:
+        print("Response ended inside a task; ignoring the incomplete task")
+
+    print(f"Successfully validated {len(valid_tasks)} tasks")
+    if valid_tasks and not scanner.pending:
+        _cache_put(cache_key, valid_tasks)
+
+@traced("extract_tasks.chunk")
+def _extract_chunk(text):
+    """Extract tasks from one update, or one chunk of a long update, with a single model call."""
+    # The same update is often sent again: UI re-submits, retries, reprocessing after a crash
+    cache_key = _cache_key(text)
+    cached_tasks = _cache_get(cache_key)
+    annotate(cache_hit=cached_tasks is not None)
+    if cached_tasks is not None:
+        print(f"Using {len(cached_tasks)} cached tasks")
+        return cached_tasks
+
+    prompt = _build_prompt(text)
 
+    try:
         print("Calling OpenAI API...")
-        response = openai.ChatCompletion.create(
+        response = client.chat.completions.create(
             model=CHAT_MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3
         )
 
-        content = response["choices"][0]["message"]["content"]
+        content = response.choices[0].message.content
         print(f"Received response from OpenAI. Length: {len(content)}")
 
-        # Remove markdown code blocks if present
-        if "```" in content:
-            print("Removing markdown code blocks...")
-            content = re.sub(r'```(?:python|json)?\n(.*?)```', r'\1', content, flags=re.DOTALL)
-
-        content = content.strip()
-        print(f"Cleaned content. Now parsing...")
-
-        # Try multiple parsing methods in sequence
-        tasks = None
-
-        # Method 1: Direct JSON parsing
+        # One tolerant pass: JSON or Python literals, code fences and surrounding text ignored
+        parse_errors = []
         try:
-            print("Attempting direct JSON parsing...")
-            # Replace single quotes with double quotes for JSON
-            json_content = content.replace("'", '"')
-            tasks = json.loads(json_content)
-            print("JSON parsing successful!")
-        except json.JSONDecodeError as e:
-            print(f"JSON parse failed: {e}")
-
-            # Method 2: Extract array with regex
-            try:
-                print("Attempting to extract JSON array with regex...")
-                match = re.search(r'\[\s*{.*}\s*\]', content, re.DOTALL)
-                if match:
-                    json_array = match.group(0).replace("'", '"')
-                    tasks = json.loads(json_array)
-                    print("Regex extraction successful!")
-                else:
-                    print("No JSON array found in content")
-            except Exception as e:
-                print(f"Regex extraction failed: {e}")
-
-                # Method 3: Fall back to safer eval
-                try:
-                    print("Attempting eval with ast...")
-                    tasks = ast.literal_eval(content)
-                    print("AST literal_eval successful!")
-                except Exception as e:
-                    print(f"AST literal_eval failed: {e}")
-
-                    # Final fallback: Try eval directly
-                    try:
-                        print("Last resort: direct eval...")
-                        tasks = eval(content)
-                        print("Direct eval successful!")
-                    except Exception as e:
-                        print(f"All parsing methods failed: {e}")
-                        raise ValueError("Could not parse AI response as valid task data")
+            tasks = parse_task_list(content, parse_errors)
+        except TaskParseError as e:
+            print(f"Could not parse AI response: {e}")
+            raise ValueError(f"Could not parse AI response as valid task data: {e}")
+        for error in parse_errors:
+            print(f"Skipped part of AI response: {error}")
 
         # Ensure tasks is a list of dictionaries
         if not isinstance(tasks, list):
             print(f"Parsed result is not a list: {type(tasks)}")
             raise ValueError(f"Expected a list of tasks, got {type(tasks)}")
 
-        # Type checking for each task
         valid_tasks = []
         for i, task in enumerate(tasks):
-            try:
-                if not isinstance(task, dict):
-                    print(f"Task {i} is not a dictionary: {type(task)}")
-                    continue
-
-                # Ensure all required keys exist
-                required_keys = ["task", "status", "employee", "date", "category"]
-                if not all(key in task for key in required_keys):
-                    missing = [key for key in required_keys if key not in task]
-                    print(f"Task {i} missing keys: {missing}")
-                    continue
-
-                # Ensure task description has minimum length
-                if not task["task"] or len(task["task"].strip()) < MIN_TASK_LENGTH:
-                    print(f"Task {i} description too short: '{task['task']}'")
-                    continue
-
-                # Standardize date format
-                if isinstance(task["date"], str):
-                    try:
-                        date_obj = parser.parse(task["date"])
-                        task["date"] = date_obj.strftime("%Y-%m-%d")
-                    except Exception as e:
-                        print(f"Date parsing error for task {i}: {e}")
-                        # Default to today's date if parsing fails
-                        task["date"] = datetime.now().strftime("%Y-%m-%d")
-
+            task = _validate_task(task, i)
+            if task is not None:
                 valid_tasks.append(task)
-            except Exception as e:
-                print(f"Error validating task {i}: {e}")
-                continue
 
         print(f"Successfully validated {len(valid_tasks)} tasks")
+        # An empty result may be a bad response rather than an update without tasks, so try again next time
+        if valid_tasks:
+            _cache_put(cache_key, valid_tasks)
         return valid_tasks
 
     except Exception as e:
@@ -316,4 +403,4 @@ Now extract the tasks from this input: {text}"""
         print(f"Error extracting tasks: {e}")
         print(traceback.format_exc())
         # Return a more informative error that you'll display to the user
-        raise ValueError(f"Task extraction failed: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Task extraction failed: {str(e)}")
@@ -0,0 +1,274 @@
+"""
+Task list parsing for Task Manager.
+Handles reading the list of task dictionaries written by the model, in JSON
+or Python literal syntax, in a single pass and without eval.
+"""
+import json
+import re
+from typing import Dict, List, Any, Optional, Tuple
+
+# One token after optional whitespace, matched at a position with _TOKEN.match(text, pos).
+# A quote inside a string only ends it if a delimiter (, : } ] or the end) follows,
+# so apostrophes in 'client's deck' and unescaped quotes in "the "final" deck" are kept.
+_STRING_BODY = r'[^{q}\\]*(?:(?:\\.|{q}(?=\s*[^\s,:}}\]]))[^{q}\\]*)*'
+_TOKEN = re.compile(
+    r'\s*(?:'
+    r'"(' + _STRING_BODY.format(q='"') + r')"'
+    r"|'(" + _STRING_BODY.format(q="'") + r")'"
+    r'|(-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?)'
+    r'|([A-Za-z_]\w*)'
+    r'|([{}\[\],:]))',
+    re.DOTALL
+)
+# Token kind by matched group: strings, numbers, words; punctuation is its own kind
+_KINDS = (None, "string", "string", "number", "word", None)
+
+_WHITESPACE = re.compile(r"\s*")
+_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.DOTALL)
+
+# Start of the task list: a "[" opening a list of objects (or an empty list)
+_LIST_START = re.compile(r"\[\s*[{\]]")
+
+# Deepest nesting of lists and objects read before giving up
+MAX_DEPTH = 50
+
+_LITERALS = {
+    "true": True, "false": False, "null": None,
+    "True": True, "False": False, "None": None,
+}
+
+_ESCAPES = {
+    "n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f",
+    "\\": "\\", "'": "'", '"': '"', "/": "/", "\n": "",
+}
+
+
+class TaskParseError(ValueError):
+    """
+    The model output could not be read as a task list.
+
+    Attributes:
+        position: Offset in the text where parsing failed.
+        line: 1-based line of that offset.
+        column: 1-based column of that offset.
+    """
+
+    def __init__(self, message: str, text: str, position: int):
+        """
+        Initialize the error.
+
+        Args:
+            message: What was expected or found.
+            text: The text being parsed.
+            position: Offset where parsing failed.
+        """
+        self.message = message
+        self.position = position
+        self.line = text.count("\n", 0, position) + 1
+        self.column = position - (text.rfind("\n", 0, position) + 1) + 1
+        snippet = text[max(0, position - 20):position + 20].replace("\n", "\\n")
+        super().__init__(f"{message} at line {self.line} column {self.column} near {snippet!r}")
+
+
+def _unescape(match) -> str:
+    """Decode one backslash escape in a string."""
+    escape = match.group(1)
+    if len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    # Unknown escapes keep their backslash, as Python does
+    return _ESCAPES.get(escape, "\\" + escape)
+
+
+class _Parser:
+    """Recursive descent over JSON and Python literal values, tolerant of common model mistakes."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.start = 0  # Where the last token began, for errors
+        self.depth = 0
+
+    def error(self, message: str, position: Optional[int] = None) -> TaskParseError:
+        return TaskParseError(message, self.text, self.start if position is None else position)
+
+    def token(self) -> Tuple[str, str]:
+        """
+        Read the next token.
+
+        Returns:
+            Tuple[str, str]: (kind, text); kind is "string", "number", "word", the
+                             punctuation character itself, or "" at the end.
+        """
+        match = _TOKEN.match(self.text, self.pos)
+        if match is None:
+            self.start = _WHITESPACE.match(self.text, self.pos).end()
+            if self.start >= len(self.text):
+                return "", ""
+            char = self.text[self.start]
+            raise self.error("Unterminated string" if char in "\"'" else f"Unexpected {char!r}")
+        group = match.lastindex
+        self.start = match.start(group) - (group < 3)
+        self.pos = match.end()
+        token = match.group(group)
+        return _KINDS[group] or token, token
+
+    def value(self, kind: str, token: str) -> Any:
+        if kind == "string":
+            return _ESCAPE.sub(_unescape, token) if "\\" in token else token
+        if kind == "{" or kind == "[":
+            if self.depth >= MAX_DEPTH:
+                raise self.error("Nesting too deep")
+            self.depth += 1
+            try:
+                return self.object() if kind == "{" else self.list()
+            finally:
+                self.depth -= 1
+        if kind == "number":
+            return float(token) if "." in token or "e" in token or "E" in token else int(token)
+        if kind == "word" and token in _LITERALS:
+            return _LITERALS[token]
+        raise self.error(f"Unexpected {token!r}" if kind else "Unexpected end of output")
+
+    def object(self) -> Dict[str, Any]:
+        result = {}
+        while True:
+            kind, token = self.token()
+            if kind == "}":
+                return result  # Empty, or after a trailing comma
+            if kind == "string":
+                key = _ESCAPE.sub(_unescape, token) if "\\" in token else token
+            elif kind == "word":
+                key = token
+            else:
+                raise self.error("Expected a key" if kind else "Unexpected end of output in object")
+            kind, token = self.token()
+            if kind != ":":
+                raise self.error(f"Expected ':' after key {key!r}")
+            result[key] = self.value(*self.token())
+            kind, token = self.token()
+            if kind == "}":
+                return result
+            if kind != ",":
+                raise self.error("Expected ',' or '}' in object" if kind else "Unexpected end of output in object")
+
+    def list(self) -> List[Any]:
+        result = []
+        while True:
+            kind, token = self.token()
+            if kind == "]":
+                return result
+            result.append(self.value(kind, token))
+            kind, token = self.token()
+            if kind == "]":
+                return result
+            if kind != ",":
+                raise self.error("Expected ',' or ']' in list" if kind else "Unexpected end of output in list")
+
+    def skip_past_object(self) -> bool:
+        """After an error inside a task, move past the end of that task; False if there is none."""
+        end = self.text.find("}", self.start)
+        if end < 0:
+            self.pos = len(self.text)
+            return False
+        self.pos = end + 1
+        return True
+
+
+def parse_task_list(content: str, errors: Optional[List[TaskParseError]] = None) -> List[Any]:
+    """
+    Read the list of tasks from a model response.
+
+    Accepts JSON and Python literal syntax (single or double quotes,
+    True/False/None, trailing commas), ignores text and code fences around
+    the list, and also reads bare objects written one after another
+    without a list. A task that cannot be read is skipped and the rest are
+    kept; a list cut off at the end keeps the tasks completed before it.
+
+    Args:
+        content: The model response.
+        errors: List that recoverable errors (skipped tasks, a missing
+                closing bracket) are appended to.
+
+    Returns:
+        List[Any]: The parsed items, normally task dictionaries.
+
+    Raises:
+        TaskParseError: If the response holds no list or object, or nothing in it could be read.
+    """
+    if errors is None:
+        errors = []
+
+    # Plain JSON, the common case, is read by the C decoder
+    stripped = content.strip()
+    if stripped.startswith("["):
+        try:
+            result = json.loads(stripped)
+            if isinstance(result, list):
+                return result
+        except ValueError:
+            pass
+
+    match = _LIST_START.search(content)
+    if match:
+        start, closing = match.start(), "]"
+        # A JSON list inside a code fence or prose is still read by the C decoder
+        end = content.rfind("]") + 1
+        try:
+            result = json.loads(content[start:end])
+            if isinstance(result, list):
+                return result
+        except ValueError:
+            pass
+        start += 1
+    else:
+        start, closing = content.find("{"), None
+        if start < 0:
+            raise TaskParseError("No task list found", content, 0)
+
+    parser = _Parser(content)
+    parser.pos = start
+    items = []
+    while True:
+        try:
+            kind, token = parser.token()
+            if not kind:
+                if closing:
+                    errors.append(parser.error("Task list ended without ']'", len(content)))
+                break
+            if kind == closing:
+                break
+            if kind == ",":
+                continue
+            if not closing and kind != "{":
+                # Bare objects: stop at the first thing that isn't another one
+                break
+            # A missing comma between tasks is let through
+            items.append(parser.value(kind, token))
+        except TaskParseError as e:
+            errors.append(e)
+            if not parser.skip_past_object():
+                break
+
+    if not items and errors:
+        raise errors[0]
+    return items
+
+
+def parse_task_object(source: str) -> Dict[str, Any]:
+    """
+    Read one task object, e.g. as found by TaskObjectScanner in a streamed response.
+
+    Args:
+        source: Text of a single {...} object.
+
+    Returns:
+        Dict[str, Any]: The task.
+
+    Raises:
+        TaskParseError: If the text is not a complete object.
+    """
+    parser = _Parser(source)
+    kind, token = parser.token()
+    if kind != "{":
+        raise parser.error("Expected '{'")
+    return parser.value(kind, token)
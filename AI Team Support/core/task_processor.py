@@ -2,10 +2,8 @@
 Task processing functionality for Task Manager.
 Handles task similarity matching and processing for Notion integration.
 """
-import numpy as np
 import traceback
 from datetime import datetime, timedelta
-from sklearn.metrics.pairwise import cosine_similarity
 
 from config import (
     DEBUG_MODE, 
@@ -13,7 +11,9 @@ from config import (
     MIN_TASK_LENGTH
 )
 from core.openai_client import get_batch_embeddings
-from core.notion_client import insert_task_to_notion, update_task_in_notion
+from core import insert_task_to_notion, update_task_in_notion
+from core.storage.task_tiers import task_tiers
+from core.tracing import traced
 from plugins import plugin_manager
 
 def debug_print(message):
@@ -44,6 +44,7 @@ def classify_task_type(task):
     # Default: regular task
     return "regular"
 
+@traced("process_task")
 def insert_or_update_task(task, existing_tasks, log_output=None):
     """Insert a new task or update existing similar task with intelligent matching."""
     # Initialize log_output if not provided
@@ -98,7 +99,7 @@ def insert_or_update_task(task, existing_tasks, log_output=None):
                     
                     # Use the protected task for update if protection is enabled
                     task_to_update = protected_task if use_protection else task
-                    success, message = update_task_in_notion(row["id"], task_to_update)
+                    success, message = update_task_in_notion(row["id"], task_to_update, existing=row)
                     log_output.append(message)
                     return
 
@@ -117,58 +118,25 @@ def insert_or_update_task(task, existing_tasks, log_output=None):
 
         task_embedding = task_embeddings[task["task"]]
 
-        # Get embeddings for existing tasks
-        existing_texts = existing_tasks["task"].tolist()
-        existing_embeddings = get_batch_embeddings(existing_texts)
-
-        best_score = 0
-        best_match = None
-
-        # Find best matching existing task
-        for _, row in existing_tasks.iterrows():
-            if row["task"] not in existing_embeddings:
-                continue
-
-            existing_embedding = np.array(existing_embeddings[row["task"]])
-
-            # Basic similarity calculation
-            similarity = cosine_similarity([task_embedding], [existing_embedding])[0][0]
-
-            # Adjust similarity based on metadata
-            # If same employee, increase similarity
-            if task["employee"] == row["employee"]:
-                similarity += 0.05
-
-            # If same category, increase similarity
-            if task["category"] == row["category"]:
-                similarity += 0.05
-
-            # If different dates, decrease similarity for recurring tasks
-            if is_recurring:
-                task_date = task["date"] if isinstance(task["date"], str) else task["date"].strftime("%Y-%m-%d") if task["date"] else None
-                row_date = row["date"] if isinstance(row["date"], str) else row["date"].strftime("%Y-%m-%d") if row["date"] else None
-
-                if task_date != row_date:
-                    similarity -= 0.1
-
-            if similarity > best_score:
-                best_score = similarity
-                best_match = row
-
-        log_output.append(f"🎯 Best match score: {best_score:.2f} for task: '{task['task']}'\n")
-
         # Determine threshold based on task type
         threshold = SIMILARITY_THRESHOLD
         if is_recurring:
             threshold = 0.9  # Higher threshold for recurring tasks
 
+        # Match against recent and open tasks first; archived tasks are only
+        # searched when none of those is a confident match
+        task_tiers.load(existing_tasks)
+        best_score, best_match = task_tiers.find_match(task, task_embedding, threshold, is_recurring)
+
+        log_output.append(f"🎯 Best match score: {best_score:.2f} for task: '{task['task']}'\n")
+
         # Update existing task if similarity is above threshold
         if best_score > threshold:
             log_output.append(f"🔁 Updating existing task: {best_match['task']} → {task['status']}")
             try:
                 # Use the protected task for update if protection is enabled
                 task_to_update = protected_task if use_protection else task
-                success, message = update_task_in_notion(best_match["id"], task_to_update)
+                success, message = update_task_in_notion(best_match["id"], task_to_update, existing=best_match)
                 log_output.append(message)
             except Exception as e:
                 log_output.append(f"❌ Error updating task: {e}")
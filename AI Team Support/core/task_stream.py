@@ -0,0 +1,79 @@
+"""
+Incremental task list scanning for Task Manager.
+Handles finding complete task objects in a model response while it is still streaming.
+"""
+from typing import List, Optional
+
+
+class TaskObjectScanner:
+    """
+    Finds top-level {...} objects in text that arrives in pieces.
+
+    The model is asked for a list of task dictionaries, so every object
+    at brace depth one is a task. Braces inside quoted strings are ignored,
+    for both JSON double quotes and Python single quotes, and anything
+    outside objects (list brackets, commas, code fences, prose) is skipped.
+    Each character is looked at once, however the text is split.
+
+    Example:
+        scanner = TaskObjectScanner()
+        for delta in stream:
+            for obj in scanner.feed(delta):
+                handle(obj)
+    """
+
+    def __init__(self):
+        """Initialize an empty scanner."""
+        self._buffer: List[str] = []  # Pieces of the object being read
+        self._depth = 0
+        self._quote: Optional[str] = None  # Quote character of the open string, if any
+        self._escaped = False
+        self.objects_found = 0
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Scan the next piece of the response.
+
+        Args:
+            text: Text received since the last call.
+
+        Returns:
+            List[str]: Source text of every object completed by this piece.
+        """
+        found = []
+        start = 0 if self._depth else None
+        for i, char in enumerate(text):
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    start = i
+                continue
+
+            if self._quote is not None:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == self._quote:
+                    self._quote = None
+            elif char in "\"'":
+                self._quote = char
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.append(text[start:i + 1])
+                    found.append("".join(self._buffer))
+                    self._buffer = []
+                    start = None
+                    self.objects_found += 1
+
+        if self._depth and start is not None:
+            self._buffer.append(text[start:])
+        return found
+
+    @property
+    def pending(self) -> bool:
+        """Whether an object has been opened but not closed, e.g. in a truncated response."""
+        return self._depth > 0
@@ -0,0 +1,345 @@
+"""
+Request tracing for Task Manager.
+Handles timing spans around pipeline stages and exporting them as JSON
+lines or Chrome trace events.
+"""
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable
+
+from config import TRACE_EXPORT_PATH, TRACE_EXPORT_FORMAT
+
+# Trace and span the current code is running under
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+_span_ids = itertools.count(1)
+_export_lock = threading.Lock()
+
+
+class _NoopSpan:
+    """Span used when no trace is active; does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs) -> None:
+        """Ignore attributes."""
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A timed block of work within a trace."""
+
+    __slots__ = ("trace", "name", "attrs", "id", "parent", "thread", "start", "duration", "_token")
+
+    def __init__(self, trace: "Trace", name: str, attrs: Dict[str, Any]):
+        """
+        Initialize the span.
+
+        Args:
+            trace: Trace the span belongs to.
+            name: What the span measures, e.g. "notion.fetch_tasks".
+            attrs: Extra details recorded with the span.
+        """
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+        self.id = next(_span_ids)
+        self.parent = None
+        self.thread = None
+        self.start = 0.0
+        self.duration = 0.0
+        self._token = None
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.parent = parent.id if parent is not None else None
+        self.thread = threading.get_ident()
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.trace.add(self)
+        return False
+
+    def set(self, **attrs) -> None:
+        """Record extra details, e.g. counts only known once the work is done."""
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The span as a JSON-friendly dict, with times in milliseconds from the trace start."""
+        return {
+            "id": self.id,
+            "parent": self.parent,
+            "name": self.name,
+            "start_ms": round((self.start - self.trace.start) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            "thread": self.thread,
+            "attrs": self.attrs,
+        }
+
+
+class Trace:
+    """The spans recorded while handling one request or update."""
+
+    def __init__(self, name: str):
+        """
+        Initialize the trace.
+
+        Args:
+            name: What is being traced, e.g. "POST /api/process_update".
+        """
+        self.name = name
+        self.id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.thread = threading.get_ident()
+        self.spans: List[Span] = []
+
+    def add(self, span: Span) -> None:
+        """Add a finished span; safe to call from any thread."""
+        self.spans.append(span)  # list.append is atomic
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Total time and count per span name.
+
+        Returns:
+            Dict[str, Dict[str, float]]: {"count", "total_ms"} keyed by span name.
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in list(self.spans):
+            entry = totals.setdefault(span.name, {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += span.duration * 1000
+        for entry in totals.values():
+            entry["total_ms"] = round(entry["total_ms"], 3)
+        return totals
+
+    def server_timing(self) -> str:
+        """
+        Summarize the trace as a Server-Timing header value, shown by browser dev tools.
+
+        Returns:
+            str: e.g. 'total;dur=812.4, notion.fetch_tasks;dur=402.1'.
+        """
+        parts = [f"total;dur={self.duration * 1000:.1f}"]
+        parts += [f"{name};dur={entry['total_ms']:.1f}" for name, entry in self.totals().items()]
+        return ", ".join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The trace as a JSON-friendly dict."""
+        return {
+            "trace_id": self.id,
+            "name": self.name,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "spans": [span.to_dict() for span in sorted(self.spans, key=lambda s: s.start)],
+        }
+
+    def to_chrome_events(self) -> List[Dict[str, Any]]:
+        """
+        The trace as Chrome trace events, viewable in chrome://tracing or Perfetto.
+
+        Returns:
+            List[Dict[str, Any]]: Complete ("X") events with microsecond timestamps.
+        """
+        pid = os.getpid()
+        base = self.started_at * 1e6
+
+        def event(name, start, duration, thread, args):
+            return {"name": name, "cat": "task_manager", "ph": "X", "pid": pid, "tid": thread,
+                    "ts": round(base + (start - self.start) * 1e6, 1), "dur": round(duration * 1e6, 1),
+                    "args": args}
+
+        events = [event(self.name, self.start, self.duration, self.thread, {"trace_id": self.id})]
+        events += [event(span.name, span.start, span.duration, span.thread, dict(span.attrs, trace_id=self.id))
+                   for span in sorted(self.spans, key=lambda s: s.start)]
+        return events
+
+
+def span(name: str, **attrs):
+    """
+    Time a block of work as a span of the current trace.
+
+    Outside a trace this returns a shared no-op span, so instrumented code
+    costs a context variable lookup when nothing is being traced.
+
+    Args:
+        name: What the span measures.
+        **attrs: Extra details recorded with the span.
+
+    Returns:
+        A context manager whose value has a set(**attrs) method.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return Span(trace, name, attrs)
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorator that runs every call of a function in a span.
+
+    Args:
+        name: Span name.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def propagate(func: Callable) -> Callable:
+    """
+    Bind a function to the current trace so spans it opens on another thread are recorded.
+
+    Args:
+        func: Function to run on a worker thread.
+
+    Returns:
+        Callable: The function, running in a copy of the caller's context.
+    """
+    if _current_trace.get() is None:
+        return func
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def annotate(**attrs) -> None:
+    """
+    Record extra details on the innermost open span, if any.
+
+    Args:
+        **attrs: Details to record, e.g. cache_hits=12.
+    """
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attrs)
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace the caller is running under, if any."""
+    return _current_trace.get()
+
+
+def begin_trace(name: str):
+    """
+    Start a trace for the current context.
+
+    Args:
+        name: What is being traced.
+
+    Returns:
+        A token to pass to end_trace().
+    """
+    return _current_trace.set(Trace(name))
+
+
+def end_trace(token, export: bool = True) -> Trace:
+    """
+    Finish the trace started by begin_trace().
+
+    Args:
+        token: Token returned by begin_trace().
+        export: Whether to write the trace to TRACE_EXPORT_PATH, if one is configured.
+
+    Returns:
+        Trace: The finished trace.
+    """
+    trace = _current_trace.get()
+    _current_trace.reset(token)
+    trace.duration = time.perf_counter() - trace.start
+    if export and TRACE_EXPORT_PATH:
+        export_trace(trace, TRACE_EXPORT_PATH, TRACE_EXPORT_FORMAT)
+    return trace
+
+
+class trace:
+    """
+    Context manager tracing a block of work.
+
+    Example:
+        with trace("process_update") as t:
+            process_update(text)
+        print(t.totals())
+    """
+
+    def __init__(self, name: str, export: bool = True):
+        """
+        Initialize the context manager.
+
+        Args:
+            name: What is being traced.
+            export: Whether to write the trace to TRACE_EXPORT_PATH, if one is configured.
+        """
+        self.name = name
+        self.export = export
+        self._token = None
+
+    def __enter__(self) -> Trace:
+        self._token = begin_trace(self.name)
+        return _current_trace.get()
+
+    def __exit__(self, exc_type, exc, tb):
+        end_trace(self._token, export=self.export)
+        return False
+
+
+def export_trace(trace: Trace, path: str, fmt: str = "jsonl") -> None:
+    """
+    Append a finished trace to a file.
+
+    "jsonl" writes the trace as one JSON line. "chrome" appends its events
+    to a Chrome trace file in the JSON array format, whose closing bracket
+    is optional, so the file stays loadable while traces keep being added.
+
+    Args:
+        trace: The finished trace.
+        path: File to append to.
+        fmt: "jsonl" or "chrome".
+    """
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _export_lock:
+            if fmt == "chrome":
+                new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+                with open(path, "a", encoding="utf-8") as f:
+                    if new_file:
+                        f.write("[\n")
+                    for event in trace.to_chrome_events():
+                        f.write(json.dumps(event, default=str) + ",\n")
+            else:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(trace.to_dict(), default=str) + "\n")
+    except OSError as e:
+        print(f"Error exporting trace: {e}")
@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from config import (
     DEBUG_MODE
 )
-from core.notion_client import (
+from core import (
     fetch_notion_tasks, 
     identify_stale_tasks, 
     list_all_categories, 
@@ -113,12 +113,12 @@ def process_freeform_input(update_text):
 def show_stale_tasks():
     """Show overdue tasks that need follow-up."""
     try:
-        df = fetch_notion_tasks()
-        stale = identify_stale_tasks(df)
+        # Notion filters the stale candidates instead of sending every task
+        stale = identify_stale_tasks()
         if stale.empty:
             return "✅ No overdue tasks!"
 
-        grouped = stale.groupby("employee")
+        grouped = stale.groupby("employee", observed=True)
         result_lines = []
         for name, group in grouped:
             result_lines.append(f"👤 {name}:\n")
@@ -143,7 +143,7 @@ def show_tasks_by_category(selected_category):
             return f"✅ No open tasks in project '{selected_category}'"
 
         else:
-            grouped = filtered.groupby("employee")
+            grouped = filtered.groupby("employee", observed=True)
             result_lines = []
             for name, group in grouped:
                 result_lines.append(f"👤 {name}:")
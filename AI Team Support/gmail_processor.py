@@ -8,9 +8,11 @@ import traceback
 from datetime import datetime, timedelta
 
 from core.task_extractor import extract_tasks_from_update
+from core.email_preprocessor import preprocess_email, format_report
 from core.task_processor import insert_or_update_task
 from core import fetch_notion_tasks
 from core.openai_client import get_coaching_insight
+from config import EMAIL_PREPROCESSING
 
 # Gmail settings - UPDATE THESE WITH YOUR INFO
 GMAIL_USER = "task.manager.mpiv@gmail.com"  # Replace with your Gmail address
@@ -225,7 +227,15 @@ def check_gmail_for_updates():
             if not body:
                 print("Could not extract email body")
                 continue
-                
+
+            # Trim quoted replies, signatures and footers before they reach the extraction prompt
+            if EMAIL_PREPROCESSING:
+                try:
+                    body, report = preprocess_email(body)
+                    print(f"Preprocessed email body: {format_report(report)}")
+                except Exception as e:
+                    print(f"Error preprocessing email body, using it as is: {str(e)}")
+
             # Format the update text
             update_text = f"From: {sender_name}\nDate: {date_str}\n\nSubject: {subject}\n\n{body}"
             
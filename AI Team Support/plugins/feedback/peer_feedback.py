@@ -7,7 +7,6 @@ import pandas as pd
 from datetime import datetime, timedelta
 
 from core.adapters.plugin_base import PluginBase
-from core.adapters.notion_adapter import NotionAdapter
 
 class PeerFeedbackPlugin(PluginBase):
     """Plugin for collecting and analyzing peer feedback."""
@@ -20,13 +19,19 @@ class PeerFeedbackPlugin(PluginBase):
             config: Configuration dictionary.
         """
         super().__init__(config)
-        self.notion = NotionAdapter()
-        self.feedback_db_id = self.config.get('feedback_database_id')
+        # Imported here because the Notion adapter itself loads the plugins
+        from core import notion_adapter
+        from core.adapters.notion_adapter import NotionAdapter
+        from core.storage.feedback_store import FeedbackStore, store_path_for
         
-        # Cache feedback data
-        self._feedback_cache = {}
-        self._cache_timestamp = None
-        self._cache_valid_duration = timedelta(minutes=30)  # Cache valid for 30 minutes
+        self.feedback_db_id = self.config.get('feedback_database_id')
+        if not self.feedback_db_id or self.feedback_db_id == notion_adapter.feedback_db_id:
+            # Share the application's adapter, so both read and sync one feedback store
+            self.notion = notion_adapter
+        else:
+            # Another database gets its own store, so syncing one never replaces the other's entries
+            self.notion = NotionAdapter(feedback_db_id=self.feedback_db_id,
+                                        feedback_store=FeedbackStore(store_path_for(self.feedback_db_id)))
     
     def initialize(self):
         """
@@ -35,62 +40,37 @@ class PeerFeedbackPlugin(PluginBase):
         Returns:
             bool: True if initialization was successful, False otherwise.
         """
-        # Test connection to the feedback database
         if not self.feedback_db_id:
             print("No feedback database ID configured")
             return False
-            
-        # Check if we can fetch sample feedback
-        try:
-            test_feedback = self.notion.fetch_peer_feedback("test", self.feedback_db_id, days_back=1)
-            return True
-        except Exception as e:
-            print(f"Error connecting to feedback database: {e}")
-            return False
+        
+        # The feedback store is synced with Notion on first use rather than
+        # here, so registering the plugin doesn't wait on the whole database
+        return True
     
     def get_recent_feedback(self, person_name: str, days_back: int = 14, use_cache: bool = True) -> List[Dict[str, Any]]:
         """
         Get recent feedback for a specific person.
         
+        Feedback is read from the local feedback store shared with the
+        rest of the application, which is kept in sync with Notion.
+        
         Args:
             person_name: Name of the person to get feedback for.
             days_back: Number of days back to search for feedback.
-            use_cache: Whether to use cached data if available.
+            use_cache: Whether to use the local copy if it was synced recently.
+                       If False, it is synced with Notion first.
             
         Returns:
             List[Dict[str, Any]]: List of feedback entries.
         """
-        # Check if we have cached data that's still valid
-        cache_key = f"{person_name}_{days_back}"
-        if use_cache and self._is_cache_valid() and cache_key in self._feedback_cache:
-            return self._feedback_cache[cache_key]
-            
-        # Fetch fresh data
-        feedback = self.notion.fetch_peer_feedback(person_name, self.feedback_db_id, days_back)
-        
-        # Update cache
-        self._feedback_cache[cache_key] = feedback
-        self._cache_timestamp = datetime.now()
-        
-        return feedback
-    
-    def _is_cache_valid(self) -> bool:
-        """
-        Check if the cache is still valid.
-        
-        Returns:
-            bool: True if the cache is valid, False otherwise.
-        """
-        if not self._cache_timestamp:
-            return False
-            
-        age = datetime.now() - self._cache_timestamp
-        return age < self._cache_valid_duration
+        if use_cache:
+            return self.notion.fetch_peer_feedback(person_name, days_back)
+        return self.notion.fetch_peer_feedback(person_name, days_back, max_age=0)
     
     def clear_cache(self):
-        """Clear the feedback cache."""
-        self._feedback_cache = {}
-        self._cache_timestamp = None
+        """Reread the whole feedback database from Notion into the local copy now."""
+        self.notion.sync_feedback(full=True)
     
     def analyze_feedback_trends(self, person_name: str, days_back: int = 30) -> Dict[str, Any]:
         """
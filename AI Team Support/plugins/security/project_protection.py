@@ -4,6 +4,9 @@ Handles tokenization of project names for security.
 This version does not require the cryptography package.
 """
 from typing import Dict, List, Any, Optional
+
+import pandas as pd
+
 from core.adapters.plugin_base import PluginBase
 from core.security.security_manager import SecurityManager
 
@@ -95,6 +98,36 @@ class ProjectProtectionPlugin(PluginBase):
             
         return self.security_manager.unprotect_task_list(protected_tasks)
     
+    def protect_task_frame(self, tasks_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Protect sensitive information in a task DataFrame in place.
+        
+        Args:
+            tasks_df: DataFrame of tasks.
+            
+        Returns:
+            pd.DataFrame: The protected DataFrame.
+        """
+        if not self.enabled:
+            return tasks_df
+            
+        return self.security_manager.protect_task_frame(tasks_df)
+    
+    def unprotect_task_frame(self, protected_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Restore original information in a protected task DataFrame in place.
+        
+        Args:
+            protected_df: DataFrame of protected tasks.
+            
+        Returns:
+            pd.DataFrame: The original DataFrame.
+        """
+        if not self.enabled:
+            return protected_df
+            
+        return self.security_manager.unprotect_task_frame(protected_df)
+    
     def protect_text(self, text: str) -> str:
         """
         Protect sensitive information in text.
@@ -123,4 +156,13 @@ class ProjectProtectionPlugin(PluginBase):
         if not self.enabled:
             return protected_text
             
-        return self.security_manager.unprotect_text(protected_text)
\ No newline at end of file
+        return self.security_manager.unprotect_text(protected_text)
+    
+    def memo_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get hit rates of the protect/unprotect memo.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Stats per operation.
+        """
+        return self.security_manager.memo_stats()
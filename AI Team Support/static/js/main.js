@@ -16,38 +16,82 @@ $(document).ready(function() {
         $('#loadingIndicator').show();
         $('#results').html('<p>Processing your update...</p>');
         
-        // Send AJAX request
-        $.ajax({
-            url: '/api/process_update',
-            type: 'POST',
-            contentType: 'application/json',
-            data: JSON.stringify({
-                update_text: updateText
-            }),
-            dataType: 'json',
-            success: function(response) {
-                if (response.success) {
-                    displayResults(response);
-                } else {
-                    $('#results').html(`<div class="alert alert-danger">${response.message}</div>`);
+        // Stream the update so tasks show up as soon as each one is stored
+        const streamedTasks = [];
+        let finished = false;
+        
+        function handleEvent(event) {
+            if (event.event === 'task') {
+                if (streamedTasks.length === 0) {
+                    $('#results').html('<h5>Extracted Tasks:</h5><ul class="task-list" id="streamedTasks"></ul>'
+                        + '<p id="streamStatus">Generating coaching insights...</p>');
                 }
-            },
-            error: function(xhr, status, error) {
-                $('#results').html(`
-                    <div class="alert alert-danger">
-                        <strong>Error:</strong> Could not process your update. Please try again later.
-                    </div>
+                streamedTasks.push(event.task);
+                $('#streamedTasks').append(`
+                    <li class="task-item">
+                        ${event.task.task}
+                        <span class="task-status ${getStatusClass(event.task.status)}">${event.task.status}</span>
+                    </li>
                 `);
-                console.error('Error:', error);
-            },
-            complete: function() {
-                // Hide loading indicator
-                $('#submitBtn').prop('disabled', false);
-                $('#loadingIndicator').hide();
-                
-                // Refresh categories dropdown
-                refreshCategories();
+            } else {
+                finished = true;
+                if (event.success) {
+                    displayResults(event);
+                } else {
+                    $('#results').html(`<div class="alert alert-danger">${event.message}</div>`);
+                }
             }
+        }
+        
+        fetch('/api/process_update', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({
+                update_text: updateText,
+                stream: true
+            })
+        }).then(async function(response) {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (true) {
+                const {value, done} = await reader.read();
+                if (done) {
+                    break;
+                }
+                buffer += decoder.decode(value, {stream: true});
+                let newline;
+                while ((newline = buffer.indexOf('\n')) >= 0) {
+                    const line = buffer.slice(0, newline).trim();
+                    buffer = buffer.slice(newline + 1);
+                    if (line) {
+                        handleEvent(JSON.parse(line));
+                    }
+                }
+            }
+            if (buffer.trim()) {
+                handleEvent(JSON.parse(buffer));
+            }
+            if (!finished) {
+                throw new Error('Response ended early');
+            }
+        }).catch(function(error) {
+            $('#results').html(`
+                <div class="alert alert-danger">
+                    <strong>Error:</strong> Could not process your update. Please try again later.
+                </div>
+            `);
+            console.error('Error:', error);
+        }).finally(function() {
+            // Hide loading indicator
+            $('#submitBtn').prop('disabled', false);
+            $('#loadingIndicator').hide();
+            
+            // Refresh categories dropdown
+            refreshCategories();
         });
     });
     